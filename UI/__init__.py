@@ -1,26 +1,33 @@
 # ui/__init__.py
 
-from .main_window import ModernSidebarUI, run_app
-from .add_product_dialog import AddProductDialog
-from .add_batch_dialog import AddBatchDialog
-from .sell_product_dialog import SellProductDialog
-from .suppliers_management import SuppliersManagement
-from .add_supplier_dialog import AddSupplierDialog
-from .orders_management import OrdersManagement
-from .add_order_dialog import AddOrderDialog
-from .reports import Reports
-from .settings import Settings
+import importlib
 
-__all__ = [
-    'ModernSidebarUI',
-    'run_app',
-    'AddProductDialog',
-    'AddBatchDialog',
-    'SellProductDialog',
-    'SuppliersManagement',
-    'AddSupplierDialog',
-    'OrdersManagement',
-    'AddOrderDialog',
-    'Reports',
-    'Settings'
-]
+# Public names and the submodule that defines them. The submodules are only
+# imported when a name is first accessed, so importing one page (or the
+# package itself) does not load every page and its dependencies.
+_EXPORTS = {
+    'ModernSidebarUI': '.main_window',
+    'run_app': '.main_window',
+    'AddProductDialog': '.add_product_dialog',
+    'AddBatchDialog': '.add_batch_dialog',
+    'SellProductDialog': '.sell_product_dialog',
+    'SuppliersManagement': '.suppliers_management',
+    'AddSupplierDialog': '.add_supplier_dialog',
+    'OrdersManagement': '.orders_management',
+    'AddOrderDialog': '.add_order_dialog',
+    'ReceiveOrderDialog': '.receive_order_dialog',
+    'Reports': '.reports',
+    'Settings': '.settings',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -9,6 +9,10 @@ from PyQt6.QtCore import QDate, Qt
 from PyQt6.QtGui import QFont
 from domain.domain_models import Order, OrderItem, Supplier, Product, OrderStatus
 
+# Row data kept on the product cell of each order line
+ORDER_ITEM_ID_ROLE = Qt.ItemDataRole.UserRole
+PRODUCT_ID_ROLE = Qt.ItemDataRole.UserRole + 1
+
 
 class AddOrderDialog(QDialog):
     def __init__(self, parent=None, inventory_service=None, order: Order = None):
@@ -129,7 +133,7 @@ class AddOrderDialog(QDialog):
 
         # Supplier Selection
         self.supplier_combo = QComboBox()
-        self.suppliers = self.inventory_service.get_all_suppliers()
+        self.suppliers = self.inventory_service.get_cached_suppliers()
         self.supplier_map = {supplier.name: supplier for supplier in self.suppliers}
         self.supplier_combo.addItems([supplier.name for supplier in self.suppliers])
         self.supplier_combo.setPlaceholderText("Select Supplier")
@@ -216,7 +220,12 @@ class AddOrderDialog(QDialog):
         """Insert an order item into the items table."""
         row_position = self.items_table.rowCount()
         self.items_table.insertRow(row_position)
-        self.items_table.setItem(row_position, 0, QTableWidgetItem(order_item.product.name))
+        name_item = QTableWidgetItem(order_item.product.name)
+        # The line id lets an edited order update existing lines in place,
+        # the product id saves resolving the name again when saving
+        name_item.setData(ORDER_ITEM_ID_ROLE, order_item.order_item_id)
+        name_item.setData(PRODUCT_ID_ROLE, order_item.product_id)
+        self.items_table.setItem(row_position, 0, name_item)
         self.items_table.setItem(row_position, 1, QTableWidgetItem(str(order_item.quantity)))
         self.items_table.setItem(row_position, 2, QTableWidgetItem(f"Rs.{order_item.cost_per_unit:.2f}"))
         total_cost = order_item.quantity * order_item.cost_per_unit
@@ -258,20 +267,20 @@ class AddOrderDialog(QDialog):
         expected_delivery = self.expected_delivery_edit.date().toPyDate()
         items = []
         for row in range(self.items_table.rowCount()):
-            product_name = self.items_table.item(row, 0).text()
+            name_item = self.items_table.item(row, 0)
+            product_id = name_item.data(PRODUCT_ID_ROLE)
+            if product_id is None:
+                continue
             quantity = int(self.items_table.item(row, 1).text())
             cost_per_unit_text = self.items_table.item(row, 2).text().replace('Rs.', '').strip()
             try:
                 cost_per_unit = float(cost_per_unit_text)
             except ValueError:
                 cost_per_unit = 0.0
-            product = self.inventory_service.get_product_by_name(product_name)
-            if not product:
-                continue
             items.append(OrderItem(
-                order_item_id=None,  # Assuming new items have no ID yet
+                order_item_id=name_item.data(ORDER_ITEM_ID_ROLE),  # None for new lines
                 order_id=self.order.order_id if self.order else None,
-                product_id=product.product_id,
+                product_id=product_id,
                 quantity=quantity,
                 cost_per_unit=cost_per_unit
             ))
@@ -378,9 +387,9 @@ class AddOrderItemDialog(QDialog):
 
         # Product Selection
         self.product_combo = QComboBox()
-        self.products = self.inventory_service.get_all_products()
-        self.product_map = {product.name: product for product in self.products}
-        self.product_combo.addItems([product.name for product in self.products])
+        self.catalogue = self.inventory_service.get_product_catalogue()
+        self.product_map = self.catalogue.by_name
+        self.product_combo.addItems(list(self.product_map))
         self.product_combo.setPlaceholderText("Select Product")
         form_layout.addRow("Product:", self.product_combo)
 
@@ -432,5 +441,6 @@ class AddOrderItemDialog(QDialog):
             order_id=None,        # Will be set when adding to order
             product_id=product.product_id if product else None,
             quantity=quantity,
-            cost_per_unit=cost_per_unit
+            cost_per_unit=cost_per_unit,
+            product=product
         )
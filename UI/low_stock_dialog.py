@@ -0,0 +1,90 @@
+# ui/low_stock_dialog.py
+
+from typing import List
+
+from PyQt6.QtWidgets import (
+    QDialog, QDialogButtonBox, QLabel, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont
+from domain.domain_models import Product
+
+class LowStockDialog(QDialog):
+    """
+    The products at or below their reorder level, furthest below first,
+    with their stock and reorder level. Read-only; Orders Management drafts
+    the reorders.
+    """
+    def __init__(self, parent=None, products: List[Product] = ()):
+        super().__init__(parent)
+        self.setWindowTitle("Low Stock")
+        self.resize(800, 600)
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowContextHelpButtonHint)  # Remove help button
+
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #2C2C3E;
+                color: #E0E0E0;
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                font-size: 15px;
+            }
+            QLabel {
+                font-size: 15px;
+                color: #E0E0E0;
+                background-color: transparent;
+            }
+            QPushButton {
+                background-color: #00ADB5;
+                color: #FFFFFF;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-size: 14px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #009A9C;
+            }
+            QTableWidget {
+                background-color: #3A3A4D;
+                color: #FFFFFF;
+                border: 1px solid #555555;
+                border-radius: 6px;
+                font-size: 14px;
+            }
+            QHeaderView::section {
+                background-color: #555555;
+                color: #FFFFFF;
+                padding: 5px;
+                border: 1px solid #3A3A4D;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        header = QLabel(f"{len(products)} products at or below their reorder level")
+        header.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
+        header.setStyleSheet("color: #00ADB5;")
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(header)
+
+        products = sorted(products, key=lambda p: (p.total_quantity - p.reorder_level, p.product_id))
+        self.table = QTableWidget(len(products), 5)
+        self.table.setHorizontalHeaderLabels(["Product ID", "SKU", "Name", "In Stock", "Reorder Level"])
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        for row, product in enumerate(products):
+            self.table.setItem(row, 0, QTableWidgetItem(str(product.product_id)))
+            self.table.setItem(row, 1, QTableWidgetItem(product.sku))
+            self.table.setItem(row, 2, QTableWidgetItem(product.name))
+            self.table.setItem(row, 3, QTableWidgetItem(str(product.total_quantity)))
+            self.table.setItem(row, 4, QTableWidgetItem(str(product.reorder_level)))
+        layout.addWidget(self.table)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
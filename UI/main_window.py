@@ -1,5 +1,7 @@
 import sys
 import json
+import time
+import logging
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QFrame, QStackedWidget, QLabel, QDialog, QMessageBox, QButtonGroup
@@ -13,11 +15,33 @@ from .batches_management import BatchesManagement
 from .sales_management import SalesManagement
 from .suppliers_management import SuppliersManagement
 from .orders_management import OrdersManagement
-from .reports import Reports
-from backup import fetch_data, convert_data_to_dict, save_to_json
-from restore import restore_data_from_json
+from backup import fetch_data, convert_data_to_dict, save_to_json, save_catalogue_snapshot
 from .settings import Settings  # Ensure this module exists and is correctly implemented
 from .sell_product_widget import SellProductWidget  # Import the SellProductWidget
+from services.expiry_engine import EXPIRED, CRITICAL, summarize_alerts
+
+logger = logging.getLogger(__name__)
+
+# Pages built in the background, most likely next page first, once the
+# DataLoader has finished. Reports is left out on purpose: it pulls in
+# matplotlib and is only built when the user actually opens it.
+PREWARM_PAGE_ORDER = [1, 3, 2]
+
+# Delay between two background page builds, so that user input queued in the
+# meantime is still handled promptly.
+PREWARM_INTERVAL_MS = 150
+
+# Method that reloads each page's table when the window is reused for the
+# next login. Pages not listed read the database on every action anyway.
+PAGE_RELOAD_METHODS = {
+    "home_page": "load_products",
+    "products_management": "load_products",
+    "batches_management": "load_batches",
+    "sales_management": "load_sales",
+}
+
+# How often the expiry and low stock alerts are recomputed while the window is open
+STOCK_CHECK_INTERVAL_MS = 5 * 60 * 1000
 
 def load_white_icon(svg_path, size=QSize(20, 20)):
     """
@@ -114,11 +138,12 @@ class ContactDialog(QDialog):
         self.setLayout(layout)
 
 from UI.loading_dialog import LoadingDialog
-from worker import DataLoader
+from worker import DataLoader, StockAlertWorker
 
 class ModernSidebarUI(QMainWindow):
     def __init__(self, inventory_service):
         super().__init__()
+        startup_start = time.perf_counter()
         self.inventory_service = inventory_service
         self.setWindowTitle("Pharmacy Inventory Management")
         self.setGeometry(100, 100, 1200, 700)
@@ -206,13 +231,77 @@ class ModernSidebarUI(QMainWindow):
 
         # Set Home as the default selected button
         self.nav_buttons["Home"].setChecked(True)
-        self.stack.setCurrentIndex(0)
+        self.switch_page(0)
 
         # Initialize and start the auto backup timer
         self.init_auto_backup()
 
+        # Stock alerts are first checked once the DataLoader has finished
+        self.stock_alert_worker = None
+        self.stock_alert_timer = QTimer(self)
+        self.stock_alert_timer.timeout.connect(self.check_stock_alerts)
+        # Expiry alerts of the last check; the low stock count follows every
+        # stock change made through the inventory service
+        self.expiry_alerts = []
+        self.low_stock_count = 0
+        self.inventory_service.add_stock_listener(self.update_low_stock)
+
+        logger.info(f"Main window ready in {(time.perf_counter() - startup_start) * 1000:.1f} ms")
+
     def on_data_loaded(self):
         self.loading_dialog.close()
+        # Start building the likely-next pages now that the loader thread
+        # no longer competes for the database.
+        QTimer.singleShot(0, self.prewarm_next_page)
+        self.update_low_stock()
+        self.check_stock_alerts()
+        self.stock_alert_timer.start(STOCK_CHECK_INTERVAL_MS)
+
+    def check_stock_alerts(self):
+        """Runs the periodic database upkeep and recomputes the expiry alerts on a worker thread."""
+        if self.stock_alert_worker is not None and self.stock_alert_worker.isRunning():
+            return
+        self.stock_alert_worker = StockAlertWorker()
+        self.stock_alert_worker.finished.connect(self.show_stock_alerts)
+        self.stock_alert_worker.error.connect(lambda message: logger.error(f"Stock check failed: {message}"))
+        self.stock_alert_worker.start()
+
+    def show_stock_alerts(self, alerts):
+        self.expiry_alerts = alerts
+        self.show_alerts()
+
+    def update_low_stock(self):
+        """
+        Reads the low stock count from the inventory service's reorder
+        engine, which is kept current by every sale, batch edit and receipt,
+        so the badge moves as soon as the stock does.
+        """
+        self.low_stock_count = self.inventory_service.get_low_stock_count()
+        self.show_alerts()
+
+    def show_alerts(self):
+        """
+        Shows the alerts in the status bar and as counts on the Product
+        Management (low stock) and Batch Management (expiry) buttons. The
+        write-off report has the batch details.
+        """
+        alerts, low_stock = self.expiry_alerts, self.low_stock_count
+        urgent = sum(alert.batch_count for alert in alerts if alert.level in (EXPIRED, CRITICAL))
+        button = self.nav_buttons["Batch Management"]
+        button.setText(f"  Batch Management ({urgent})" if urgent else "  Batch Management")
+        expiry_summary = summarize_alerts(alerts)
+        button.setToolTip(expiry_summary)
+
+        button = self.nav_buttons["Product Management"]
+        button.setText(f"  Product Management ({low_stock})" if low_stock else "  Product Management")
+        low_stock_summary = f"{low_stock} products at or below reorder level" if low_stock else ""
+        button.setToolTip(f"{low_stock_summary}; Low Stock on the page lists them" if low_stock else "")
+
+        parts = [part for part in (low_stock_summary, expiry_summary and f"Expiry: {expiry_summary}") if part]
+        if parts:
+            self.statusBar().showMessage(" | ".join(parts))
+        else:
+            self.statusBar().clearMessage()
 
     def init_sidebar_buttons(self, layout):
         # Define button labels and corresponding icon paths
@@ -268,25 +357,77 @@ class ModernSidebarUI(QMainWindow):
                 btn.clicked.connect(self.logout)  # Connect Log Out button
 
     def init_modules(self):
-        # Initialize each module and add to the stacked widget
-        self.home_page = SellProductWidget(self.inventory_service)  # Updated to SellProductWidget
+        """
+        Registers the pages behind the stacked widget.
+
+        Pages are not constructed here: the stack is filled with empty
+        placeholders and each page is built the first time it is shown (see
+        ensure_page). Most pages query the database in their constructors,
+        so the main window becomes interactive before any of them exist.
+        """
+        # (attribute name, factory) in the same order as the buttons
+        self.page_factories = [
+            ("home_page", SellProductWidget),                  # Index 0 (Home)
+            ("products_management", ProductsManagement),       # Index 1
+            ("batches_management", BatchesManagement),         # Index 2
+            ("sales_management", SalesManagement),             # Index 3
+            ("reports", self.create_reports_page),             # Index 4
+            ("settings_page", self.create_settings_page),      # Index 5
+        ]
+        self.built_pages = set()
+        self.page_build_times = {}
+        self.prewarm_queue = list(PREWARM_PAGE_ORDER)
 
-        self.products_management = ProductsManagement(self.inventory_service)
-        self.batches_management = BatchesManagement(self.inventory_service)
-        self.sales_management = SalesManagement(self.inventory_service)
-        self.reports = Reports(self.inventory_service)
-        self.settings_page = Settings(self.inventory_service)  # Assuming Settings module exists
+        for attr_name, _ in self.page_factories:
+            setattr(self, attr_name, None)
+            self.stack.addWidget(QWidget())
 
+    def create_reports_page(self, inventory_service):
+        from .reports import Reports  # Deferred: pulls in matplotlib
+        return Reports(inventory_service)
+
+    def create_settings_page(self, inventory_service):
+        settings_page = Settings(inventory_service)  # Assuming Settings module exists
         # Connect the Settings dialog signal to the toggle_auto_backup_slot
-        self.settings_page.auto_backup_toggled.connect(self.toggle_auto_backup_slot)
+        settings_page.auto_backup_toggled.connect(self.toggle_auto_backup_slot)
+        return settings_page
 
-        # Add widgets to the stack in the same order as buttons
-        self.stack.addWidget(self.home_page)               # Index 0 (Home)
-        self.stack.addWidget(self.products_management)     # Index 1
-        self.stack.addWidget(self.batches_management)      # Index 2
-        self.stack.addWidget(self.sales_management)        # Index 3
-        self.stack.addWidget(self.reports)                 # Index 4
-        self.stack.addWidget(self.settings_page)           # Index 5
+    def ensure_page(self, index):
+        """
+        Builds the page at the given stack index if it does not exist yet and
+        swaps it in for its placeholder. Returns the page widget.
+        """
+        if index in self.built_pages:
+            return self.stack.widget(index)
+
+        attr_name, factory = self.page_factories[index]
+        start = time.perf_counter()
+        page = factory(self.inventory_service)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        placeholder = self.stack.widget(index)
+        self.stack.insertWidget(index, page)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+
+        setattr(self, attr_name, page)
+        self.built_pages.add(index)
+        self.page_build_times[attr_name] = elapsed_ms
+        logger.info(f"Built page '{attr_name}' in {elapsed_ms:.1f} ms")
+        return page
+
+    def prewarm_next_page(self):
+        """
+        Builds one page from the prewarm queue and schedules the next one, so
+        the event loop gets a turn between two page constructions.
+        """
+        while self.prewarm_queue:
+            index = self.prewarm_queue.pop(0)
+            if index not in self.built_pages:
+                self.ensure_page(index)
+                break
+        if self.prewarm_queue:
+            QTimer.singleShot(PREWARM_INTERVAL_MS, self.prewarm_next_page)
 
     def connect_buttons(self):
         # Connect navigational buttons to switch pages
@@ -301,6 +442,7 @@ class ModernSidebarUI(QMainWindow):
         self.nav_buttons["Restore"].clicked.connect(self.restore_data)
 
     def switch_page(self, index):
+        self.ensure_page(index)
         self.stack.setCurrentIndex(index)
 
     def open_settings(self):
@@ -321,11 +463,13 @@ class ModernSidebarUI(QMainWindow):
             data = fetch_data()
             data_dict = convert_data_to_dict(data)
             save_to_json(data_dict)
+            save_catalogue_snapshot(data_dict)
             QMessageBox.information(self, "Backup", "Data has been backed up successfully.")
         except Exception as e:
             QMessageBox.critical(self, "Backup Error", f"An error occurred during backup: {e}")
 
     def restore_data(self):
+        from restore import restore_data_from_json  # Deferred: pulls in tkinter
         try:
             message = restore_data_from_json()
             QMessageBox.information(self, "Restore", message)
@@ -334,12 +478,31 @@ class ModernSidebarUI(QMainWindow):
 
     def logout(self):
         """
-        Logs out the current user by closing the main window and opening the login window.
+        Logs out the current user. The window is only hidden: the app context
+        keeps it, with its pages and the inventory service, for the next
+        admin login.
+        """
+        from app_context import get_app_context  # Local import to avoid circular dependency
+        self.stock_alert_timer.stop()
+        self.hide()
+        get_app_context().sign_out()
+
+    def on_sign_in(self, user):
+        """
+        Prepares the kept window for the next admin. Cached ORM state is
+        expired so the new shift sees current data, and the pages that were
+        built reload their tables instead of being rebuilt.
         """
-        from login_window import LoginWindow  # Local import to avoid circular dependency
-        self.login_window = LoginWindow()
-        self.login_window.show()
-        self.close()
+        self.inventory_service.expire_cached_state()
+        for index in sorted(self.built_pages):
+            method = PAGE_RELOAD_METHODS.get(self.page_factories[index][0])
+            if method is not None:
+                getattr(self.stack.widget(index), method)()
+        self.nav_buttons["Home"].setChecked(True)
+        self.switch_page(0)
+        self.update_low_stock()
+        self.check_stock_alerts()
+        self.stock_alert_timer.start(STOCK_CHECK_INTERVAL_MS)
 
     def init_auto_backup(self):
         """
@@ -359,6 +522,7 @@ class ModernSidebarUI(QMainWindow):
             data = fetch_data()
             data_dict = convert_data_to_dict(data)
             save_to_json(data_dict)
+            save_catalogue_snapshot(data_dict)
             # No notification to the user
         except Exception as e:
             # Optionally log the error to a file or console
@@ -2,19 +2,26 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem,
-    QMessageBox, QDialog, QHBoxLayout, QHeaderView, QLabel, QFrame
+    QMessageBox, QDialog, QHBoxLayout, QHeaderView, QLabel, QFrame,
+    QComboBox, QDateEdit, QCheckBox
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QDate
 from PyQt6.QtGui import QFont, QIcon
 from .add_order_dialog import AddOrderDialog
-from domain.domain_models import Order  # Ensure Order model is correctly imported
+from .receive_order_dialog import ReceiveOrderDialog
+from domain.domain_models import Order, OrderStatus  # Ensure Order model is correctly imported
 from typing import List
 
+# Orders shown per page of the table
+ORDERS_PAGE_SIZE = 100
+
 
 class OrdersManagement(QWidget):
     def __init__(self, inventory_service):
         super().__init__()
         self.inventory_service = inventory_service
+        self.page = 0
+        self.total_orders = 0
         self.init_ui()
 
     def init_ui(self):
@@ -115,6 +122,18 @@ class OrdersManagement(QWidget):
         delete_order_btn.clicked.connect(self.delete_order)
         buttons_layout.addWidget(delete_order_btn)
 
+        # Receive Order Button
+        receive_order_btn = QPushButton("Receive Order")
+        receive_order_btn.setToolTip("Book the selected order's delivery into stock")
+        receive_order_btn.clicked.connect(self.receive_order)
+        buttons_layout.addWidget(receive_order_btn)
+
+        # Reorder Low Stock Button
+        reorder_btn = QPushButton("Reorder Low Stock")
+        reorder_btn.setToolTip("Create pending orders for products at or below their reorder level")
+        reorder_btn.clicked.connect(self.reorder_low_stock)
+        buttons_layout.addWidget(reorder_btn)
+
         # Refresh Button
         refresh_btn = QPushButton("Refresh")
         refresh_btn.setIcon(QIcon(":/icons/refresh.png"))  # Replace with your icon path
@@ -127,6 +146,29 @@ class OrdersManagement(QWidget):
 
         self.main_layout.addLayout(buttons_layout)
 
+        # Filters
+        filters_layout = QHBoxLayout()
+        self.status_filter = QComboBox()
+        self.status_filter.addItem("All Statuses", None)
+        for status in OrderStatus:
+            self.status_filter.addItem(status.value, status)
+        filters_layout.addWidget(self.status_filter)
+
+        self.date_filter_check = QCheckBox("Ordered between")
+        filters_layout.addWidget(self.date_filter_check)
+        self.start_date_edit = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.start_date_edit.setCalendarPopup(True)
+        filters_layout.addWidget(self.start_date_edit)
+        self.end_date_edit = QDateEdit(QDate.currentDate())
+        self.end_date_edit.setCalendarPopup(True)
+        filters_layout.addWidget(self.end_date_edit)
+
+        apply_filters_btn = QPushButton("Apply Filters")
+        apply_filters_btn.clicked.connect(self.apply_filters)
+        filters_layout.addWidget(apply_filters_btn)
+        filters_layout.addStretch()
+        self.main_layout.addLayout(filters_layout)
+
         # Orders Table
         self.table = QTableWidget()
         self.table.setColumnCount(6)
@@ -160,20 +202,61 @@ class OrdersManagement(QWidget):
         """)
         self.main_layout.addWidget(self.table)
 
+        # Pagination
+        pagination_layout = QHBoxLayout()
+        self.prev_page_btn = QPushButton("Previous")
+        self.prev_page_btn.clicked.connect(self.previous_page)
+        pagination_layout.addWidget(self.prev_page_btn)
+        self.page_label = QLabel()
+        self.page_label.setStyleSheet("font-size: 14px; color: #E0E0E0; font-weight: normal;")
+        pagination_layout.addWidget(self.page_label)
+        self.next_page_btn = QPushButton("Next")
+        self.next_page_btn.clicked.connect(self.next_page)
+        pagination_layout.addWidget(self.next_page_btn)
+        pagination_layout.addStretch()
+        self.main_layout.addLayout(pagination_layout)
+
         # Load orders initially
         self.load_orders()
 
+    def current_filters(self):
+        filters = {"status": self.status_filter.currentData()}
+        if self.date_filter_check.isChecked():
+            filters["start_date"] = self.start_date_edit.date().toPyDate()
+            filters["end_date"] = self.end_date_edit.date().toPyDate()
+        return filters
+
+    def apply_filters(self):
+        self.page = 0
+        self.load_orders()
+
+    def previous_page(self):
+        if self.page > 0:
+            self.page -= 1
+            self.load_orders()
+
+    def next_page(self):
+        if (self.page + 1) * ORDERS_PAGE_SIZE < self.total_orders:
+            self.page += 1
+            self.load_orders()
+
     def load_orders(self):
         """
-        Loads all orders from the inventory service and displays them in the table.
+        Loads the current page of orders matching the filters and displays
+        them in the table. Costs the same few queries for any page size.
         """
         try:
-            orders = self.inventory_service.get_all_orders()
-            self.table.setRowCount(0)  # Clear existing rows
-            for order in orders:
-                row_position = self.table.rowCount()
-                self.table.insertRow(row_position)
+            filters = self.current_filters()
+            self.total_orders = self.inventory_service.count_orders(**filters)
+            page_count = max(1, -(-self.total_orders // ORDERS_PAGE_SIZE))
+            self.page = min(self.page, page_count - 1)
+            orders = self.inventory_service.get_orders(
+                limit=ORDERS_PAGE_SIZE, offset=self.page * ORDERS_PAGE_SIZE, **filters
+            )
 
+            self.table.setUpdatesEnabled(False)
+            self.table.setRowCount(len(orders))
+            for row_position, order in enumerate(orders):
                 # Populate table cells
                 self.table.setItem(row_position, 0, QTableWidgetItem(str(order.order_id)))
                 self.table.setItem(row_position, 1, QTableWidgetItem(order.supplier.name if order.supplier else "N/A"))
@@ -181,8 +264,14 @@ class OrdersManagement(QWidget):
                 self.table.setItem(row_position, 3, QTableWidgetItem(order.expected_delivery_date.strftime("%Y-%m-%d")))
                 self.table.setItem(row_position, 4, QTableWidgetItem(f"Rs.{order.total_cost:.2f}"))
                 self.table.setItem(row_position, 5, QTableWidgetItem(order.status.value))
+            self.table.setUpdatesEnabled(True)
+
+            self.page_label.setText(f"Page {self.page + 1} of {page_count} ({self.total_orders} orders)")
+            self.prev_page_btn.setEnabled(self.page > 0)
+            self.next_page_btn.setEnabled(self.page + 1 < page_count)
 
         except Exception as e:
+            self.table.setUpdatesEnabled(True)
             QMessageBox.critical(self, "Error", f"Failed to load orders: {str(e)}")
 
     def add_order(self):
@@ -266,3 +355,73 @@ class OrdersManagement(QWidget):
                 self.load_orders()
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to delete order: {e}")
+
+    def receive_order(self):
+        """
+        Opens the goods receipt for the selected order and books every
+        received line as a batch in one transaction.
+        """
+        selected_items = self.table.selectedItems()
+        if not selected_items:
+            QMessageBox.warning(self, "No Selection", "Please select an order to receive.")
+            return
+
+        order_id = int(self.table.item(selected_items[0].row(), 0).text())
+        order = self.inventory_service.get_order_by_id(order_id)
+        if not order:
+            QMessageBox.warning(self, "Error", "Selected order not found.")
+            return
+        if order.status == OrderStatus.Delivered:
+            QMessageBox.information(self, "Already Received", f"Order ID {order_id} has already been received.")
+            return
+
+        dialog = ReceiveOrderDialog(self, order)
+        dialog.setModal(True)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            try:
+                receipt = self.inventory_service.receive_order(order_id, dialog.get_receipt_lines())
+                QMessageBox.information(
+                    self, "Success",
+                    f"Order ID {order_id} received: {receipt.batch_count} batches, "
+                    f"{sum(receipt.received.values())} units."
+                )
+                self.load_orders()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to receive order: {e}")
+
+    def reorder_low_stock(self):
+        """
+        Drafts one pending order per supplier for every low stock product
+        and, once confirmed, saves them together.
+        """
+        try:
+            drafts = self.inventory_service.draft_reorders()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to draft reorders: {e}")
+            return
+
+        unassigned = ""
+        if drafts.unassigned:
+            names = ", ".join(product.name for product in drafts.unassigned[:10])
+            more = f" and {len(drafts.unassigned) - 10} more" if len(drafts.unassigned) > 10 else ""
+            unassigned = f"\n\nNo previous supplier for: {names}{more}. Order these manually."
+        if not drafts.orders:
+            QMessageBox.information(self, "Reorder", "Nothing to reorder." + unassigned)
+            return
+
+        lines = sum(len(order.items) for order in drafts.orders)
+        total = sum(order.total_cost for order in drafts.orders)
+        reply = QMessageBox.question(
+            self, "Reorder Low Stock",
+            f"Create {len(drafts.orders)} pending orders with {lines} lines, "
+            f"total cost {total:.2f}?" + unassigned,
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            self.inventory_service.add_orders(drafts.orders)
+            QMessageBox.information(self, "Success", f"Created {len(drafts.orders)} pending orders.")
+            self.load_orders()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to create orders: {e}")
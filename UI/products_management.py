@@ -5,6 +5,8 @@ from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
 
 from .add_product_dialog import AddProductDialog
+from .low_stock_dialog import LowStockDialog
+from worker import ForecastWorker
 
 class ProductsManagement(QWidget):
     def __init__(self, inventory_service):
@@ -19,16 +21,24 @@ class ProductsManagement(QWidget):
         self.edit_product_btn = QPushButton("Edit Product")
         self.delete_product_btn = QPushButton("Delete Product")
         self.refresh_data_btn = QPushButton("Refresh")  # New Refresh button
+        self.suggest_levels_btn = QPushButton("Suggest Reorder Levels")
+        self.suggest_levels_btn.setToolTip("Forecast demand from sales history and update reorder levels")
+        self.low_stock_btn = QPushButton("Low Stock")
+        self.low_stock_btn.setToolTip("Products at or below their reorder level")
         
         self.add_product_btn.clicked.connect(self.add_product)
         self.edit_product_btn.clicked.connect(self.edit_product)
         self.delete_product_btn.clicked.connect(self.delete_product)
         self.refresh_data_btn.clicked.connect(self.refresh_data)  # Connect to a new method
+        self.suggest_levels_btn.clicked.connect(self.suggest_reorder_levels)
+        self.low_stock_btn.clicked.connect(self.show_low_stock)
         
         btn_layout.addWidget(self.add_product_btn)
         btn_layout.addWidget(self.edit_product_btn)
         btn_layout.addWidget(self.delete_product_btn)
         btn_layout.addWidget(self.refresh_data_btn)  # Add Refresh button to layout
+        btn_layout.addWidget(self.suggest_levels_btn)
+        btn_layout.addWidget(self.low_stock_btn)
         btn_layout.addStretch()
         
         self.layout.addLayout(btn_layout)
@@ -44,6 +54,7 @@ class ProductsManagement(QWidget):
         self.table.horizontalHeader().setStretchLastSection(True)
         self.layout.addWidget(self.table)
         
+        self.forecast_worker = None
         self.load_products()
         self.apply_styles()
 
@@ -170,4 +181,44 @@ class ProductsManagement(QWidget):
 
     def refresh_data(self):
         self.load_products()
-        QMessageBox.information(self, "Refreshed", "Product data has been refreshed.")
\ No newline at end of file
+        QMessageBox.information(self, "Refreshed", "Product data has been refreshed.")
+
+    def show_low_stock(self):
+        """Lists the low stock products from the service's reorder engine, loaded on first use."""
+        try:
+            products = self.inventory_service.get_low_stock_products()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load low stock products: {e}")
+            return
+        LowStockDialog(self, products).exec()
+
+    def suggest_reorder_levels(self):
+        """Runs the demand forecast on a worker thread."""
+        self.suggest_levels_btn.setEnabled(False)
+        self.forecast_worker = ForecastWorker()
+        self.forecast_worker.finished.connect(self.on_reorder_levels_suggested)
+        self.forecast_worker.error.connect(self.on_forecast_error)
+        self.forecast_worker.start()
+
+    def on_reorder_levels_suggested(self, levels):
+        self.suggest_levels_btn.setEnabled(True)
+        if not levels:
+            QMessageBox.information(self, "Reorder Levels", "All reorder levels already match the forecast.")
+            return
+        reply = QMessageBox.question(
+            self, "Reorder Levels",
+            f"The demand forecast suggests new reorder levels for {len(levels)} products. Apply them?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        try:
+            self.inventory_service.update_reorder_levels(levels)
+            QMessageBox.information(self, "Success", f"Updated reorder levels of {len(levels)} products.")
+            self.load_products()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to update reorder levels: {e}")
+
+    def on_forecast_error(self, error_message):
+        self.suggest_levels_btn.setEnabled(True)
+        QMessageBox.critical(self, "Forecast Error", f"Failed to forecast demand: {error_message}")
@@ -0,0 +1,165 @@
+# ui/receive_order_dialog.py
+
+from PyQt6.QtWidgets import (
+    QDialog, QDialogButtonBox, QDateEdit, QSpinBox, QLabel, QVBoxLayout,
+    QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView
+)
+from PyQt6.QtCore import QDate, Qt
+from PyQt6.QtGui import QFont
+from domain.domain_models import Order, ReceiptLine
+
+# Default shelf life offered for a line until the expiry date is keyed in
+DEFAULT_SHELF_LIFE_DAYS = 365
+
+class ReceiveOrderDialog(QDialog):
+    """
+    Goods receipt for a delivered order: one row per order line with the
+    received quantity and the lot's manufacture and expiry dates. Accepting
+    the dialog yields the ReceiptLines for InventoryService.receive_order.
+    """
+    def __init__(self, parent=None, order: Order = None):
+        super().__init__(parent)
+        self.order = order
+        self.setWindowTitle(f"Receive Order ID {order.order_id}")
+        self.resize(800, 600)
+        self.setWindowFlags(self.windowFlags() & ~Qt.WindowType.WindowContextHelpButtonHint)  # Remove help button
+
+        self.setStyleSheet("""
+            QDialog {
+                background-color: #2C2C3E;
+                color: #E0E0E0;
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                font-size: 15px;
+            }
+            QLabel {
+                font-size: 15px;
+                color: #E0E0E0;
+                background-color: transparent;
+            }
+            QDateEdit, QSpinBox {
+                background-color: #3A3A4D;
+                color: #FFFFFF;
+                border: 1px solid #555555;
+                border-radius: 4px;
+                padding: 2px;
+                font-size: 14px;
+            }
+            QPushButton {
+                background-color: #00ADB5;
+                color: #FFFFFF;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-size: 14px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #009A9C;
+            }
+            QTableWidget {
+                background-color: #3A3A4D;
+                color: #FFFFFF;
+                border: 1px solid #555555;
+                border-radius: 6px;
+                font-size: 14px;
+            }
+            QHeaderView::section {
+                background-color: #555555;
+                color: #FFFFFF;
+                padding: 5px;
+                border: 1px solid #3A3A4D;
+            }
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        header = QLabel(f"Receive Order {order.order_id}"
+                        + (f" from {order.supplier.name}" if order.supplier else ""))
+        header.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
+        header.setStyleSheet("color: #00ADB5;")
+        header.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(header)
+
+        # Apply one pair of dates to every line, for deliveries of a single lot
+        bulk_layout = QHBoxLayout()
+        bulk_layout.addWidget(QLabel("Manufactured:"))
+        self.bulk_manufacture_edit = self.date_edit(QDate.currentDate())
+        bulk_layout.addWidget(self.bulk_manufacture_edit)
+        bulk_layout.addWidget(QLabel("Expires:"))
+        self.bulk_expiry_edit = self.date_edit(QDate.currentDate().addDays(DEFAULT_SHELF_LIFE_DAYS))
+        bulk_layout.addWidget(self.bulk_expiry_edit)
+        apply_all_btn = QPushButton("Apply to All Lines")
+        apply_all_btn.clicked.connect(self.apply_dates_to_all)
+        bulk_layout.addWidget(apply_all_btn)
+        bulk_layout.addStretch()
+        layout.addLayout(bulk_layout)
+
+        self.table = QTableWidget(len(order.items), 5)
+        self.table.setHorizontalHeaderLabels(["Product", "Ordered", "Received", "Manufactured", "Expires"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        for row, item in enumerate(order.items):
+            name = item.product.name if item.product else str(item.product_id)
+            name_cell = QTableWidgetItem(name)
+            name_cell.setFlags(name_cell.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.table.setItem(row, 0, name_cell)
+            ordered_cell = QTableWidgetItem(str(item.quantity))
+            ordered_cell.setFlags(ordered_cell.flags() & ~Qt.ItemFlag.ItemIsEditable)
+            self.table.setItem(row, 1, ordered_cell)
+
+            received_spin = QSpinBox()
+            received_spin.setRange(0, 10_000_000)
+            received_spin.setValue(item.quantity)
+            self.table.setCellWidget(row, 2, received_spin)
+            self.table.setCellWidget(row, 3, self.date_edit(self.bulk_manufacture_edit.date()))
+            self.table.setCellWidget(row, 4, self.date_edit(self.bulk_expiry_edit.date()))
+        layout.addWidget(self.table)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        self.button_box.button(QDialogButtonBox.StandardButton.Ok).setText("Receive into Stock")
+        self.button_box.accepted.connect(self.validate_and_accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+    @staticmethod
+    def date_edit(date):
+        edit = QDateEdit(date)
+        edit.setCalendarPopup(True)
+        edit.setDisplayFormat("yyyy-MM-dd")
+        return edit
+
+    def apply_dates_to_all(self):
+        for row in range(self.table.rowCount()):
+            self.table.cellWidget(row, 3).setDate(self.bulk_manufacture_edit.date())
+            self.table.cellWidget(row, 4).setDate(self.bulk_expiry_edit.date())
+
+    def get_receipt_lines(self):
+        """Receipt lines for every row with a received quantity; zero means not delivered."""
+        lines = []
+        for row, item in enumerate(self.order.items):
+            quantity = self.table.cellWidget(row, 2).value()
+            if quantity == 0:
+                continue
+            lines.append(ReceiptLine(
+                product_id=item.product_id,
+                quantity=quantity,
+                manufacture_date=self.table.cellWidget(row, 3).date().toPyDate(),
+                expiry_date=self.table.cellWidget(row, 4).date().toPyDate(),
+                order_item_id=item.order_item_id
+            ))
+        return lines
+
+    def validate_and_accept(self):
+        for row in range(self.table.rowCount()):
+            if self.table.cellWidget(row, 2).value() == 0:
+                continue
+            if self.table.cellWidget(row, 4).date() <= self.table.cellWidget(row, 3).date():
+                QMessageBox.warning(self, "Invalid Dates",
+                                    f"The expiry date of {self.table.item(row, 0).text()} must be after its manufacture date.")
+                return
+        if not self.get_receipt_lines():
+            QMessageBox.warning(self, "Nothing Received", "Enter a received quantity for at least one line.")
+            return
+        self.accept()
@@ -1,16 +1,34 @@
 # ui/reports.py
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox, QDateEdit, QTextEdit, QMessageBox
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox, QDateEdit, QPlainTextEdit, QMessageBox,
+    QFileDialog, QProgressBar
 )
-from PyQt6.QtGui import QFont
-from PyQt6.QtCore import Qt
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from PyQt6.QtGui import QFont, QTextCursor
+from PyQt6.QtCore import Qt, QTimer
 from datetime import datetime
-from typing import Dict
+from itertools import islice
+from typing import Iterator, List
 
-from domain.domain_models import SalesReport
+from services.reporting import ReportData, SALES_REPORT, INVENTORY_STATUS, EXPIRY_WRITE_OFF, iter_report_lines
+from worker import ReportLoader, ExportWorker
+
+# Export types offered on the page; keys of data.report_queries.REPORT_QUERIES
+EXPORT_TYPES = ["Sales", "Inventory Status", "Expiry", "Orders"]
+
+# Save dialog filters -> (export format, gzip)
+EXPORT_FILTERS = {
+    "CSV (*.csv)": ("csv", False),
+    "CSV, gzip (*.csv.gz)": ("csv", True),
+    "Columnar (*.gcol)": ("columnar", False),
+    "Columnar, gzip (*.gcol.gz)": ("columnar", True),
+}
+
+# Pie slices below this percentage are drawn without a percentage label.
+PIE_MIN_LABEL_PCT = 2.0
+
+# Number of report lines appended to the view per event-loop iteration.
+REPORT_CHUNK_LINES = 500
 
 class Reports(QWidget):
     def __init__(self, inventory_service):
@@ -23,7 +41,7 @@ class Reports(QWidget):
         param_layout = QHBoxLayout()
         
         self.report_type_combo = QComboBox()
-        self.report_type_combo.addItems(["Sales Report", "Inventory Status"])
+        self.report_type_combo.addItems([SALES_REPORT, INVENTORY_STATUS, EXPIRY_WRITE_OFF])
         param_layout.addWidget(QLabel("Report Type:"))
         param_layout.addWidget(self.report_type_combo)
         
@@ -44,15 +62,47 @@ class Reports(QWidget):
         param_layout.addWidget(self.generate_btn)
         
         self.layout.addLayout(param_layout)
+
+        # Export controls
+        export_layout = QHBoxLayout()
+        self.export_type_combo = QComboBox()
+        self.export_type_combo.addItems(EXPORT_TYPES)
+        export_layout.addWidget(QLabel("Export:"))
+        export_layout.addWidget(self.export_type_combo)
+
+        self.export_btn = QPushButton("Export...")
+        self.export_btn.clicked.connect(self.export_data)
+        export_layout.addWidget(self.export_btn)
+
+        self.export_progress = QProgressBar()
+        self.export_progress.setVisible(False)
+        export_layout.addWidget(self.export_progress)
+        export_layout.addStretch()
+
+        self.layout.addLayout(export_layout)
+        self.export_worker = None
         
-        # Report display area
-        self.report_display = QTextEdit()
+        # Report display area. QPlainTextEdit lays out only the visible
+        # blocks, and with undo disabled the document is the only copy of
+        # the report text.
+        self.report_display = QPlainTextEdit()
         self.report_display.setReadOnly(True)
+        self.report_display.setUndoRedoEnabled(False)
+        self.report_display.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
         self.layout.addWidget(self.report_display)
+        self.report_lines = None
+        self.report_stream_id = 0
         
         # Report visualization
-        self.canvas = FigureCanvas(plt.Figure(figsize=(5, 3)))
+        # matplotlib is imported here rather than at module level so that it
+        # is only loaded once the Reports page is actually opened.
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        self.canvas = FigureCanvas(Figure(figsize=(5, 3)))
         self.layout.addWidget(self.canvas)
+        # Artists of the last bar chart, reused when the next chart has the same shape
+        self.chart_artists = None
+        self.report_loader = None
         
         self.apply_styles()
 
@@ -113,7 +163,7 @@ class Reports(QWidget):
                 background-color: #007f8b;
             }
 
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #2b2b3c; 
                 color: #ffffff; 
                 border: 1px solid #5a5f66;
@@ -135,75 +185,148 @@ class Reports(QWidget):
             QMessageBox.warning(self, "Invalid Dates", "Start date must be before end date.")
             return
 
-        if report_type == "Sales Report":
-            sales_report = self.inventory_service.get_sales_report(start_date, end_date)
-            report_text = f"Sales Report from {sales_report.start_date} to {sales_report.end_date}\n"
-            report_text += f"Total Sales: {sales_report.total_sales:.2f}\n\n"
-            report_text += "Detailed Sales:\n"
+        # Querying and aggregating happen on a worker thread; only drawing
+        # is left for the UI thread.
+        self.generate_btn.setEnabled(False)
+        self.report_loader = ReportLoader(report_type, start_date, end_date)
+        self.report_loader.finished.connect(self.on_report_ready)
+        self.report_loader.error.connect(self.on_report_error)
+        self.report_loader.start()
+
+    def export_data(self):
+        """
+        Exports the selected data set for the selected date range to a file.
+        The export streams from the database on a worker thread.
+        """
+        export_type = self.export_type_combo.currentText()
+        start_date = self.start_date_edit.date().toPyDate()
+        end_date = self.end_date_edit.date().toPyDate()
+
+        if start_date > end_date:
+            QMessageBox.warning(self, "Invalid Dates", "Start date must be before end date.")
+            return
 
-            sales_by_product = {}  # Collect sales by product
+        default_name = f"{export_type.lower().replace(' ', '_')}_{start_date}_{end_date}.csv"
+        path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Report", default_name, ";;".join(EXPORT_FILTERS)
+        )
+        if not path:
+            return
+        fmt, compress = EXPORT_FILTERS.get(selected_filter, ("csv", False))
+
+        self.export_btn.setEnabled(False)
+        self.export_progress.setRange(0, 0)  # Busy until the row count is known
+        self.export_progress.setVisible(True)
+
+        self.export_worker = ExportWorker(export_type, start_date, end_date, path, fmt, compress)
+        self.export_worker.progress.connect(self.on_export_progress)
+        self.export_worker.finished.connect(self.on_export_finished)
+        self.export_worker.error.connect(self.on_export_error)
+        self.export_worker.start()
+
+    def on_export_progress(self, written, total):
+        self.export_progress.setRange(0, max(total, 1))
+        self.export_progress.setValue(written)
+
+    def on_export_finished(self, result):
+        self.export_btn.setEnabled(True)
+        self.export_progress.setVisible(False)
+        QMessageBox.information(
+            self, "Export",
+            f"Exported {result.rows} rows to {result.path} "
+            f"in {result.seconds:.1f} s ({result.rows_per_second:,.0f} rows/s)."
+        )
 
-            for sale in self.inventory_service.get_all_sales():
-                if start_date <= sale.sale_date <= end_date:
-                    product_name = sale.product.name if sale.product and sale.product.name else "Unnamed Product"
-                    report_text += (
-                        f"Sale ID: {sale.sale_id}, "
-                        f"Product: {product_name}, "
-                        f"Quantity: {sale.quantity_sold}, "
-                        f"Date: {sale.sale_date}, "
-                        f"Unit Price: {sale.unit_price_at_sale}\n"
-                    )
+    def on_export_error(self, error_message):
+        self.export_btn.setEnabled(True)
+        self.export_progress.setVisible(False)
+        QMessageBox.critical(self, "Export Error", f"Failed to export data: {error_message}")
 
-                    # Accumulate sales amount by product
-                    if product_name not in sales_by_product:
-                        sales_by_product[product_name] = 0.0
-                    sales_by_product[product_name] += sale.quantity_sold * sale.unit_price_at_sale
+    def on_report_error(self, error_message):
+        self.generate_btn.setEnabled(True)
+        QMessageBox.critical(self, "Report Error", f"Failed to generate report: {error_message}")
 
-            self.report_display.setText(report_text)
+    def on_report_ready(self, report: ReportData):
+        self.generate_btn.setEnabled(True)
 
+        # The first chunk is shown right away, the rest is appended while
+        # the event loop keeps running.
+        self.start_report_stream(iter_report_lines(report))
+
+        if report.report_type == SALES_REPORT:
             # Plot the bar chart with valid data
-            if sales_by_product:
-                self.plot_bar_chart(sales_by_product, "Sales by Product", "Product", "Sales Amount")
+            if report.chart_labels:
+                self.plot_bar_chart(report.chart_labels, report.chart_values, "Sales by Product", "Product", "Sales Amount")
             else:
                 QMessageBox.warning(self, "No Sales Data", "No sales data available for the selected dates.")
 
-        elif report_type == "Inventory Status":
-            inventory = self.inventory_service.get_inventory_status()
-            report_text = f"Inventory Status as of {end_date}\n\n"
-            report_text += "Products:\n"
-
-            inventory_distribution = {}
-            for product in inventory:
-                product_name = product.name if product.name else "Unnamed Product"
-                report_text += (
-                    f"Product ID: {product.product_id}, "
-                    f"SKU: {product.sku}, "
-                    f"Name: {product_name}, "
-                    f"Quantity: {product.total_quantity}, "
-                    f"Reorder Level: {product.reorder_level}\n"
-                )
-                inventory_distribution[product_name] = product.total_quantity
-
-            self.report_display.setText(report_text)
-            self.plot_pie_chart(inventory_distribution, "Inventory Distribution")
-
-    
-    def plot_bar_chart(self, data: Dict[str, float], title: str, xlabel: str, ylabel: str):
+        elif report.report_type == INVENTORY_STATUS:
+            self.plot_pie_chart(report.chart_labels, report.chart_values, "Inventory Distribution")
+
+        elif report.report_type == EXPIRY_WRITE_OFF:
+            if report.chart_labels:
+                self.plot_bar_chart(report.chart_labels, report.chart_values, "Expiring Stock Value by Product", "Product", "Stock Value")
+            else:
+                QMessageBox.information(self, "No Expiring Stock", "No batches with stock expire in the selected dates.")
+
+    def start_report_stream(self, lines: Iterator[str]):
+        """
+        Replaces the report text with the given lines, rendered in chunks of
+        REPORT_CHUNK_LINES. Starting a new stream abandons any previous one.
+        """
+        self.report_display.clear()
+        self.report_lines = lines
+        self.report_stream_id += 1
+        self.append_report_chunk(self.report_stream_id)
+
+    def append_report_chunk(self, stream_id: int):
+        if stream_id != self.report_stream_id or self.report_lines is None:
+            return  # A newer report replaced this one
+        chunk = list(islice(self.report_lines, REPORT_CHUNK_LINES))
+        if not chunk:
+            self.report_lines = None
+            return
+
+        cursor = QTextCursor(self.report_display.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.report_display.document().isEmpty():
+            cursor.insertText("\n")
+        cursor.insertText("\n".join(chunk))
+
+        QTimer.singleShot(0, lambda: self.append_report_chunk(stream_id))
+
+    def plot_bar_chart(self, labels: List[str], values: List[float], title: str, xlabel: str, ylabel: str):
+        """
+        Draws a bar chart of already aggregated data (see top_n_with_other).
+        When the previous chart was a bar chart with the same number of bars,
+        its artists are updated in place instead of rebuilding the figure.
+        """
+        # If product names are missing, replace them with placeholders
+        labels = [label if label else "Unknown Product" for label in labels]
+        max_val = max(values) if values else 0
+        offset = max_val * 0.01 if max_val > 0 else 0.1
+
+        cached = self.chart_artists
+        if cached and cached["kind"] == "bar" and len(cached["bars"]) == len(values):
+            ax = cached["ax"]
+            for bar, annotation, value in zip(cached["bars"], cached["annotations"], values):
+                bar.set_height(value)
+                annotation.set_y(value + offset)
+                annotation.set_text(f"{value:.0f}")
+            ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=12, color='#c4c4c4')
+            ax.set_title(title, color='#00adb5', fontsize=18, pad=15, fontweight='bold')
+            ax.set_ylim(0, max_val * 1.1 if max_val > 0 else 1)
+            self.canvas.draw_idle()
+            return
+
         self.canvas.figure.clear()
-        
+
         # Set a slightly larger figure size for readability
         self.canvas.figure.set_size_inches(6, 4)
         ax = self.canvas.figure.add_subplot(111)
 
-        # Extract data
-        products = list(data.keys())
-        sales = list(data.values())
-
-        # If product names are missing, replace them with placeholders
-        products = [p if p else "Unknown Product" for p in products]
-
         # Plot the bar chart
-        bars = ax.bar(products, sales, color='#00adb5', edgecolor='#323544')
+        bars = ax.bar(range(len(values)), values, color='#00adb5', edgecolor='#323544')
 
         # Customize the appearance
         ax.set_facecolor('#1e1e2d')  
@@ -212,57 +335,56 @@ class Reports(QWidget):
         ax.set_ylabel(ylabel, color='#c4c4c4', fontsize=14, labelpad=10)
 
         # Adjust X-axis ticks for better readability
-        ax.set_xticks(range(len(products)))
-        ax.set_xticklabels(products, rotation=45, ha="right", fontsize=12, color='#c4c4c4')
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=12, color='#c4c4c4')
 
         # Use tick_params to set y-axis tick label colors and size
         ax.tick_params(axis='y', colors='#c4c4c4', labelsize=12)
+        ax.set_ylim(0, max_val * 1.1 if max_val > 0 else 1)
 
         # Add grid lines on Y-axis for clarity
         ax.grid(axis='y', linestyle='--', linewidth=0.7, color='#5a5f66', alpha=0.7)
 
         # Annotate each bar with values
-        if sales:
-            max_val = max(sales)
-        else:
-            max_val = 0
+        annotations = []
         for bar in bars:
             height = bar.get_height()
-            ax.text(
+            annotations.append(ax.text(
                 bar.get_x() + bar.get_width() / 2, 
-                height + (max_val * 0.01 if max_val > 0 else 0.1),
+                height + offset,
                 f"{height:.0f}", 
                 ha='center', 
                 va='bottom', 
                 color='#ffffff', 
                 fontsize=10, 
                 fontweight='bold'
-            )
+            ))
 
         # Use tight_layout to avoid label cutoff
         self.canvas.figure.tight_layout(pad=2.0)
-        self.canvas.draw()
+        self.canvas.draw_idle()
+        self.chart_artists = {"kind": "bar", "ax": ax, "bars": list(bars), "annotations": annotations}
 
-    
-    def plot_pie_chart(self, data: Dict[str, float], title: str):
+    def plot_pie_chart(self, labels: List[str], values: List[float], title: str):
+        """
+        Draws a pie chart of already aggregated data (see top_n_with_other).
+        """
         self.canvas.figure.clear()
+        self.chart_artists = None
 
         # Set a larger figure size for readability
         self.canvas.figure.set_size_inches(6, 6)
         ax = self.canvas.figure.add_subplot(111)
 
-        labels = list(data.keys())
-        sizes = list(data.values())
-
         # Define colors for consistency
         colors = ['#00adb5', '#f8c471', '#e74c3c', '#5a5f66', '#c4c4c4']
-        colors = (colors * ((len(sizes) // len(colors)) + 1))[:len(sizes)]
+        colors = (colors * ((len(values) // len(colors)) + 1))[:len(values)]
 
-        # Create the pie chart
-        wedges, texts, autotexts = ax.pie(
-            sizes,
+        # Create the pie chart; percentages are left off slivers too thin to read
+        ax.pie(
+            values,
             labels=labels,
-            autopct='%1.1f%%',
+            autopct=lambda pct: f'{pct:1.1f}%' if pct >= PIE_MIN_LABEL_PCT else '',
             startangle=140,
             colors=colors,
             textprops={'color': '#ffffff', 'fontsize': 10, 'fontweight': 'bold'},
@@ -274,4 +396,4 @@ class Reports(QWidget):
         ax.axis('equal')  # Equal aspect ratio ensures a perfect circle
 
         self.canvas.figure.tight_layout(pad=2.0)
-        self.canvas.draw()
+        self.canvas.draw_idle()
@@ -11,9 +11,6 @@ from domain.domain_models import Product, SaleRecord
 from typing import List
 from datetime import date, datetime
 
-import win32print
-import win32ui
-
 from PyQt6.QtGui import QKeySequence, QShortcut  # Add QShortcut import
 
 
@@ -429,6 +426,8 @@ class SellProductWidget(QWidget):
         """
         Sends the given text directly to the thermal printer.
         """
+        import win32print  # Windows-only; imported when a bill is printed
+
         CUT_COMMAND = "\x1D\x56\x42\x00"
         FEED_LINES = "\n" * 2
         bill_text += FEED_LINES + CUT_COMMAND
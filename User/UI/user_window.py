@@ -1,4 +1,6 @@
+import os
 import sys
+import time
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
@@ -9,9 +11,17 @@ from PyQt6.QtGui import QIcon, QPixmap, QPainter, QColor, QFont
 from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtSvg import QSvgRenderer
 
-# Matplotlib Imports for Embedding Charts
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+import numpy as np
+
+from User.live_source import POLL_INTERVAL_SECONDS
+from User.product_store import ProductStore
+from User.snapshot_loader import load_snapshot_rows
+from User.sort_engine import SortEngine, sort_rows_with
+from utils.catalogue_snapshot import CatalogueSnapshot, SnapshotError, SnapshotProducts, SNAPSHOT_FILE
+from worker import CatalogueChangePoller
+
+# Repository root, where the backup files are written
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
 
 def load_white_icon(svg_path, size=QSize(20, 20)):
     """
@@ -51,8 +61,10 @@ class UserMainWindow(QMainWindow):
         self.setWindowTitle("User Inventory Management")
         self.setGeometry(100, 100, 1200, 700)
 
-        # Load inventory data
+        # Load inventory data from the backup files; the change poller
+        # replaces it with the live catalogue once the database answers
         self.inventory = Inventory()
+        self.change_poller = None
 
         # Central Widget
         self.central_widget = QWidget()
@@ -100,6 +112,35 @@ class UserMainWindow(QMainWindow):
         self.nav_buttons["Home"].setChecked(True)
         self.switch_page(0)
 
+        self.start_change_polling()
+
+    def start_change_polling(self):
+        self.change_poller = CatalogueChangePoller(POLL_INTERVAL_SECONDS)
+        self.change_poller.changes.connect(self.on_catalogue_changes)
+        self.change_poller.error.connect(lambda message: print(f"Catalogue poll failed: {message}"))
+        self.change_poller.start()
+
+    def stop_change_polling(self):
+        if self.change_poller is not None:
+            self.change_poller.requestInterruption()
+            self.change_poller.wait()
+            self.change_poller = None
+
+    def on_catalogue_changes(self, delta):
+        rebuilt = self.inventory.apply_changes(delta)
+        if rebuilt:
+            self.view_products_page.load_products()
+        else:
+            # Changed in place: only the rows of the changed products need redrawing
+            store = self.inventory.get_product_store()
+            self.view_products_page.update_rows(store.rows_for_ids([row[0] for row in delta.rows]))
+        self.sort_products_page.refresh(rebuilt)
+        self.search_products_page.refresh(rebuilt)
+
+    def closeEvent(self, event):
+        self.stop_change_polling()
+        super().closeEvent(event)
+
     def apply_styles(self):
         self.setStyleSheet("""
             QMainWindow {
@@ -273,9 +314,13 @@ class UserMainWindow(QMainWindow):
         contact_dialog.exec()
 
     def logout(self):
-        self.close()
-        self.login_window = LoginWindow()
-        self.login_window.show()
+        # Kept hidden by the app context, so the next user login reuses it
+        self.hide()
+        get_app_context().sign_out()
+
+    def on_sign_in(self, user):
+        self.nav_buttons["Home"].setChecked(True)
+        self.switch_page(0)
 
 class HomePage(QWidget):
     def __init__(self):
@@ -315,11 +360,20 @@ class ViewProductsPage(QWidget):
         products = self.inventory.get_products()
         self.table.setRowCount(len(products))
         for row, product in enumerate(products):
-            self.table.setItem(row, 0, QTableWidgetItem(str(product.product_id)))
-            self.table.setItem(row, 1, QTableWidgetItem(product.name))
-            self.table.setItem(row, 2, QTableWidgetItem(f"{product.price:.2f}"))
-            self.table.setItem(row, 3, QTableWidgetItem(str(product.quantity)))
-            self.table.setItem(row, 4, QTableWidgetItem(product.category))
+            self.set_row(row, product)
+
+    def update_rows(self, rows):
+        """Redraws the given store rows, which are also the table rows here."""
+        products = self.inventory.get_products()
+        for row in np.asarray(rows).tolist():
+            self.set_row(row, products[row])
+
+    def set_row(self, row, product):
+        self.table.setItem(row, 0, QTableWidgetItem(str(product.product_id)))
+        self.table.setItem(row, 1, QTableWidgetItem(product.name))
+        self.table.setItem(row, 2, QTableWidgetItem(f"{product.price:.2f}"))
+        self.table.setItem(row, 3, QTableWidgetItem(str(product.quantity)))
+        self.table.setItem(row, 4, QTableWidgetItem(product.category))
 
 class SortProductsPage(QWidget):
     def __init__(self, inventory):
@@ -339,7 +393,7 @@ class SortProductsPage(QWidget):
         algo_layout = QVBoxLayout()
         algo_label = QLabel("Select Sorting Algorithm:")
         self.algo_combo = QComboBox()
-        self.algo_combo.addItems(["Quick Sort", "Merge Sort", "Shell Sort"])
+        self.algo_combo.addItems(["Keyed Sort", "Quick Sort", "Merge Sort", "Shell Sort"])
         algo_layout.addWidget(algo_label)
         algo_layout.addWidget(self.algo_combo)
         sorting_options_layout.addLayout(algo_layout)
@@ -375,7 +429,7 @@ class SortProductsPage(QWidget):
         self.filter_category_combo = QComboBox()
         self.filter_category_combo.addItem("All")
         # Populate categories from inventory
-        categories = set([p.category for p in self.inventory.get_products()])
+        categories = self.inventory.get_product_store().categories.tolist()
         for cat in categories:
             self.filter_category_combo.addItem(cat)
         self.filter_category_combo.setToolTip("Filter by category")
@@ -416,31 +470,25 @@ class SortProductsPage(QWidget):
         layout.addWidget(self.table)
 
         self.setLayout(layout)
-        self.current_products = self.inventory.get_products()  # Store current displayed products
-        self.display_products(self.current_products)
+        # Last sort and filter applied, re-run when the catalogue is rebuilt
+        self.sort_settings = None
+        self.filter_settings = None
+        self.current_rows = self.inventory.get_product_store().all_rows()  # Rows currently displayed, in display order
+        self.display_rows(self.current_rows)
 
     def sort_products(self):
         algorithm = self.algo_combo.currentText()
         primary_key = self.primary_combo.currentText().lower().replace(" ", "_")
         secondary_key = self.secondary_combo.currentText().lower().replace(" ", "_")
-        products = self.inventory.get_products()
 
         sort_keys = [primary_key]
         if secondary_key != "none":
             sort_keys.append(secondary_key)
 
-        # Decide sorting function
-        if algorithm == "Quick Sort":
-            sorted_products = self.inventory.quick_sort(products.copy(), sort_keys)
-        elif algorithm == "Merge Sort":
-            sorted_products = self.inventory.merge_sort(products.copy(), sort_keys)
-        elif algorithm == "Shell Sort":
-            sorted_products = self.inventory.shell_sort(products.copy(), sort_keys)
-        else:
-            sorted_products = products
-
-        self.current_products = sorted_products
-        self.display_products(self.current_products)
+        self.sort_settings = (algorithm, sort_keys)
+        self.filter_settings = None
+        self.current_rows = self.inventory.sorted_rows(algorithm, sort_keys)
+        self.display_rows(self.current_rows)
 
     def apply_filter(self):
         # Filter the currently displayed (already sorted) products
@@ -464,12 +512,33 @@ class SortProductsPage(QWidget):
             QMessageBox.warning(self, "Invalid Input", "Max Price must be a number.")
             return
 
-        filtered = self.inventory.filter_products(self.current_products,
-                                                  category=None if selected_category == "All" else selected_category,
-                                                  name_substring=name_substring,
-                                                  min_price=min_price,
-                                                  max_price=max_price)
-        self.display_products(filtered)
+        self.filter_settings = dict(category=None if selected_category == "All" else selected_category,
+                                    name_substring=name_substring,
+                                    min_price=min_price,
+                                    max_price=max_price)
+        self.display_filtered()
+
+    def display_filtered(self):
+        if self.filter_settings is None:
+            self.display_rows(self.current_rows)
+        else:
+            self.display_rows(self.inventory.filter_rows(self.current_rows, **self.filter_settings))
+
+    def refresh(self, rebuilt):
+        """
+        Redisplays after a catalogue change. A rebuilt store invalidates the
+        held rows, so the last sort is run again on it; the filter is always
+        re-applied, since prices may have moved.
+        """
+        if rebuilt:
+            if self.sort_settings is None:
+                self.current_rows = self.inventory.get_product_store().all_rows()
+            else:
+                self.current_rows = self.inventory.sorted_rows(*self.sort_settings)
+        self.display_filtered()
+
+    def display_rows(self, rows):
+        self.display_products(self.inventory.get_product_store().products_at(rows))
 
     def display_products(self, products):
         self.table.setRowCount(len(products))
@@ -496,13 +565,13 @@ class SearchProductsPage(QWidget):
         algo_layout.addWidget(QLabel("Select Search Algorithm:"))
 
         self.algo_combo = QComboBox()
-        self.algo_combo.addItems(["Linear Search", "Binary Search"])
+        self.algo_combo.addItems(["Hash Lookup", "Binary Search", "Linear Search"])
         algo_layout.addWidget(self.algo_combo)
         layout.addLayout(algo_layout)
 
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Enter Product ID to search")
+        self.search_input.setPlaceholderText("Product ID, IDs separated by commas, or a range like 10-20")
         self.search_button = QPushButton("Search")
         self.search_button.setObjectName("primaryButton")
         self.search_button.clicked.connect(self.search_product)
@@ -516,7 +585,7 @@ class SearchProductsPage(QWidget):
 
         self.filter_category_combo = QComboBox()
         self.filter_category_combo.addItem("All")
-        categories = set([p.category for p in self.inventory.get_products()])
+        categories = self.inventory.get_product_store().categories.tolist()
         for cat in categories:
             self.filter_category_combo.addItem(cat)
         self.filter_category_combo.setToolTip("Filter by category")
@@ -553,32 +622,34 @@ class SearchProductsPage(QWidget):
         layout.addWidget(self.result_table)
 
         self.setLayout(layout)
-        self.search_results = []  # store current search results for filtering
+        self.search_rows = np.empty(0, dtype=np.intp)  # rows of the current search results, for filtering
+        # Last search and filter applied, re-run when the catalogue is rebuilt
+        self.search_settings = None
+        self.filter_settings = None
 
     def search_product(self):
+        text = self.search_input.text().replace(" ", "")
         try:
-            product_id = int(self.search_input.text())
-            algorithm = self.algo_combo.currentText()
-            products = self.inventory.get_products()
-            if algorithm == "Binary Search":
-                # Ensure the list is sorted by product_id
-                sorted_products = sorted(products, key=lambda x: x.product_id)
-                product = self.inventory.recursive_binary_search(sorted_products, product_id, 0, len(sorted_products) - 1)
-                self.search_results = [product] if product else []
-            elif algorithm == "Linear Search":
-                product = self.inventory.linear_search(products, product_id)
-                self.search_results = [product] if product else []
-            else:
-                self.search_results = []
-
-            if self.search_results and self.search_results[0]:
-                self.display_products(self.search_results)
+            if "-" in text:
+                low, high = text.split("-", 1)
+                query = dict(id_range=(int(low), int(high)))
             else:
-                QMessageBox.information(self, "Not Found", "Product not found.")
-                self.result_table.setRowCount(0)
-
+                product_ids = [int(part) for part in text.split(",") if part]
+                if not product_ids:
+                    raise ValueError(text)
+                query = dict(product_ids=product_ids)
         except ValueError:
-            QMessageBox.warning(self, "Invalid Input", "Please enter a valid Product ID.")
+            QMessageBox.warning(self, "Invalid Input", "Please enter a valid Product ID, list of IDs or ID range.")
+            return
+
+        self.search_settings = (self.algo_combo.currentText(), query)
+        self.filter_settings = None
+        self.search_rows = self.inventory.find_rows(self.search_settings[0], **query)
+        if len(self.search_rows):
+            self.display_rows(self.search_rows)
+        else:
+            QMessageBox.information(self, "Not Found", "Product not found.")
+            self.result_table.setRowCount(0)
 
     def apply_filter(self):
         selected_category = self.filter_category_combo.currentText()
@@ -601,12 +672,32 @@ class SearchProductsPage(QWidget):
             QMessageBox.warning(self, "Invalid Input", "Max Price must be a number.")
             return
 
-        filtered = self.inventory.filter_products(self.search_results,
-                                                  category=None if selected_category == "All" else selected_category,
-                                                  name_substring=name_substring,
-                                                  min_price=min_price,
-                                                  max_price=max_price)
-        self.display_products(filtered)
+        self.filter_settings = dict(category=None if selected_category == "All" else selected_category,
+                                    name_substring=name_substring,
+                                    min_price=min_price,
+                                    max_price=max_price)
+        self.display_filtered()
+
+    def display_filtered(self):
+        if self.filter_settings is None:
+            self.display_rows(self.search_rows)
+        else:
+            self.display_rows(self.inventory.filter_rows(self.search_rows, **self.filter_settings))
+
+    def refresh(self, rebuilt):
+        """
+        Redisplays after a catalogue change. A rebuilt store invalidates the
+        held rows, so the last search is run again on it, then the filter.
+        """
+        if self.search_settings is None:
+            return
+        if rebuilt:
+            algorithm, query = self.search_settings
+            self.search_rows = self.inventory.find_rows(algorithm, **query)
+        self.display_filtered()
+
+    def display_rows(self, rows):
+        self.display_products(self.inventory.get_product_store().products_at(rows))
 
     def display_products(self, products):
         self.result_table.setRowCount(len(products))
@@ -666,7 +757,9 @@ class ReportsPage(QWidget):
 
         layout.addLayout(viz_layout)
 
-        # Canvas for Charts
+        # Canvas for Charts (matplotlib is loaded with this page, not at startup)
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
         self.chart_canvas = FigureCanvas(Figure(figsize=(5, 3)))
         self.chart_canvas.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.chart_canvas.updateGeometry()
@@ -677,19 +770,19 @@ class ReportsPage(QWidget):
     def count_category(self):
         category, ok = QInputDialog.getText(self, "Category Input", "Enter the category name:")
         if ok and category:
-            count = self.inventory.count_products_in_category(self.inventory.products, category)
+            count = self.inventory.get_category_aggregates().count(category)
             self.count_result.setText(f"Total products in '{category}': {count}")
         else:
             QMessageBox.warning(self, "Input Error", "Please enter a valid category name.")
 
     def calculate_value(self):
-        total = self.inventory.calculate_total_value(self.inventory.products)
+        total = self.inventory.get_category_aggregates().total_value
         self.value_result.setText(f"Total Inventory Value: Rs.{total:.2f}")
 
     def show_category_chart(self):
-        category_counts = self.inventory.get_category_counts()
-        categories = list(category_counts.keys())
-        counts = list(category_counts.values())
+        aggregates = self.inventory.get_category_aggregates()
+        categories = aggregates.categories
+        counts = aggregates.counts
 
         self.chart_canvas.figure.clear()
         ax = self.chart_canvas.figure.add_subplot(111)
@@ -701,9 +794,9 @@ class ReportsPage(QWidget):
         self.chart_canvas.draw()
 
     def show_quantity_chart(self):
-        category_quantities = self.inventory.get_category_quantities()
-        categories = list(category_quantities.keys())
-        quantities = list(category_quantities.values())
+        aggregates = self.inventory.get_category_aggregates()
+        categories = aggregates.categories
+        quantities = aggregates.quantities
 
         self.chart_canvas.figure.clear()
         ax = self.chart_canvas.figure.add_subplot(111)
@@ -774,180 +867,153 @@ class ContactDialog(QDialog):
 
 class Inventory:
     def __init__(self):
-        self.products = self.load_data()
+        self.products = []
+        self.sort_engine = None
+        self.product_store = None
+        self.snapshot = None
+        self.reload()
+
+    def reload(self):
+        """Loads the products and rebuilds the store and its id index from them."""
+        self.close_snapshot()
+        self.snapshot = self.open_snapshot()
+        if self.snapshot is not None:
+            self.products = SnapshotProducts(self.snapshot, Product)
+            self.product_store = ProductStore(self.products, snapshot=self.snapshot)
+        else:
+            self.products = self.load_data()
+            self.product_store = ProductStore(self.products)
+        self.sort_engine = None
+
+    def close_snapshot(self):
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+
+    def set_products(self, products):
+        self.close_snapshot()
+        self.products = products
+        self.product_store = ProductStore(products)
+        self.sort_engine = None
+
+    def apply_changes(self, delta):
+        """
+        Applies a CatalogueDelta from the live source. Price and stock changes
+        to known products are written into the existing objects and store
+        columns, so row indexes held by the pages stay valid. Anything else
+        (new, deleted or renamed products) rebuilds the store from the
+        updated product list. Returns True if the store was rebuilt.
+        """
+        if delta.full:
+            self.set_products([Product(*row) for row in delta.rows])
+            return True
+
+        store = self.product_store
+        in_place = not delta.deleted_ids
+        for product_id, name, _, _, category in delta.rows:
+            row = store.row_for_id(product_id)
+            if row is None or self.products[row].name != name or self.products[row].category != category:
+                in_place = False
+                break
+
+        if in_place:
+            rows = [store.row_for_id(row[0]) for row in delta.rows]
+            for row, (_, _, price, quantity, _) in zip(rows, delta.rows):
+                self.products[row].price = price
+                self.products[row].quantity = quantity
+            store.update_values(rows, [row[2] for row in delta.rows], [row[3] for row in delta.rows])
+            self.sort_engine = None
+            return False
+
+        by_id = {product.product_id: product for product in self.products}
+        for product_id in delta.deleted_ids:
+            by_id.pop(product_id, None)
+        for row in delta.rows:
+            by_id[row[0]] = Product(*row)
+        self.set_products(list(by_id.values()))
+        return True
+
+    def open_snapshot(self):
+        """
+        Opens the binary catalogue snapshot written by the admin backup, if
+        there is one at least as new as the JSON backup. Returns None to fall
+        back to the JSON backup.
+        """
+        snapshot_file = os.path.join(BASE_DIR, SNAPSHOT_FILE)
+        backup_file = os.path.join(BASE_DIR, 'backupbyUser.json')
+        if not os.path.exists(snapshot_file):
+            return None
+        if os.path.exists(backup_file) and os.path.getmtime(backup_file) > os.path.getmtime(snapshot_file):
+            print("Catalogue snapshot is older than the JSON backup, loading the JSON backup.")
+            return None
+        try:
+            start = time.perf_counter()
+            snapshot = CatalogueSnapshot(snapshot_file)
+        except (OSError, SnapshotError) as e:
+            print(f"Could not open catalogue snapshot, loading the JSON backup: {e}")
+            return None
+        print(f"Opened catalogue snapshot with {len(snapshot)} products in {(time.perf_counter() - start) * 1000:.1f} ms.")
+        return snapshot
 
     def load_data(self):
-        import json
-        import os
-        products = []
+        backup_file = os.path.join(BASE_DIR, 'backupbyUser.json')
+
+        if not os.path.exists(backup_file):
+            print(f"backup.json not found at {backup_file}")
+            return []
+
         try:
-            # Get the directory two levels up from the current file
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            BASE_DIR = os.path.abspath(os.path.join(script_dir, '..', '..'))
-            backup_file = os.path.join(BASE_DIR, 'backupbyUser.json')
-
-            print(f"Looking for backup.json at: {backup_file}")
-
-            if not os.path.exists(backup_file):
-                print(f"backup.json not found at {backup_file}")
-                return []
-
-            with open(backup_file, 'r') as f:
-                data = json.load(f)
-
-                # Load products
-                products_data = data.get('products', [])
-                print(f"Found {len(products_data)} products.")
-
-                # Load batches
-                batches_data = data.get('batches', [])
-                print(f"Found {len(batches_data)} batches.")
-
-                # Calculate total quantity per product_id from batches
-                quantity_map = {}
-                for batch in batches_data:
-                    pid = batch.get('product_id')
-                    qty = batch.get('quantity', 0)
-                    if pid in quantity_map:
-                        quantity_map[pid] += qty
-                    else:
-                        quantity_map[pid] = qty
-
-                # Process each product
-                for item in products_data:
-                    product_id = item.get('product_id')
-                    unit_price = item.get('unit_price')
-                    quantity = quantity_map.get(product_id, 0)  # Get total quantity from batches
-
-                    print(f"Loading Product ID: {product_id}, Price: {unit_price}, Quantity: {quantity}")
-
-                    # Handle missing or null 'unit_price'
-                    if unit_price is None:
-                        print(f"Unit price is missing for Product ID {product_id}. Setting default price to 0.0.")
-                        unit_price = 0.0
-
-                    # Ensure correct data types
-                    try:
-                        product_id = int(product_id) if product_id is not None else 0
-                        name = item.get('name', '')
-                        price = float(unit_price)
-                        quantity = int(quantity)
-                        category = item.get('category', '')
-                    except (ValueError, TypeError) as e:
-                        print(f"Data type conversion error for Product ID {product_id}: {e}")
-                        continue  # Skip this product
-
-                    product = Product(
-                        product_id=product_id,
-                        name=name,
-                        price=price,
-                        quantity=quantity,
-                        category=category
-                    )
-                    products.append(product)
-
-        except FileNotFoundError:
-            print("backup.json file not found.")
-        except json.JSONDecodeError as e:
+            rows = load_snapshot_rows(backup_file)
+        except ValueError as e:
+            # json.JSONDecodeError is a ValueError
             print(f"Error decoding JSON: {e}")
+            return []
         except Exception as e:
             print(f"Unexpected error: {e}")
-        return products
+            return []
+
+        print(f"Loaded {len(rows.products)} products and {rows.batch_count} batches in {rows.seconds * 1000:.0f} ms.")
+        return [Product(*row) for row in rows.products]
 
     def get_products(self):
         return self.products
 
-    def quick_sort(self, arr, keys):
-        if len(arr) <= 1:
-            return arr
-        else:
-            pivot = arr[0]
-            less = []
-            greater = []
-            for item in arr[1:]:
-                if self.compare_products(item, pivot, keys) < 0:
-                    less.append(item)
-                else:
-                    greater.append(item)
-            return self.quick_sort(less, keys) + [pivot] + self.quick_sort(greater, keys)
-
-    def shell_sort(self, arr, keys):
-        n = len(arr)
-        gap = n // 2
-        while gap > 0:
-            for i in range(gap, n):
-                temp = arr[i]
-                j = i
-                while j >= gap and self.compare_products(arr[j - gap], temp, keys) > 0:
-                    arr[j] = arr[j - gap]
-                    j -= gap
-                arr[j] = temp
-            gap //= 2
-        return arr
-
-    def merge_sort(self, arr, keys):
+    def get_product_store(self):
+        if self.product_store is None:
+            self.product_store = ProductStore(self.products)
+        return self.product_store
+
+    def sorted_rows(self, algorithm, keys):
+        """Row order of all products sorted on keys, as an index array into the product store."""
+        if algorithm == "Keyed Sort":
+            if self.sort_engine is None:
+                self.sort_engine = SortEngine(self.products, store=self.product_store)
+            return self.sort_engine.permutation(keys)
+        return np.array(sort_rows_with(algorithm, self.products, keys), dtype=np.intp)
+
+    def find_rows(self, algorithm, product_ids=None, id_range=None):
         """
-        Iterative Merge Sort implementation.
+        Rows of the products with the given ids, or with ids in the inclusive
+        id_range (low, high), using the chosen search strategy.
         """
-        current_size = 1
-        n = len(arr)
-        while current_size < n:
-            left = 0
-            while left < n:
-                mid = min(left + current_size - 1, n - 1)
-                right = min(2 * current_size + left - 1, n - 1)
-                if mid < right:
-                    self.merge(arr, left, mid, right, keys)
-                left += 2 * current_size
-            current_size *= 2
-        return arr
-
-    def merge(self, arr, left, mid, right, keys):
-        left_sub = arr[left:mid + 1]
-        right_sub = arr[mid + 1:right + 1]
-        i = j = 0
-        k = left
-        while i < len(left_sub) and j < len(right_sub):
-            if self.compare_products(left_sub[i], right_sub[j], keys) < 0:
-                arr[k] = left_sub[i]
-                i += 1
-            else:
-                arr[k] = right_sub[j]
-                j += 1
-            k += 1
-        while i < len(left_sub):
-            arr[k] = left_sub[i]
-            i += 1
-            k += 1
-        while j < len(right_sub):
-            arr[k] = right_sub[j]
-            j += 1
-            k += 1
-
-    def compare_products(self, a, b, keys):
-        for key in keys:
-            a_value = getattr(a, key)
-            b_value = getattr(b, key)
-            if isinstance(a_value, str) and isinstance(b_value, str):
-                a_value = a_value.lower()
-                b_value = b_value.lower()
-            if a_value < b_value:
-                return -1
-            elif a_value > b_value:
-                return 1
-        return 0
-
-    def recursive_binary_search(self, arr, target_id, low, high):
-        if high >= low:
-            mid = (high + low) // 2
-            if arr[mid].product_id == target_id:
-                return arr[mid]
-            elif arr[mid].product_id > target_id:
-                return self.recursive_binary_search(arr, target_id, low, mid - 1)
-            else:
-                return self.recursive_binary_search(arr, target_id, mid + 1, high)
-        else:
-            return None
+        store = self.get_product_store()
+        if id_range is not None:
+            low, high = id_range
+            if algorithm == "Linear Search":
+                return np.array([row for row, product in enumerate(self.products)
+                                 if low <= product.product_id <= high], dtype=np.intp)
+            return store.rows_in_id_range(low, high)
+
+        if algorithm == "Hash Lookup":
+            return store.rows_for_ids(product_ids)
+        if algorithm == "Binary Search":
+            return store.search_sorted_ids(product_ids)
+        rows = []
+        for product_id in product_ids:
+            product = self.linear_search(self.products, product_id)
+            if product is not None:
+                rows.append(store.row_for_id(product.product_id))
+        return np.array(rows, dtype=np.intp)
 
     def linear_search(self, arr, target_id):
         for item in arr:
@@ -955,49 +1021,16 @@ class Inventory:
                 return item
         return None
 
-    def count_products_in_category(self, products, category):
-        count = 0
-        for product in products:
-            if product.category == category:
-                count += 1
-        return count
-
-    def calculate_total_value(self, products):
-        total = 0.0
-        for product in products:
-            total += product.price * product.quantity
-        return total
-
-    def get_category_counts(self):
-        category_counts = {}
-        for product in self.products:
-            cat = product.category
-            category_counts[cat] = category_counts.get(cat, 0) + 1
-        return category_counts
-
-    def get_category_quantities(self):
-        category_quantities = {}
-        for product in self.products:
-            cat = product.category
-            category_quantities[cat] = category_quantities.get(cat, 0) + product.quantity
-        return category_quantities
-
-    def filter_products(self, products, category=None, name_substring=None, min_price=None, max_price=None):
-        """Filter products by category, name substring, and optional price range."""
-        filtered = []
-        for p in products:
-            if category is not None and p.category != category:
-                continue
-            if name_substring is not None and name_substring != "":
-                if name_substring.lower() not in p.name.lower():
-                    continue
-            if min_price is not None and p.price < min_price:
-                continue
-            if max_price is not None and p.price > max_price:
-                continue
-            filtered.append(p)
-        return filtered
+    def get_category_aggregates(self):
+        """Memoized per-category counts, quantities and stock value for the loaded catalogue."""
+        return self.get_product_store().category_aggregates()
+
+    def filter_rows(self, rows, category=None, name_substring=None, min_price=None, max_price=None):
+        """Filter rows by category, name substring, and optional price range, keeping their order."""
+        return self.get_product_store().filter_rows(rows, category=category, name_substring=name_substring,
+                                                    min_price=min_price, max_price=max_price)
 
+from app_context import get_app_context
 from login_window import LoginWindow
 
 def main():
@@ -0,0 +1,227 @@
+# User/live_source.py
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, inspect, or_, select, true
+
+from data.models import Product, Batch, CatalogueChange, CatalogueChangePrune
+
+logger = logging.getLogger(__name__)
+
+# Seconds between change log polls
+POLL_INTERVAL_SECONDS = 5
+
+# Above this many changed products a delta is not worth it, reload in full
+MAX_DELTA_PRODUCTS = 5000
+
+# A change id below the newest one seen may still be in an open transaction
+# (PostgreSQL hands out ids at insert, not at commit). Missing ids are
+# re-read for this long before they are taken as rolled back.
+CHANGE_GAP_SECONDS = 300
+
+# Ids below the newest one at load time that are checked for such gaps
+LOAD_LOOKBACK_IDS = 1000
+
+# Without a change log: full reload at least this often, for edits the
+# fingerprint cannot see (e.g. a rename to a name of the same length)
+FALLBACK_RELOAD_SECONDS = 300
+
+LIVE = "live"
+BACKUP = "backup"
+
+@dataclass
+class CatalogueDelta:
+    # (product_id, name, price, quantity, category) for added or changed products
+    rows: List[Tuple[int, str, float, int, str]] = field(default_factory=list)
+    deleted_ids: List[int] = field(default_factory=list)
+    # True when rows is the whole catalogue rather than a delta
+    full: bool = False
+
+def catalogue_statement(product_ids=None):
+    """One row per product with its stock summed over batches."""
+    stock = (
+        select(Batch.product_id, func.sum(Batch.quantity).label("quantity"))
+        .group_by(Batch.product_id)
+    )
+    if product_ids is not None:
+        stock = stock.where(Batch.product_id.in_(product_ids))
+    stock = stock.subquery()
+    statement = (
+        select(
+            Product.product_id,
+            Product.name,
+            Product.unit_price,
+            func.coalesce(stock.c.quantity, 0),
+            Product.category,
+        )
+        .outerjoin(stock, stock.c.product_id == Product.product_id)
+        .order_by(Product.product_id)
+    )
+    if product_ids is not None:
+        statement = statement.where(Product.product_id.in_(product_ids))
+    return statement
+
+def _plain_rows(result):
+    return [
+        (int(pid), name or '', float(price or 0.0), int(quantity or 0), category or '')
+        for pid, name, price, quantity, category in result
+    ]
+
+def fingerprint_statement():
+    """
+    Counts, highest ids and sums over products and batches: one row that
+    changes with almost any edit to what a terminal shows.
+    """
+    products = select(
+        func.count().label("products"),
+        func.max(Product.product_id).label("max_product_id"),
+        func.sum(Product.unit_price).label("prices"),
+        func.sum(func.length(Product.name) + func.length(Product.category)).label("text_length"),
+    ).subquery()
+    batches = select(
+        func.count().label("batches"),
+        func.max(Batch.batch_id).label("max_batch_id"),
+        func.sum(Batch.quantity).label("quantity"),
+        func.sum(Batch.product_id * Batch.quantity).label("placement"),
+    ).subquery()
+    # One row each, joined side by side
+    return select(products, batches).select_from(products.join(batches, true()))
+
+class LiveCatalogueSource:
+    """
+    Read-only catalogue for user terminals, straight from the database.
+
+    load() fetches the whole catalogue in one aggregated query and notes the
+    newest change log id. poll() then asks the change log which products
+    changed since and re-reads only those. Ids skipped on the way are kept
+    and asked for again for CHANGE_GAP_SECONDS, since the transaction that
+    took one may commit after a later id was seen. A prune of the log past
+    the oldest id still needed forces a full reload.
+
+    Without a change log table (a database that has not run init_db since
+    it was added) poll() compares a fingerprint of the catalogue and reloads
+    in full only when it moved, or every FALLBACK_RELOAD_SECONDS.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.last_change_id = 0
+        # Change ids below last_change_id not seen yet, with when they were first missed
+        self.pending_ids = {}
+        self.fingerprint = None
+        self.loaded_at = 0.0
+        tables = inspect(engine)
+        self.has_change_log = tables.has_table(CatalogueChange.__tablename__)
+        self.has_prune_marks = tables.has_table(CatalogueChangePrune.__tablename__)
+        if not self.has_change_log:
+            logger.warning("No catalogue change log in the database, terminals will compare fingerprints.")
+
+    def load(self):
+        start = time.perf_counter()
+        with self.engine.connect() as conn:
+            rows = self._load(conn)
+        logger.info(f"Loaded {len(rows)} products from the database in {(time.perf_counter() - start) * 1000:.0f} ms")
+        return rows
+
+    def _load(self, conn):
+        # Read the change position first: anything committed after it is
+        # picked up again by the next poll, which is harmless
+        if self.has_change_log:
+            self._read_position(conn)
+        else:
+            self.fingerprint = tuple(conn.execute(fingerprint_statement()).one())
+        self.loaded_at = time.monotonic()
+        return _plain_rows(conn.execute(catalogue_statement()))
+
+    def _read_position(self, conn):
+        """Starts at the newest change id, with the recent ids missing below it pending."""
+        newest = conn.execute(select(func.coalesce(func.max(CatalogueChange.change_id), 0))).scalar_one()
+        low = max(newest - LOAD_LOOKBACK_IDS, self._pruned_through(conn))
+        present = set(conn.execute(
+            select(CatalogueChange.change_id).where(CatalogueChange.change_id > low)
+        ).scalars())
+        now = time.monotonic()
+        self.last_change_id = newest
+        self.pending_ids = {change_id: now for change_id in range(low + 1, newest) if change_id not in present}
+
+    def _pruned_through(self, conn):
+        if not self.has_prune_marks:
+            return 0
+        return conn.execute(
+            select(func.coalesce(func.max(CatalogueChangePrune.pruned_through), 0))
+        ).scalar_one()
+
+    def poll(self) -> Optional[CatalogueDelta]:
+        """Changes since the last load or poll, or None if there are none."""
+        with self.engine.connect() as conn:
+            if not self.has_change_log:
+                return self._poll_fingerprint(conn)
+
+            now = time.monotonic()
+            self.pending_ids = {
+                change_id: missed for change_id, missed in self.pending_ids.items()
+                if now - missed < CHANGE_GAP_SECONDS
+            }
+            needed = min(self.pending_ids, default=self.last_change_id + 1)
+            if self._pruned_through(conn) >= needed:
+                # The log was pruned past our position
+                return CatalogueDelta(rows=self._load(conn), full=True)
+
+            wanted = CatalogueChange.change_id > self.last_change_id
+            if self.pending_ids:
+                wanted = or_(wanted, CatalogueChange.change_id.in_(list(self.pending_ids)))
+            changes = conn.execute(select(CatalogueChange.change_id, CatalogueChange.product_id).where(wanted)).all()
+            if not changes:
+                return None
+
+            seen = {change_id for change_id, _ in changes}
+            newest = max(self.last_change_id, max(seen))
+            for change_id in seen:
+                self.pending_ids.pop(change_id, None)
+            for change_id in range(self.last_change_id + 1, newest):
+                if change_id not in seen:
+                    self.pending_ids[change_id] = now
+            self.last_change_id = newest
+
+            changed_ids = sorted({product_id for _, product_id in changes})
+            if len(changed_ids) > MAX_DELTA_PRODUCTS:
+                return CatalogueDelta(rows=self._load(conn), full=True)
+            rows = _plain_rows(conn.execute(catalogue_statement(changed_ids)))
+        found = {row[0] for row in rows}
+        return CatalogueDelta(rows=rows, deleted_ids=[pid for pid in changed_ids if pid not in found])
+
+    def _poll_fingerprint(self, conn):
+        fingerprint = tuple(conn.execute(fingerprint_statement()).one())
+        if fingerprint == self.fingerprint and time.monotonic() - self.loaded_at < FALLBACK_RELOAD_SECONDS:
+            return None
+        return CatalogueDelta(rows=self._load(conn), full=True)
+
+    def close(self):
+        self.engine.dispose()
+
+def open_live_source(config_path='config.json'):
+    """
+    Opens the live source unless config.json sets "user_data_source" to
+    "backup". Returns None when disabled or the database is unreachable, in
+    which case the terminal reads the backup files as before.
+    """
+    setting = LIVE
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, 'r') as f:
+                setting = json.load(f).get('user_data_source', LIVE)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read {config_path}: {e}")
+    if setting != LIVE:
+        return None
+
+    try:
+        from data.db_config import DATABASE_URL, create_read_only_engine
+        return LiveCatalogueSource(create_read_only_engine(DATABASE_URL))
+    except Exception as e:
+        logger.warning(f"Database not reachable, using the backup files: {e}")
+        return None
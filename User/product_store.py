@@ -0,0 +1,253 @@
+# User/product_store.py
+
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+# Rows encoded per step while building the name index, bounds the size of
+# the temporary byte matrix.
+NAME_INDEX_CHUNK = 100_000
+
+@dataclass
+class CategoryAggregates:
+    """Per-category totals, indexed like ProductStore.categories."""
+    categories: List[str]
+    counts: np.ndarray
+    quantities: np.ndarray
+    values: np.ndarray
+    # Category -> index into the arrays; the store's category_lookup
+    lookup: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_value(self) -> float:
+        return float(self.values.sum())
+
+    def count(self, category) -> int:
+        code = self.lookup.get(category)
+        return 0 if code is None else int(self.counts[code])
+
+    def count_map(self) -> Dict[str, int]:
+        return dict(zip(self.categories, self.counts.tolist()))
+
+    def quantity_map(self) -> Dict[str, int]:
+        return dict(zip(self.categories, self.quantities.tolist()))
+
+class ProductStore:
+    """
+    Column-oriented copy of the user catalogue.
+
+    Ids, prices, quantities and category codes are held in NumPy arrays so
+    filters are evaluated as boolean masks instead of a Python loop over
+    product objects. Results are row index arrays into `products`, which
+    also lets a filter keep the order of a sort permutation.
+
+    Name substring matching goes through a byte trigram index over the
+    lowercased UTF-8 names, built on first use.
+
+    Product ids are indexed twice: a dict from id to row for O(1) exact
+    lookups (built on first use), and the ids in sorted order (with their
+    rows) for O(log n) range and batch lookups.
+
+    Given a CatalogueSnapshot, the columns are the snapshot's memory mapped
+    arrays and nothing is read from the product objects.
+    """
+    def __init__(self, products, snapshot=None):
+        self.products = products
+        if snapshot is not None:
+            self.ids = snapshot.ids
+            self.prices = snapshot.prices
+            self.quantities = snapshot.quantities
+            self.categories = np.array(snapshot.categories, dtype=str)
+            self.category_codes = snapshot.category_codes
+            self.id_order = snapshot.id_order
+            self._name_source = snapshot.names
+        else:
+            self.ids = np.fromiter((p.product_id for p in products), dtype=np.int64, count=len(products))
+            self.prices = np.fromiter((p.price for p in products), dtype=np.float64, count=len(products))
+            self.quantities = np.fromiter((p.quantity for p in products), dtype=np.int64, count=len(products))
+            self.categories, category_codes = np.unique(
+                np.array([p.category for p in products], dtype=str), return_inverse=True
+            )
+            self.category_codes = category_codes.astype(np.int32)
+            self.id_order = np.argsort(self.ids, kind="stable")
+            self._name_source = lambda: [p.name for p in products]
+        self.category_lookup = {category: code for code, category in enumerate(self.categories.tolist())}
+        self.sorted_ids = self.ids[self.id_order]
+        self._row_by_id = None
+        self._aggregates = None
+        self._names = None
+        self._names_lower = None
+        self._gram_keys = None
+        self._gram_offsets = None
+        self._gram_rows = None
+
+    def __len__(self):
+        return len(self.products)
+
+    def products_at(self, rows):
+        products = self.products
+        return [products[index] for index in np.asarray(rows).tolist()]
+
+    def all_rows(self):
+        return np.arange(len(self.products))
+
+    def category_aggregates(self) -> CategoryAggregates:
+        """
+        Product count, total quantity and stock value per category, computed
+        in one bincount pass over the code column the first time they are
+        asked for. The store is rebuilt on every load, which resets them.
+        """
+        if self._aggregates is None:
+            codes = self.category_codes
+            size = len(self.categories)
+            self._aggregates = CategoryAggregates(
+                categories=self.categories.tolist(),
+                counts=np.bincount(codes, minlength=size),
+                quantities=np.bincount(codes, weights=self.quantities, minlength=size).round().astype(np.int64),
+                values=np.bincount(codes, weights=self.prices * self.quantities, minlength=size),
+                lookup=self.category_lookup,
+            )
+        return self._aggregates
+
+    def update_values(self, rows, prices, quantities):
+        """Overwrites prices and quantities of existing rows in place."""
+        self.prices[rows] = prices
+        self.quantities[rows] = quantities
+        self._aggregates = None
+
+    @property
+    def row_by_id(self):
+        if self._row_by_id is None:
+            # Built back to front so a duplicated id maps to its first row
+            self._row_by_id = dict(zip(self.ids[::-1].tolist(), range(len(self.ids) - 1, -1, -1)))
+        return self._row_by_id
+
+    def names(self):
+        """Product names by row."""
+        if self._names is None:
+            self._names = self._name_source()
+        return self._names
+
+    def row_for_id(self, product_id):
+        """Row of the product with this id, or None. O(1)."""
+        return self.row_by_id.get(product_id)
+
+    def rows_for_ids(self, product_ids):
+        """Rows of the given ids that exist, in the order asked for. O(1) per id."""
+        row_by_id = self.row_by_id
+        return np.array([row_by_id[pid] for pid in product_ids if pid in row_by_id], dtype=np.intp)
+
+    def search_sorted_ids(self, product_ids):
+        """Same as rows_for_ids, but with a binary search of the sorted id array. O(log n) per id."""
+        wanted = np.asarray(product_ids, dtype=np.int64)
+        positions = np.searchsorted(self.sorted_ids, wanted)
+        inside = positions < len(self.sorted_ids)
+        positions, wanted = positions[inside], wanted[inside]
+        return self.id_order[positions[self.sorted_ids[positions] == wanted]]
+
+    def rows_in_id_range(self, low, high):
+        """Rows with low <= product id <= high, in id order. O(log n) plus the result size."""
+        start = np.searchsorted(self.sorted_ids, low, side="left")
+        stop = np.searchsorted(self.sorted_ids, high, side="right")
+        return self.id_order[start:stop]
+
+    def build_name_index(self):
+        """
+        Builds the trigram index: every 3-byte window of every name (including
+        the two NUL bytes that pad the end of each name) as a 24-bit code,
+        stored as row lists grouped by code plus a small directory of distinct
+        codes and their offsets. Names matching a query are the rows shared by
+        the posting lists of the query's trigrams.
+        """
+        self._names_lower = [name.lower() for name in self.names()]
+        encoded = [name.encode("utf-8") for name in self._names_lower]
+        width = max((len(name) for name in encoded), default=0) + 2
+        n = len(encoded)
+
+        keys = []
+        for start in range(0, n, NAME_INDEX_CHUNK):
+            chunk = np.array(encoded[start:start + NAME_INDEX_CHUNK], dtype=f"S{width}")
+            matrix = chunk.view(np.uint8).reshape(len(chunk), width).astype(np.int64)
+            codes = (matrix[:, :-2] << 16) | (matrix[:, 1:-1] << 8) | matrix[:, 2:]
+            valid = matrix[:, :-2] != 0
+            rows = np.broadcast_to(np.arange(start, start + len(chunk))[:, None], codes.shape)
+            keys.append(codes[valid] * n + rows[valid])
+
+        # Sorting code * n + row groups postings by code, rows ascending, and
+        # drops trigrams repeated within a name
+        combined = np.unique(np.concatenate(keys)) if keys else np.empty(0, dtype=np.int64)
+        codes = combined // max(n, 1)
+        self._gram_rows = (combined % max(n, 1)).astype(np.int32)
+        self._gram_keys, starts = np.unique(codes, return_index=True)
+        self._gram_offsets = np.append(starts, len(codes))
+
+    def _postings(self, low, high):
+        """Rows of all trigrams with a code in [low, high)."""
+        first, last = np.searchsorted(self._gram_keys, np.array([low, high], dtype=self._gram_keys.dtype))
+        return self._gram_rows[self._gram_offsets[first]:self._gram_offsets[last]]
+
+    def name_mask(self, substring, within=None):
+        """
+        Boolean mask of rows whose name contains substring, case-insensitively.
+        If within is given, only rows set in that mask are considered.
+        """
+        if self._gram_keys is None:
+            self.build_name_index()
+        query = substring.lower()
+        data = query.encode("utf-8")
+        mask = np.zeros(len(self.products), dtype=bool)
+
+        if len(data) < 3:
+            # A one or two byte query is a prefix of a contiguous code range
+            shift = 8 * (3 - len(data))
+            prefix = int.from_bytes(data, "big") << shift
+            mask[self._postings(prefix, prefix + (1 << shift))] = True
+            return mask if within is None else mask & within
+
+        grams = {int.from_bytes(data[i:i + 3], "big") for i in range(len(data) - 2)}
+        postings = sorted((self._postings(code, code + 1) for code in grams), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not len(candidates):
+                break
+            mask[posting] = True
+            candidates = candidates[mask[candidates]]
+            mask[posting] = False
+
+        if within is not None:
+            candidates = candidates[within[candidates]]
+        if len(data) > 3:
+            # Sharing all trigrams does not guarantee the substring, check the text
+            names = self._names_lower
+            candidates = [row for row in candidates.tolist() if query in names[row]]
+        mask[candidates] = True
+        return mask
+
+    def filter_mask(self, category=None, name_substring=None, min_price=None, max_price=None):
+        mask = np.ones(len(self.products), dtype=bool)
+        if category is not None:
+            code = self.category_lookup.get(category)
+            if code is None:
+                mask[:] = False
+                return mask
+            mask &= self.category_codes == code
+        if min_price is not None:
+            mask &= self.prices >= min_price
+        if max_price is not None:
+            mask &= self.prices <= max_price
+        if name_substring:
+            # Last, so the text check only runs on rows that passed the rest
+            mask = self.name_mask(name_substring, within=mask)
+        return mask
+
+    def filter_rows(self, rows=None, category=None, name_substring=None, min_price=None, max_price=None):
+        """
+        Rows matching all given predicates. If rows is given (for example a
+        sort permutation) the result is the matching subset in that order.
+        """
+        mask = self.filter_mask(category, name_substring, min_price, max_price)
+        if rows is None:
+            return np.flatnonzero(mask)
+        rows = np.asarray(rows, dtype=np.intp)
+        return rows[mask[rows]]
@@ -0,0 +1,168 @@
+# User/snapshot_loader.py
+
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Characters read from the snapshot per step
+READ_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+@dataclass
+class SnapshotRows:
+    # (product_id, name, price, quantity, category) per product, in file order
+    products: List[Tuple[int, str, float, int, str]] = field(default_factory=list)
+    batch_count: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+
+class _Reader:
+    """Character buffer over a text file that refills on demand."""
+    def __init__(self, fileobj, chunk_size):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.fileobj.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, without consuming it ("" at end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos} of the snapshot buffer")
+        self.pos += 1
+
+    def value(self):
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number ending exactly at the buffer end may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def items(self):
+        """
+        Decodes the items of a JSON array whose "[" has been consumed, up to
+        and including the closing "]". This is the hot loop, so it works on
+        the buffer directly instead of going through peek and value.
+        """
+        decode = _decoder.raw_decode
+        skip = _WHITESPACE.match
+        while True:
+            buffer = self.buffer
+            pos = skip(buffer, self.pos).end()
+            if pos < len(buffer) and buffer[pos] == ",":
+                pos = skip(buffer, pos + 1).end()
+            self.pos = pos
+            if pos >= len(buffer):
+                if not self.fill():
+                    raise ValueError("Snapshot ended inside a list")
+                continue
+            if buffer[pos] == "]":
+                self.pos = pos + 1
+                return
+            try:
+                value, end = decode(buffer, pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            if end == len(buffer) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            yield value
+
+def iter_sections(fileobj, sections, chunk_size=READ_CHUNK_SIZE) -> Iterator[Tuple[str, dict]]:
+    """
+    Streams the items of the named top-level list sections of a backup file
+    as (section, item) pairs, decoding one item at a time. Other sections are
+    skipped item by item, and reading stops once every wanted section has
+    been seen, so tables after them (e.g. sale_records) are never read.
+    """
+    reader = _Reader(fileobj, chunk_size)
+    remaining = set(sections)
+    reader.expect("{")
+    while remaining and reader.peek() not in ("}", ""):
+        key = reader.value()
+        reader.expect(":")
+        if reader.peek() != "[":
+            reader.value()
+        else:
+            reader.expect("[")
+            for item in reader.items():
+                if key in remaining:
+                    yield key, item
+        remaining.discard(key)
+        if reader.peek() == ",":
+            reader.pos += 1
+
+def load_snapshot_rows(path, chunk_size=READ_CHUNK_SIZE) -> SnapshotRows:
+    """
+    Reads the products and batches of a backup file and joins them into one
+    row per product, with the quantity summed over the product's batches.
+    """
+    start = time.perf_counter()
+    result = SnapshotRows()
+    raw_products = []
+    quantity_map: Dict[int, int] = {}
+
+    with open(path, "r", encoding="utf-8") as f:
+        for section, item in iter_sections(f, ("products", "batches"), chunk_size):
+            if section == "products":
+                raw_products.append((item.get("product_id"), item.get("name", ""), item.get("unit_price"), item.get("category", "")))
+            else:
+                pid = item.get("product_id")
+                quantity_map[pid] = quantity_map.get(pid, 0) + item.get("quantity", 0)
+                result.batch_count += 1
+
+    append = result.products.append
+    for product_id, name, unit_price, category in raw_products:
+        quantity = quantity_map.get(product_id, 0)
+        try:
+            append((
+                int(product_id) if product_id is not None else 0,
+                name,
+                float(unit_price) if unit_price is not None else 0.0,
+                int(quantity),
+                category,
+            ))
+        except (ValueError, TypeError):
+            result.skipped += 1
+
+    result.seconds = time.perf_counter() - start
+    logger.info(
+        f"Loaded {len(result.products)} products and {result.batch_count} batches from {path} "
+        f"in {result.seconds * 1000:.0f} ms ({result.skipped} skipped)"
+    )
+    return result
@@ -0,0 +1,198 @@
+# User/sort_engine.py
+
+import numpy as np
+
+# Product attributes that can be sorted on, as used by SortProductsPage
+SORT_FIELDS = ("product_id", "name", "price", "quantity", "category")
+
+# Attributes compared case-insensitively
+TEXT_FIELDS = ("name", "category")
+
+def sort_key(product, keys):
+    """Composite sort key for one product, with text fields lowercased."""
+    return tuple(
+        getattr(product, key).lower() if key in TEXT_FIELDS else getattr(product, key)
+        for key in keys
+    )
+
+def decorate(products, keys):
+    """
+    Pairs each product's composite key with its position. The position breaks
+    ties, so every entry is unique and sorting the pairs is stable.
+    """
+    return [(sort_key(product, keys), index) for index, product in enumerate(products)]
+
+def quick_sort(entries):
+    """
+    In-place quick sort of decorated entries. Uses a median-of-three pivot and
+    an explicit stack (smaller partition first), so already sorted input such
+    as products ordered by ID stays O(n log n) and never hits the recursion
+    limit.
+    """
+    stack = [(0, len(entries) - 1)]
+    while stack:
+        low, high = stack.pop()
+        while high - low > 16:
+            mid = (low + high) // 2
+            if entries[mid] < entries[low]:
+                entries[low], entries[mid] = entries[mid], entries[low]
+            if entries[high] < entries[low]:
+                entries[low], entries[high] = entries[high], entries[low]
+            if entries[high] < entries[mid]:
+                entries[mid], entries[high] = entries[high], entries[mid]
+            pivot = entries[mid]
+            i, j = low, high
+            while i <= j:
+                while entries[i] < pivot:
+                    i += 1
+                while pivot < entries[j]:
+                    j -= 1
+                if i <= j:
+                    entries[i], entries[j] = entries[j], entries[i]
+                    i += 1
+                    j -= 1
+            # Continue with the smaller side, defer the larger one
+            if j - low < high - i:
+                stack.append((i, high))
+                high = j
+            else:
+                stack.append((low, j))
+                low = i
+        # Insertion sort for the short run that is left
+        for k in range(low + 1, high + 1):
+            entry = entries[k]
+            m = k - 1
+            while m >= low and entry < entries[m]:
+                entries[m + 1] = entries[m]
+                m -= 1
+            entries[m + 1] = entry
+    return entries
+
+def merge_sort(entries):
+    """Iterative bottom-up merge sort of decorated entries."""
+    n = len(entries)
+    source, target = entries, entries[:]
+    width = 1
+    while width < n:
+        for left in range(0, n, 2 * width):
+            mid = min(left + width, n)
+            right = min(left + 2 * width, n)
+            i, j, k = left, mid, left
+            while i < mid and j < right:
+                if source[j] < source[i]:
+                    target[k] = source[j]
+                    j += 1
+                else:
+                    target[k] = source[i]
+                    i += 1
+                k += 1
+            target[k:k + mid - i] = source[i:mid]
+            k += mid - i
+            target[k:k + right - j] = source[j:right]
+        source, target = target, source
+        width *= 2
+    if source is not entries:
+        entries[:] = source
+    return entries
+
+def shell_sort(entries):
+    """In-place shell sort of decorated entries, using Knuth's 3h+1 gap sequence."""
+    n = len(entries)
+    gap = 1
+    while gap < n // 3:
+        gap = 3 * gap + 1
+    while gap > 0:
+        for i in range(gap, n):
+            entry = entries[i]
+            j = i
+            while j >= gap and entry < entries[j - gap]:
+                entries[j] = entries[j - gap]
+                j -= gap
+            entries[j] = entry
+        gap //= 3
+    return entries
+
+ALGORITHMS = {
+    "Quick Sort": quick_sort,
+    "Merge Sort": merge_sort,
+    "Shell Sort": shell_sort,
+}
+
+def sort_rows_with(algorithm, products, keys):
+    """Positions of products in sorted order, using one of the hand-written algorithms."""
+    return [index for _, index in ALGORITHMS[algorithm](decorate(products, keys))]
+
+def sort_with(algorithm, products, keys):
+    """Sorts products on keys with one of the hand-written algorithms."""
+    return [products[index] for index in sort_rows_with(algorithm, products, keys)]
+
+class SortEngine:
+    """
+    Sorts a fixed list of products on any combination of SORT_FIELDS.
+
+    Each field is turned into an integer rank (or numeric) array once, and a
+    key combination is sorted with a single stable np.lexsort over those
+    arrays. The resulting permutation is cached per key tuple, so re-sorting
+    on the same keys only costs building the output list.
+
+    If a ProductStore is given, the columns come from its arrays instead of
+    the product objects.
+    """
+    def __init__(self, products, store=None):
+        self.products = products
+        self.store = store
+        self._columns = {}
+        self._permutations = {}
+
+    def invalidate(self, products=None):
+        """Drops all cached columns and permutations, e.g. after a reload."""
+        if products is not None:
+            self.products = products
+            self.store = None
+        self._columns.clear()
+        self._permutations.clear()
+
+    def column(self, key):
+        if key not in SORT_FIELDS:
+            raise ValueError(f"Unknown sort key: {key}")
+        if key not in self._columns and self.store is not None:
+            self._columns[key] = self._store_column(key)
+        if key not in self._columns:
+            values = [getattr(product, key) for product in self.products]
+            if key in TEXT_FIELDS:
+                # Dense rank of the lowercased text, so lexsort compares ints
+                lowered = np.array([value.lower() for value in values], dtype=str)
+                _, ranks = np.unique(lowered, return_inverse=True)
+                self._columns[key] = ranks
+            else:
+                self._columns[key] = np.asarray(values)
+        return self._columns[key]
+
+    def _store_column(self, key):
+        store = self.store
+        if key == "product_id":
+            return store.ids
+        if key == "price":
+            return store.prices
+        if key == "quantity":
+            return store.quantities
+        if key == "category":
+            # Rank the few distinct categories, then look the rank up per row
+            _, ranks = np.unique(np.char.lower(store.categories), return_inverse=True)
+            return ranks[store.category_codes]
+        lowered = np.array([name.lower() for name in store.names()], dtype=str)
+        return np.unique(lowered, return_inverse=True)[1]
+
+    def permutation(self, keys):
+        keys = tuple(keys)
+        if keys not in self._permutations:
+            if not self.products:
+                self._permutations[keys] = np.empty(0, dtype=np.intp)
+            else:
+                # lexsort treats the last array as the primary key
+                self._permutations[keys] = np.lexsort([self.column(key) for key in reversed(keys)])
+        return self._permutations[keys]
+
+    def sort(self, keys):
+        products = self.products
+        return [products[index] for index in self.permutation(keys).tolist()]
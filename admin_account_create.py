@@ -3,9 +3,8 @@ from PyQt6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox
 )
 from PyQt6.QtCore import Qt
-import hashlib
-import json
-import os
+
+from login_window import AccountWorker
 
 class AdminAccountCreationWindow(QWidget):
     def __init__(self):
@@ -42,11 +41,11 @@ class AdminAccountCreationWindow(QWidget):
         self.confirm_password_edit.setFixedHeight(40)
         main_layout.addWidget(self.confirm_password_edit)
 
-        create_button = QPushButton("Create Admin")
-        create_button.setObjectName("primaryButton")
-        create_button.clicked.connect(self.create_admin)
-        create_button.setFixedHeight(40)
-        main_layout.addWidget(create_button)
+        self.create_button = QPushButton("Create Admin")
+        self.create_button.setObjectName("primaryButton")
+        self.create_button.clicked.connect(self.create_admin)
+        self.create_button.setFixedHeight(40)
+        main_layout.addWidget(self.create_button)
 
         self.setLayout(main_layout)
 
@@ -96,6 +95,8 @@ class AdminAccountCreationWindow(QWidget):
         """)
 
     def create_admin(self):
+        if not self.create_button.isEnabled():
+            return  # The account is already being created
         username = self.username_edit.text().strip()
         password = self.password_edit.text().strip()
         confirm_password = self.confirm_password_edit.text().strip()
@@ -108,28 +109,26 @@ class AdminAccountCreationWindow(QWidget):
             QMessageBox.warning(self, "Input Error", "Passwords do not match.")
             return
 
-        users = self.load_users()
-        if any(user['username'] == username for user in users):
-            QMessageBox.warning(self, "Error", "Username already exists.")
-            return
-
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        new_user = {'username': username, 'password': hashed_password, 'role': 'admin'}
-        users.append(new_user)
-        self.save_users(users)
+        # Hashed on the password pool; the slots run back on the UI thread
+        self.create_button.setEnabled(False)
+        self.worker = AccountWorker(username, password, 'admin')
+        self.worker.finished.connect(self.on_create_success)
+        self.worker.taken.connect(self.on_username_taken)
+        self.worker.error.connect(self.on_create_error)
+        self.worker.start()
 
+    def on_create_success(self):
+        self.create_button.setEnabled(True)
         QMessageBox.information(self, "Success", "Admin account created successfully.")
         self.close()
 
-    def load_users(self):
-        if not os.path.exists('users.json'):
-            return []
-        with open('users.json', 'r') as f:
-            return json.load(f)
+    def on_username_taken(self):
+        self.create_button.setEnabled(True)
+        QMessageBox.warning(self, "Error", "Username already exists.")
 
-    def save_users(self, users):
-        with open('users.json', 'w') as f:
-            json.dump(users, f, indent=4)
+    def on_create_error(self, error_message):
+        self.create_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Could not create the admin account: {error_message}")
 
 # Add the following lines to allow running this file directly
 if __name__ == "__main__":
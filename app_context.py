@@ -0,0 +1,73 @@
+# app_context.py
+
+import logging
+import time
+
+from PyQt6.QtWidgets import QApplication
+
+logger = logging.getLogger(__name__)
+
+class AppContext:
+    """
+    Objects that live for the whole process rather than for one login.
+
+    The inventory service (engine, sessions, repositories) and the main
+    windows with their built pages are created by the first login that needs
+    them and kept when the user logs out; the windows are only hidden. The
+    next login shows the same window again, so a shift change only swaps the
+    signed-in user.
+    """
+    def __init__(self):
+        self.user = None
+        self.inventory_service = None
+        self.login_window = None
+        self.admin_window = None
+        self.user_window = None
+        # Login form submitted -> main window shown, for the last sign in
+        self.last_sign_in_ms = None
+        self._sign_in_started = None
+
+    def begin_sign_in(self):
+        """Called when the login form is submitted."""
+        self._sign_in_started = time.perf_counter()
+
+    def sign_in(self, user):
+        self.user = user
+
+    def main_window_shown(self, warm):
+        """Called once the main window of the signed-in user is visible."""
+        if self._sign_in_started is None:
+            return
+        self.last_sign_in_ms = (time.perf_counter() - self._sign_in_started) * 1000
+        self._sign_in_started = None
+        kind = "reused" if warm else "new"
+        logger.info(f"Signed in {self.user['username']} in {self.last_sign_in_ms:.1f} ms ({kind} main window)")
+
+    def sign_out(self):
+        """Forgets the signed-in user and shows the login window again."""
+        if self.user is not None:
+            logger.info(f"Signed out {self.user['username']}")
+        self.user = None
+        if self.login_window is None:
+            from login_window import LoginWindow
+            self.login_window = LoginWindow()
+        self.login_window.reset()
+        self.login_window.show()
+
+    def shutdown(self):
+        """Closes the hidden windows so their background threads stop."""
+        for window in (self.user_window, self.admin_window):
+            if window is not None:
+                window.close()
+        self.user_window = self.admin_window = None
+
+_context = None
+
+def get_app_context():
+    global _context
+    if _context is None:
+        _context = AppContext()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_context.shutdown)
+    return _context
@@ -0,0 +1,30 @@
+import sys
+from datetime import date
+
+from data.db_config import SessionLocal
+from data.sale_archive import ARCHIVE_DIR, archive_sales
+from data.sale_partitions import month_start
+
+# Months of individual sales kept in the database; older months are
+# archived, their daily totals stay available to reports
+KEEP_MONTHS = 24
+
+def archive_cutoff(today: date, keep_months: int = KEEP_MONTHS) -> date:
+    """First day of the oldest month that is kept."""
+    month = month_start(today)
+    for _ in range(keep_months - 1):
+        month = month_start(date.fromordinal(month.toordinal() - 1))
+    return month
+
+if __name__ == "__main__":
+    # Usage: python archive_sales.py [months to keep] [archive directory]
+    keep_months = int(sys.argv[1]) if len(sys.argv) > 1 else KEEP_MONTHS
+    directory = sys.argv[2] if len(sys.argv) > 2 else ARCHIVE_DIR
+    session = SessionLocal()
+    try:
+        archived = archive_sales(session, archive_cutoff(date.today(), keep_months), directory)
+    finally:
+        session.close()
+    for period in archived:
+        print(f"{period.period_start:%Y-%m}: {period.row_count} sales -> {period.archive_file}")
+    print(f"Archived {len(archived)} month(s) to {directory}")
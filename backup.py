@@ -1,16 +1,30 @@
 from data.db_config import SessionLocal
-from data.models import Product, Batch, SaleRecord, Supplier, Order, OrderItem
+from data.models import Product, Batch, SaleRecord, Supplier, Order, OrderItem, ProductPrice
+from data.sale_partitions import sale_source
+from sqlalchemy import select
 import json
 
+def fetch_sales(session):
+    """
+    Every sale still in the database, period tables of closed months
+    included. Sales of archived months are out of scope: they are only in
+    the archive files, which are kept alongside the backups.
+    """
+    sales = sale_source(session)
+    rows = session.execute(select(*sales.c).order_by(sales.c.sale_id)).mappings()
+    return [SaleRecord(**row) for row in rows]
+
 def fetch_data():
     session = SessionLocal()
     data = {
         "products": session.query(Product).all(),
         "batches": session.query(Batch).all(),
-        "sale_records": session.query(SaleRecord).all(),
+        "sale_records": fetch_sales(session),
         "suppliers": session.query(Supplier).all(),
         "orders": session.query(Order).all(),
         "order_items": session.query(OrderItem).all(),
+        # Last, so the terminals' streaming loader stops before it
+        "product_prices": session.query(ProductPrice).order_by(ProductPrice.price_id).all(),
     }
     session.close()
     return data
@@ -34,8 +48,15 @@ def save_to_json(data, filename='backupbyUser.json'):
     with open(filename, 'w') as f:
         json.dump(data, f, default=str, indent=4)
 
+def save_catalogue_snapshot(data, filename='catalogue.snap'):
+    """Writes the binary catalogue snapshot read by the user terminals."""
+    # Deferred: numpy is not needed until a backup is actually taken
+    from utils.catalogue_snapshot import catalogue_rows_from_backup, write_snapshot
+    write_snapshot(catalogue_rows_from_backup(data), filename)
+
 if __name__ == "__main__":
     data = fetch_data()
     data_dict = convert_data_to_dict(data)
     save_to_json(data_dict)
-    print("Data has been backed up to backupbyUser.json")
\ No newline at end of file
+    save_catalogue_snapshot(data_dict)
+    print("Data has been backed up to backupbyUser.json and catalogue.snap")
\ No newline at end of file
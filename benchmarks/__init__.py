@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+
+# Standalone performance benchmarks. Run each module with python -m benchmarks.<name>.
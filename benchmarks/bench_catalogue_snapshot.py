@@ -0,0 +1,61 @@
+# benchmarks/bench_catalogue_snapshot.py
+"""
+User terminal catalogue startup: streaming the JSON backup and building the
+ProductStore, against opening the memory mapped binary snapshot.
+
+Run from the repository root:
+    python -m benchmarks.bench_catalogue_snapshot [sizes...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from User.product_store import ProductStore
+from User.snapshot_loader import load_snapshot_rows
+from benchmarks.bench_snapshot_load import write_backup
+from utils.catalogue_snapshot import CatalogueSnapshot, SnapshotProducts, catalogue_rows_from_backup, write_snapshot
+
+DEFAULT_SIZES = [2_000, 100_000, 1_000_000]
+
+def open_json(path):
+    return ProductStore([_Row(*row) for row in load_snapshot_rows(path).products])
+
+class _Row:
+    __slots__ = ("product_id", "name", "price", "quantity", "category")
+
+    def __init__(self, product_id, name, price, quantity, category):
+        self.product_id, self.name, self.price, self.quantity, self.category = product_id, name, price, quantity, category
+
+def open_snapshot(path):
+    snapshot = CatalogueSnapshot(path)
+    return ProductStore(SnapshotProducts(snapshot, _Row), snapshot=snapshot)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_path = os.path.join(tmpdir, "backupbyUser.json")
+            snap_path = os.path.join(tmpdir, "catalogue.snap")
+            write_backup(json_path, n)
+            with open(json_path) as f:
+                write_snapshot(catalogue_rows_from_backup(json.load(f)), snap_path)
+
+            _, json_ms = timed(open_json, json_path)
+            store, snap_ms = timed(open_snapshot, snap_path)
+            _, filter_ms = timed(store.filter_rows, None, None, None, 10.0, 20.0)
+            print(
+                f"{n:>9,} products: JSON {json_ms:8.1f} ms ({os.path.getsize(json_path) / 1e6:6.1f} MB), "
+                f"snapshot {snap_ms:6.1f} ms ({os.path.getsize(snap_path) / 1e6:5.1f} MB), "
+                f"first price filter on snapshot {filter_ms:5.1f} ms"
+            )
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,70 @@
+# benchmarks/bench_export.py
+"""
+Export throughput benchmark: streams a synthetic sales table to each export
+format and reports rows/sec and file size.
+
+Run from the repository root:
+    python -m benchmarks.bench_export [rows]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from data.models import Base, Product, SaleRecord
+from data.report_queries import sales_query
+from services.export_service import export_report, CSV, COLUMNAR
+
+PRODUCTS = 2000
+
+
+def build_database(path, rows):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    rng = random.Random(42)
+    with Session(engine) as session:
+        session.execute(insert(Product), [
+            {"product_id": i, "sku": f"SKU{i:05d}", "name": f"Product {i}", "category": "DT",
+             "unit_price": round(rng.uniform(1, 100), 2), "reorder_level": 10}
+            for i in range(1, PRODUCTS + 1)
+        ])
+        start = date(2023, 1, 1)
+        for offset in range(0, rows, 50000):
+            session.execute(insert(SaleRecord), [
+                {"sale_id": i + 1, "product_id": rng.randint(1, PRODUCTS), "quantity_sold": rng.randint(1, 10),
+                 "sale_date": start + timedelta(days=i * 730 // rows), "unit_price_at_sale": round(rng.uniform(1, 100), 2)}
+                for i in range(offset, min(offset + 50000, rows))
+            ])
+        session.commit()
+    return engine
+
+
+def main(rows=200000):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = build_database(os.path.join(tmpdir, "bench.db"), rows)
+        print(f"Export of {rows:,} sales rows")
+        for fmt, compress, suffix in [(CSV, False, "csv"), (CSV, True, "csv.gz"),
+                                      (COLUMNAR, False, "gcol"), (COLUMNAR, True, "gcol.gz")]:
+            path = os.path.join(tmpdir, f"sales.{suffix}")
+            with Session(engine) as session:
+                result = export_report(session, sales_query(session), path, fmt=fmt, compress=compress)
+            size_mb = os.path.getsize(path) / 1e6
+            print(f"  {suffix:<8} {result.rows_per_second:>10,.0f} rows/s  {size_mb:7.1f} MB")
+
+        # Peak memory is measured in a separate run, tracemalloc slows the export down
+        with Session(engine) as session:
+            tracemalloc.start()
+            export_report(session, sales_query(session), os.path.join(tmpdir, "peak.gcol.gz"), fmt=COLUMNAR, compress=True)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        print(f"  Peak traced memory (columnar, gzip): {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
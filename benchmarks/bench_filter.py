@@ -0,0 +1,59 @@
+# benchmarks/bench_filter.py
+"""
+Filter latency of the columnar ProductStore against the old per-object loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_filter [products]
+"""
+
+import sys
+import time
+
+from User.product_store import ProductStore
+from benchmarks.bench_sort import make_products
+
+FILTERS = [
+    {"category": "Drops"},
+    {"min_price": 10.0, "max_price": 20.0},
+    {"name_substring": "1234"},
+    {"name_substring": "12"},
+    {"category": "Drops", "name_substring": "00123", "max_price": 100.0},
+]
+
+def loop_filter(products, category=None, name_substring=None, min_price=None, max_price=None):
+    filtered = []
+    for p in products:
+        if category is not None and p.category != category:
+            continue
+        if name_substring and name_substring.lower() not in p.name.lower():
+            continue
+        if min_price is not None and p.price < min_price:
+            continue
+        if max_price is not None and p.price > max_price:
+            continue
+        filtered.append(p)
+    return filtered
+
+def main(argv):
+    n = int(argv[0]) if argv else 1_000_000
+    products = make_products(n)
+
+    start = time.perf_counter()
+    store = ProductStore(products)
+    built = time.perf_counter()
+    store.build_name_index()
+    indexed = time.perf_counter()
+    print(f"{n:,} products: store {(built - start) * 1000:.0f} ms, name index {(indexed - built) * 1000:.0f} ms")
+
+    for predicates in FILTERS:
+        start = time.perf_counter()
+        rows = store.filter_rows(**predicates)
+        store_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        expected = loop_filter(products, **predicates)
+        loop_ms = (time.perf_counter() - start) * 1000
+        assert len(rows) == len(expected)
+        print(f"  {str(predicates):<75} {len(rows):>8,} rows  {store_ms:7.1f} ms  (loop {loop_ms:7.1f} ms)")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,56 @@
+# benchmarks/bench_forecast.py
+"""
+Demand forecast benchmark: two years of daily sales for the whole catalogue,
+from the grouped (product_id, day, quantity) rows to suggested reorder levels.
+
+Run from the repository root:
+    python -m benchmarks.bench_forecast [product counts...]
+
+Each product sells on about a third of the days, so 10,000 products give
+roughly 2.4 million grouped rows. The database query is not included; the
+rows are built in memory in the shape the repository returns them.
+"""
+
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from services.forecasting import DEFAULT_HISTORY_DAYS, build_demand_matrix, forecast_demand, history_range
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000]
+SALE_DAY_SHARE = 0.33
+
+def make_rows(n, start_date, days, seed=42):
+    rng = np.random.default_rng(seed)
+    sold = rng.random((n, days)) < SALE_DAY_SHARE
+    product_index, day_index = np.nonzero(sold)
+    quantities = rng.poisson(3, size=len(product_index)) + 1
+    dates = [start_date + timedelta(days=d) for d in range(days)]
+    return [
+        (pid, dates[day], qty)
+        for pid, day, qty in zip((product_index + 1).tolist(), day_index.tolist(), quantities.tolist())
+    ]
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    start_date, end_date = history_range(date(2026, 1, 1), DEFAULT_HISTORY_DAYS)
+
+    for n in sizes:
+        rows = make_rows(n, start_date, DEFAULT_HISTORY_DAYS)
+        print(f"{n:,} products, {DEFAULT_HISTORY_DAYS} days, {len(rows):,} grouped rows")
+        matrix, build_ms = timed(lambda: build_demand_matrix(rows, range(1, n + 1), start_date, end_date))
+        forecast, forecast_ms = timed(lambda: forecast_demand(matrix))
+        print(f"  Build matrix   {build_ms:10.1f} ms   ({matrix.quantities.nbytes / 2**20:,.0f} MB)")
+        print(f"  Forecast       {forecast_ms:10.1f} ms")
+        print(f"  Total          {build_ms + forecast_ms:10.1f} ms   "
+              f"(mean suggested level {forecast.reorder_levels.mean():.1f})")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,69 @@
+# benchmarks/bench_password_hash.py
+"""
+Password hashing cost benchmark, to pick scrypt parameters for the tills.
+
+Times one hash per cost setting (median of a few runs) and how many logins
+per second the password pool sustains with PASSWORD_WORKERS threads. Pick
+the largest N whose single hash stays under the target (default 100 ms),
+then set SCRYPT_N / SCRYPT_R in utils/passwords.py.
+
+Run from the repository root:
+    python -m benchmarks.bench_password_hash [target_ms]
+"""
+
+import hashlib
+import statistics
+import sys
+import time
+
+from utils.passwords import ScryptHasher, Pbkdf2Hasher, PASSWORD_WORKERS, password_pool
+
+SCRYPT_COSTS = [(2 ** 13, 8), (2 ** 14, 8), (2 ** 15, 8), (2 ** 16, 8), (2 ** 14, 16)]
+PBKDF2_COSTS = [200_000, 600_000]
+RUNS = 5
+
+def median_ms(func):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def pool_rate(hasher, encoded, logins=PASSWORD_WORKERS * 4):
+    start = time.perf_counter()
+    futures = [password_pool().submit(hasher.verify, "correct horse", encoded) for _ in range(logins)]
+    for future in futures:
+        future.result()
+    return logins / (time.perf_counter() - start)
+
+def main():
+    target_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 100.0
+    print(f"{'hasher':<28}{'memory':>10}{'hash ms':>10}{'logins/s':>10}")
+
+    legacy_ms = median_ms(lambda: hashlib.sha256(b"correct horse").hexdigest())
+    print(f"{'sha256 (legacy)':<28}{'-':>10}{legacy_ms:>10.3f}{'-':>10}")
+
+    choice = None
+    for n, r in SCRYPT_COSTS:
+        hasher = ScryptHasher(n=n, r=r)
+        encoded = hasher.hash("correct horse")
+        ms = median_ms(lambda: hasher.hash("correct horse"))
+        memory = f"{128 * n * r >> 20} MB"
+        print(f"{f'scrypt n=2^{n.bit_length() - 1} r={r}':<28}{memory:>10}{ms:>10.1f}{pool_rate(hasher, encoded):>10.1f}")
+        if ms <= target_ms and r == 8:
+            choice = n
+
+    for iterations in PBKDF2_COSTS:
+        hasher = Pbkdf2Hasher(iterations=iterations)
+        encoded = hasher.hash("correct horse")
+        ms = median_ms(lambda: hasher.hash("correct horse"))
+        print(f"{f'pbkdf2_sha256 i={iterations}':<28}{'-':>10}{ms:>10.1f}{pool_rate(hasher, encoded):>10.1f}")
+
+    if choice is None:
+        print(f"\nNo scrypt setting with r=8 hashes within {target_ms:.0f} ms on this machine.")
+    else:
+        print(f"\nLargest scrypt N with r=8 within {target_ms:.0f} ms: 2^{choice.bit_length() - 1}")
+
+if __name__ == "__main__":
+    main()
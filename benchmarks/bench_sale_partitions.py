@@ -0,0 +1,85 @@
+# benchmarks/bench_sale_partitions.py
+"""
+Recent sales with a long history: inserts and a current-month range read
+against one sale_records table, then again after closed months have been
+moved into period tables (the SQLite layout of data.sale_partitions).
+
+Run from the repository root:
+    python -m benchmarks.bench_sale_partitions [sale counts...]
+
+Sales are spread evenly over 24 months in a temporary SQLite file.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from data.models import Base, Product, SaleRecord
+from data.sale_partitions import maintain_sale_partitions, month_start
+from data.sales_rollup import install_sales_rollup
+from data.sqlalchemy_repositories import SQLAlchemySaleRecordRepository
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+HISTORY_DAYS = 730
+INSERTS = 500
+TODAY = date(2026, 3, 15)
+
+def fill(engine, n):
+    start = TODAY - timedelta(days=HISTORY_DAYS - 1)
+    with Session(engine) as session:
+        session.add_all([
+            Product(product_id=i, sku=f"SKU{i}", name=f"Product {i}", category="DT", unit_price=1.0, reorder_level=1)
+            for i in range(1, 101)
+        ])
+        session.flush()
+        for offset in range(0, n, 50_000):
+            session.execute(insert(SaleRecord), [
+                {"product_id": i % 100 + 1, "quantity_sold": 1, "unit_price_at_sale": 1.0,
+                 "sale_date": start + timedelta(days=i * HISTORY_DAYS // n)}
+                for i in range(offset, min(offset + 50_000, n))
+            ])
+        session.commit()
+
+def measure(repo):
+    start = time.perf_counter()
+    recent = repo.get_sales_between_dates(month_start(TODAY), TODAY)
+    read_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(INSERTS):
+        repo.record_sale({"product_id": 1, "quantity_sold": 1, "sale_date": TODAY, "unit_price_at_sale": 1.0})
+    insert_ms = (time.perf_counter() - start) * 1000
+    return len(recent), read_ms, insert_ms
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = create_engine(f"sqlite:///{os.path.join(tmpdir, 'sales.db')}")
+            Base.metadata.create_all(engine)
+            fill(engine, n)
+            install_sales_rollup(engine)
+            repo = SQLAlchemySaleRecordRepository()
+            repo.session.close()
+            repo.session = Session(engine)
+
+            print(f"{n:,} sales over {HISTORY_DAYS} days")
+            rows, read_ms, insert_ms = measure(repo)
+            print(f"  One table      current month read {read_ms:8.1f} ms ({rows:,} rows)   "
+                  f"{INSERTS} checkouts {insert_ms:8.1f} ms")
+
+            start = time.perf_counter()
+            maintain_sale_partitions(repo.session, TODAY)
+            print(f"  Split closed months          {(time.perf_counter() - start) * 1000:8.1f} ms")
+            rows, read_ms, insert_ms = measure(repo)
+            print(f"  Period tables  current month read {read_ms:8.1f} ms ({rows:,} rows)   "
+                  f"{INSERTS} checkouts {insert_ms:8.1f} ms")
+            repo.session.close()
+            engine.dispose()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,83 @@
+# benchmarks/bench_search.py
+"""
+Product id lookups: linear scan, the old sort-then-binary-search on every
+query, and the persistent indexes of ProductStore (id -> row dict and the
+sorted id array).
+
+Run from the repository root:
+    python -m benchmarks.bench_search [sizes...]
+"""
+
+import random
+import sys
+import time
+
+from User.product_store import ProductStore
+from benchmarks.bench_sort import make_products
+
+DEFAULT_SIZES = [2_000, 100_000, 1_000_000]
+MULTI_IDS = 100
+
+def linear_search(products, target_id):
+    for product in products:
+        if product.product_id == target_id:
+            return product
+    return None
+
+def binary_search(arr, target_id):
+    low, high = 0, len(arr) - 1
+    while low <= high:
+        mid = (low + high) // 2
+        if arr[mid].product_id == target_id:
+            return arr[mid]
+        if arr[mid].product_id > target_id:
+            high = mid - 1
+        else:
+            low = mid + 1
+    return None
+
+def timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    for n in sizes:
+        products = make_products(n)
+        random.Random(1).shuffle(products)
+        rng = random.Random(2)
+        target = rng.randint(1, n)
+        many = [rng.randint(1, n) for _ in range(MULTI_IDS)]
+        low = rng.randint(1, max(1, n - 100))
+
+        start = time.perf_counter()
+        store = ProductStore(products)
+        print(f"{n:,} products (store and index built in {(time.perf_counter() - start) * 1000:.0f} ms)")
+        print(f"  {'strategy':<28}{'exact':>12}{f'{MULTI_IDS} ids':>12}{'100-id range':>14}")
+        rows = [
+            ("Linear Search",
+             timed(lambda: linear_search(products, target), 3),
+             timed(lambda: [linear_search(products, pid) for pid in many]),
+             timed(lambda: [p for p in products if low <= p.product_id <= low + 99], 3)),
+            ("Sort + Binary Search",
+             timed(lambda: binary_search(sorted(products, key=lambda x: x.product_id), target), 3),
+             # Too slow to run for every id, extrapolated from a few
+             timed(lambda: [binary_search(sorted(products, key=lambda x: x.product_id), pid) for pid in many[:2]]) * MULTI_IDS / 2,
+             float("nan")),
+            ("Hash Lookup",
+             timed(lambda: store.row_for_id(target), 1000),
+             timed(lambda: store.rows_for_ids(many), 100),
+             float("nan")),
+            ("Sorted ids (searchsorted)",
+             timed(lambda: store.search_sorted_ids([target]), 1000),
+             timed(lambda: store.search_sorted_ids(many), 100),
+             timed(lambda: store.rows_in_id_range(low, low + 99), 1000)),
+        ]
+        for name, *times in rows:
+            cells = "".join(f"{'-':>12}" if t != t else f"{t:>10.4f}ms" for t in times)
+            print(f"  {name:<28}{cells}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,68 @@
+# benchmarks/bench_shift_change.py
+"""
+Shift change benchmark: time from submitting the login form to the user
+main window being shown, for the first login of the process (window built)
+and for later logins after a logout (window reused from the app context).
+
+Uses a throwaway user store and the terminal's usual catalogue source (the
+database when reachable, otherwise the backup files). The admin window
+needs the database and is not covered here; it is reused the same way.
+
+Run from the repository root:
+    python -m benchmarks.bench_shift_change [logins]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from utils import user_store
+from utils.passwords import hash_password
+
+def login(window, context, username, password):
+    window.username_edit.setText(username)
+    window.password_edit.setText(password)
+    window.authenticate()
+    deadline = time.perf_counter() + 60
+    while context.last_sign_in_ms is None:
+        if time.perf_counter() > deadline:
+            raise RuntimeError("Login did not complete")
+        QApplication.processEvents()
+        time.sleep(0.001)
+    elapsed, context.last_sign_in_ms = context.last_sign_in_ms, None
+    return elapsed
+
+def main(logins=5):
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        user_store._store = user_store.UserStore(os.path.join(tmpdir, "users.db"), legacy_path=None)
+        user_store._store.add_user("till", hash_password("till-password"))
+
+        from app_context import get_app_context
+        from login_window import LoginWindow
+        context = get_app_context()
+        window = LoginWindow()
+        window.show()
+
+        first = login(window, context, "till", "till-password")
+        warm = []
+        for _ in range(logins - 1):
+            context.user_window.logout()
+            warm.append(login(window, context, "till", "till-password"))
+
+        print(f"User login to main window ({logins} logins)")
+        print(f"  First login (window built):   {first:8.1f} ms")
+        if warm:
+            print(f"  Later logins (window reused): {statistics.median(warm):8.1f} ms median")
+        context.shutdown()
+        user_store._store.close()
+    app.quit()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
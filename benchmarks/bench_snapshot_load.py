@@ -0,0 +1,99 @@
+# benchmarks/bench_snapshot_load.py
+"""
+User catalogue load: the old json.load of the whole backup with per-product
+prints against the streaming snapshot loader. Reports load time and peak
+traced memory; each is measured in its own run since tracemalloc slows
+parsing down.
+
+Run from the repository root:
+    python -m benchmarks.bench_snapshot_load [products]
+"""
+
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from User.snapshot_loader import load_snapshot_rows
+
+SALES_PER_PRODUCT = 5
+
+def write_backup(path, n):
+    rng = random.Random(7)
+    data = {
+        "products": [
+            {"product_id": i, "category": rng.choice(["DT", "men", "women"]), "unit_price": round(rng.uniform(1, 100), 2),
+             "sku": f"SKU{i:07d}", "name": f"Product {i}", "description": None, "reorder_level": rng.randint(0, 50)}
+            for i in range(1, n + 1)
+        ],
+        "batches": [
+            {"batch_id": i, "product_id": i, "quantity": rng.randint(0, 500),
+             "manufacture_date": "2024-01-01", "expiry_date": "2026-01-01"}
+            for i in range(1, n + 1)
+        ],
+        "sale_records": [
+            {"sale_id": i, "product_id": 1 + i % n, "quantity_sold": 1, "sale_date": "2024-03-01", "unit_price_at_sale": 2.0}
+            for i in range(n * SALES_PER_PRODUCT)
+        ],
+        "suppliers": [], "orders": [], "order_items": [],
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+
+def old_load(path):
+    """The previous Inventory.load_data, minus the Product objects."""
+    products = []
+    with open(path, "r") as f:
+        data = json.load(f)
+        products_data = data.get("products", [])
+        print(f"Found {len(products_data)} products.")
+        batches_data = data.get("batches", [])
+        print(f"Found {len(batches_data)} batches.")
+        quantity_map = {}
+        for batch in batches_data:
+            pid = batch.get("product_id")
+            quantity_map[pid] = quantity_map.get(pid, 0) + batch.get("quantity", 0)
+        for item in products_data:
+            product_id = item.get("product_id")
+            unit_price = item.get("unit_price")
+            quantity = quantity_map.get(product_id, 0)
+            print(f"Loading Product ID: {product_id}, Price: {unit_price}, Quantity: {quantity}")
+            if unit_price is None:
+                print(f"Unit price is missing for Product ID {product_id}. Setting default price to 0.0.")
+                unit_price = 0.0
+            products.append((int(product_id), item.get("name", ""), float(unit_price), int(quantity), item.get("category", "")))
+    return products
+
+def new_load(path):
+    return load_snapshot_rows(path).products
+
+def measure(loader, path, console):
+    with contextlib.redirect_stdout(console):
+        start = time.perf_counter()
+        rows = loader(path)
+        seconds = time.perf_counter() - start
+        tracemalloc.start()
+        loader(path)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return len(rows), seconds, peak
+
+def main(argv):
+    n = int(argv[0]) if argv else 100_000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "backupbyUser.json")
+        write_backup(path, n)
+        print(f"{n:,} products, {n * SALES_PER_PRODUCT:,} sales, {os.path.getsize(path) / 1e6:.1f} MB")
+        # Console output goes to a null device so only the cost of formatting
+        # and writing is counted, not the terminal
+        with open(os.devnull, "w") as console:
+            for name, loader in (("json.load + prints", old_load), ("streaming loader", new_load)):
+                count, seconds, peak = measure(loader, path, console)
+                print(f"  {name:<20} {count:>9,} rows  {seconds * 1000:8.0f} ms  peak {peak / 1e6:7.1f} MB")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
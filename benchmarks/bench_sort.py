@@ -0,0 +1,65 @@
+# benchmarks/bench_sort.py
+"""
+Sort benchmark for the user-side product list: the cached SortEngine against
+the selectable hand-written algorithms, on random and already sorted input.
+
+Run from the repository root:
+    python -m benchmarks.bench_sort [sizes...]
+
+The hand-written algorithms are skipped above --slow-limit products
+(default 1,000,000, i.e. run everywhere).
+"""
+
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from User.sort_engine import SortEngine, ALGORITHMS, sort_with
+
+DEFAULT_SIZES = [2_000, 100_000, 1_000_000]
+KEYS = ["category", "price"]
+
+def make_products(n, seed=42):
+    rng = random.Random(seed)
+    categories = ["Tablets", "Syrups", "Drops", "Creams", "Capsules", "Injections"]
+    return [
+        SimpleNamespace(
+            product_id=i,
+            name=f"Product {rng.randrange(n):07d}",
+            price=round(rng.uniform(1, 500), 2),
+            quantity=rng.randint(0, 1000),
+            category=rng.choice(categories),
+        )
+        for i in range(1, n + 1)
+    ]
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+def main(argv):
+    slow_limit = 1_000_000
+    if "--slow-limit" in argv:
+        index = argv.index("--slow-limit")
+        slow_limit = int(argv[index + 1])
+        del argv[index:index + 2]
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+
+    for n in sizes:
+        products = make_products(n)
+        print(f"{n:,} products, keys {KEYS}")
+        engine = SortEngine(products)
+        print(f"  Keyed Sort (cold)    {timed(lambda: engine.sort(KEYS)):10.1f} ms")
+        print(f"  Keyed Sort (cached)  {timed(lambda: engine.sort(KEYS)):10.1f} ms")
+        if n > slow_limit:
+            continue
+        by_id = sorted(products, key=lambda p: p.product_id)
+        for name in ALGORITHMS:
+            random_ms = timed(lambda: sort_with(name, products, KEYS))
+            sorted_ms = timed(lambda: sort_with(name, by_id, ["product_id"]))
+            print(f"  {name:<20} {random_ms:10.1f} ms   presorted {sorted_ms:10.1f} ms")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
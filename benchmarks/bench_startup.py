@@ -0,0 +1,58 @@
+# benchmarks/bench_startup.py
+"""
+Cold start benchmark: time from interpreter start to the login window being
+shown. Each run uses a fresh interpreter so nothing is cached in-process.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [runs]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import time
+start = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+imported = time.perf_counter()
+from login_window import LoginWindow
+window = LoginWindow()
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+print(f"{(imported - start) * 1000:.1f} {(shown - start) * 1000:.1f}")
+"""
+
+
+def run_once():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    wall_start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=REPO_ROOT, env=env,
+        capture_output=True, text=True, check=True
+    )
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+    qt_ms, shown_ms = (float(v) for v in result.stdout.split()[-2:])
+    return qt_ms, shown_ms, wall_ms
+
+
+def main(runs=5):
+    samples = [run_once() for _ in range(runs)]
+    qt_ms = statistics.median(s[0] for s in samples)
+    shown_ms = statistics.median(s[1] for s in samples)
+    wall_ms = statistics.median(s[2] for s in samples)
+    print(f"Cold start to login window ({runs} runs, median)")
+    print(f"  QApplication ready:      {qt_ms:8.1f} ms")
+    print(f"  Login window shown:      {shown_ms:8.1f} ms")
+    print(f"  Process wall time:       {wall_ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,103 @@
+# data/change_log.py
+
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, inspect, select, text
+
+from data.models import CatalogueChange, CatalogueChangePrune
+
+logger = logging.getLogger(__name__)
+
+# Tables whose changes affect what a terminal shows for a product
+TRACKED_TABLES = ("products", "batches")
+
+_POSTGRES_FUNCTION = """
+CREATE OR REPLACE FUNCTION log_catalogue_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO catalogue_changes (product_id) SELECT DISTINCT product_id FROM old_rows;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO catalogue_changes (product_id)
+            SELECT product_id FROM new_rows UNION SELECT product_id FROM old_rows;
+    ELSE
+        INSERT INTO catalogue_changes (product_id) SELECT DISTINCT product_id FROM new_rows;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+# Statement level triggers with transition tables, so a bulk statement logs
+# each product once instead of firing once per row. PostgreSQL allows only
+# one event per trigger when transition tables are used.
+_POSTGRES_TRIGGERS = {
+    "INSERT": "REFERENCING NEW TABLE AS new_rows",
+    "UPDATE": "REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows",
+    "DELETE": "REFERENCING OLD TABLE AS old_rows",
+}
+
+_SQLITE_ROWS = {"INSERT": ["NEW"], "UPDATE": ["NEW", "OLD"], "DELETE": ["OLD"]}
+
+def _postgres_statements():
+    yield _POSTGRES_FUNCTION
+    for table in TRACKED_TABLES:
+        for event, referencing in _POSTGRES_TRIGGERS.items():
+            name = f"{table}_change_log_{event.lower()}"
+            yield f"DROP TRIGGER IF EXISTS {name} ON {table}"
+            yield (
+                f"CREATE TRIGGER {name} AFTER {event} ON {table} {referencing} "
+                f"FOR EACH STATEMENT EXECUTE FUNCTION log_catalogue_change()"
+            )
+
+def _sqlite_statements():
+    for table in TRACKED_TABLES:
+        for event, rows in _SQLITE_ROWS.items():
+            inserts = " ".join(
+                f"INSERT INTO catalogue_changes (product_id, changed_at) VALUES ({row}.product_id, CURRENT_TIMESTAMP);"
+                for row in rows
+            )
+            yield (
+                f"CREATE TRIGGER IF NOT EXISTS {table}_change_log_{event.lower()} "
+                f"AFTER {event} ON {table} BEGIN {inserts} END"
+            )
+
+def install_change_log(engine):
+    """
+    Creates the catalogue_changes table if needed and (re)installs the
+    triggers that fill it. Safe to run repeatedly.
+    """
+    CatalogueChange.__table__.create(bind=engine, checkfirst=True)
+    CatalogueChangePrune.__table__.create(bind=engine, checkfirst=True)
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        statements = _postgres_statements()
+    elif dialect == "sqlite":
+        statements = _sqlite_statements()
+    else:
+        logger.warning(f"Catalogue change log triggers are not available for {dialect}.")
+        return
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    logger.info("Catalogue change log installed.")
+
+def prune_change_log(session, keep=timedelta(days=7)):
+    """
+    Deletes change log entries older than keep and records the highest id
+    removed. Terminals further behind than that reload in full. Does nothing
+    on a database without the change log.
+    """
+    tables = inspect(session.get_bind())
+    if not all(tables.has_table(model.__tablename__) for model in (CatalogueChange, CatalogueChangePrune)):
+        return 0
+    through = session.scalar(
+        select(func.max(CatalogueChange.change_id)).where(CatalogueChange.changed_at < datetime.now() - keep)
+    )
+    if through is None:
+        return 0
+    # By id, so everything up to the recorded mark is gone
+    result = session.execute(delete(CatalogueChange).where(CatalogueChange.change_id <= through))
+    session.add(CatalogueChangePrune(pruned_through=through))
+    session.commit()
+    return result.rowcount
@@ -1,6 +1,6 @@
 # data/models.py
 
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Enum, Index, func, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 import enum
@@ -17,7 +17,8 @@ class Product(Base):
 
     product_id = Column(Integer, primary_key=True, index=True)
     sku = Column(String, unique=True, nullable=False)
-    name = Column(String, nullable=False)
+    # Indexed for bulk name lookups; names are not unique, SKUs are
+    name = Column(String, nullable=False, index=True)
     category = Column(String, nullable=False)
     description = Column(String)
     unit_price = Column(Float, nullable=False)
@@ -56,17 +57,32 @@ class Batch(Base):
         passive_deletes=True
     )
 
+    __table_args__ = (
+        # Partial index for expiry lookups: sold out batches are most of the
+        # table over time and are never asked about
+        Index(
+            "ix_batches_expiry_in_stock", "expiry_date",
+            postgresql_where=text("quantity > 0"),
+            sqlite_where=text("quantity > 0"),
+        ),
+    )
+
 class SaleRecord(Base):
     __tablename__ = "sale_records"
 
     sale_id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.product_id", ondelete="CASCADE"), nullable=False)
     quantity_sold = Column(Integer, nullable=False)
-    sale_date = Column(Date, nullable=False)
+    # Indexed for date range reads: reports, exports and demand forecasts
+    sale_date = Column(Date, nullable=False, index=True)
     unit_price_at_sale = Column(Float, nullable=False)
 
     product = relationship("Product", back_populates="sale_records")
 
+    # Closed months are moved out of this table (see data.sale_partitions);
+    # ids must never be reused or the rollup watermark would skip sales
+    __table_args__ = {"sqlite_autoincrement": True}
+
 class Supplier(Base):
     __tablename__ = "suppliers"
 
@@ -103,3 +119,86 @@ class OrderItem(Base):
 
     order = relationship("Order", back_populates="items")
     product = relationship("Product", back_populates="order_items")
+
+class CatalogueChange(Base):
+    """
+    One row per change to a product or its batches, written by database
+    triggers (see data.change_log). Read-only terminals poll it for deltas.
+    """
+    __tablename__ = "catalogue_changes"
+    # Ids must never be reused, or a terminal could miss a change
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    change_id = Column(Integer, primary_key=True)
+    # No foreign key: deleted products are logged too
+    product_id = Column(Integer, nullable=False)
+    # Indexed for prune_change_log, which runs on the admin's stock check timer
+    changed_at = Column(DateTime, nullable=False, server_default=func.now(), index=True)
+
+class CatalogueChangePrune(Base):
+    """
+    Highest change_id removed by each prune of catalogue_changes. Terminals
+    compare it with their position to tell a pruned log from a gap in ids.
+    """
+    __tablename__ = "catalogue_change_prunes"
+
+    prune_id = Column(Integer, primary_key=True)
+    pruned_through = Column(Integer, nullable=False)
+    pruned_at = Column(DateTime, nullable=False, server_default=func.now())
+
+class DailySales(Base):
+    """
+    Units and revenue per product and day, rolled up from sale_records
+    (see data.sales_rollup). Reports and forecasts read this instead of
+    the individual sales.
+    """
+    __tablename__ = "daily_sales"
+
+    sale_date = Column(Date, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.product_id", ondelete="CASCADE"), primary_key=True)
+    quantity = Column(Integer, nullable=False)
+    revenue = Column(Float, nullable=False)
+
+class RollupState(Base):
+    """Highest sale_id already included in a rollup, one row per rollup."""
+    __tablename__ = "rollup_state"
+
+    name = Column(String, primary_key=True)
+    last_sale_id = Column(Integer, nullable=False)
+
+class SalePeriod(Base):
+    """
+    One month of sales history and where its rows are: a partition of
+    sale_records on PostgreSQL, a table of its own on SQLite, or, once
+    archived, a compressed file (see data.sale_partitions).
+    """
+    __tablename__ = "sale_periods"
+
+    period_start = Column(Date, primary_key=True)
+    # First day of the next month; periods cover [period_start, period_end)
+    period_end = Column(Date, nullable=False)
+    # None once the period is archived
+    table_name = Column(String)
+    archive_file = Column(String)
+    row_count = Column(Integer)
+    archived_at = Column(DateTime)
+
+class ProductPrice(Base):
+    """
+    Append-only history of a product's unit price and cost: each row holds
+    the prices from valid_from until the next row of the same product.
+    products.unit_price is the current price (see data.price_history).
+    """
+    __tablename__ = "product_prices"
+
+    price_id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.product_id", ondelete="CASCADE"), nullable=False)
+    valid_from = Column(DateTime, nullable=False)
+    unit_price = Column(Float, nullable=False)
+    # Unknown until a cost is set; carried forward by later price changes
+    cost = Column(Float)
+
+    __table_args__ = (
+        # As-of lookups: newest row at or before a time, per product
+        Index("ix_product_prices_product_valid_from", "product_id", "valid_from"),
+    )
@@ -0,0 +1,60 @@
+# data/price_history.py
+
+import logging
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from data.models import Product, ProductPrice
+
+logger = logging.getLogger(__name__)
+
+def prices_as_of(as_of: datetime, product_ids: Optional[Iterable[int]] = None):
+    """
+    SELECT of the price row in force at as_of for each product (the newest
+    row with valid_from <= as_of), optionally limited to product_ids. Both
+    halves of the join are ranges of the (product_id, valid_from) index.
+    """
+    newest = select(
+        ProductPrice.product_id,
+        func.max(ProductPrice.valid_from).label("valid_from"),
+    ).where(ProductPrice.valid_from <= as_of)
+    if product_ids is not None:
+        newest = newest.where(ProductPrice.product_id.in_(product_ids))
+    newest = newest.group_by(ProductPrice.product_id).subquery()
+    return (
+        select(ProductPrice)
+        .join(newest, and_(
+            ProductPrice.product_id == newest.c.product_id,
+            ProductPrice.valid_from == newest.c.valid_from,
+        ))
+        # Rows sharing a timestamp: the one written last wins
+        .order_by(ProductPrice.product_id, ProductPrice.price_id)
+    )
+
+def start_price_history(session: Session, started_at: Optional[datetime] = None) -> int:
+    """
+    Gives every product without history a first row with its current
+    price, in the caller's transaction. Earlier prices are not
+    reconstructed; sales keep their own unit_price_at_sale. Returns the
+    number of products started.
+    """
+    started_at = started_at or datetime.now()
+    untracked = select(
+        Product.product_id, literal(started_at), Product.unit_price
+    ).where(~select(ProductPrice.price_id).where(ProductPrice.product_id == Product.product_id).exists())
+    result = session.execute(
+        insert(ProductPrice).from_select(["product_id", "valid_from", "unit_price"], untracked)
+    )
+    if result.rowcount:
+        logger.info(f"Started price history for {result.rowcount} products.")
+    return result.rowcount
+
+def install_price_history(engine, started_at: Optional[datetime] = None):
+    """Creates the price history table if needed and starts it for products without one."""
+    ProductPrice.__table__.create(bind=engine, checkfirst=True)
+    with Session(engine) as session:
+        start_price_history(session, started_at)
+        session.commit()
@@ -0,0 +1,165 @@
+# data/report_queries.py
+
+from dataclasses import dataclass
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from data.models import (
+    Product as ORMProduct,
+    Batch as ORMBatch,
+    Supplier as ORMSupplier,
+    Order as ORMOrder,
+    OrderItem as ORMOrderItem,
+)
+from data.sale_partitions import sale_source
+
+# Column types understood by the export writers
+INT = "int"
+FLOAT = "float"
+STR = "str"
+DATE = "date"
+
+@dataclass
+class ReportQuery:
+    name: str
+    columns: List[Tuple[str, str]]  # (column name, column type)
+    statement: Select
+
+def sales_query(session: Session, start_date: Optional[date] = None,
+                end_date: Optional[date] = None) -> ReportQuery:
+    """Sales still in the database, closed-month period tables included; archived months are not."""
+    sales = sale_source(session, start_date, end_date)
+    statement = (
+        select(
+            sales.c.sale_id,
+            sales.c.sale_date,
+            sales.c.product_id,
+            ORMProduct.sku,
+            ORMProduct.name,
+            sales.c.quantity_sold,
+            sales.c.unit_price_at_sale,
+            (sales.c.quantity_sold * sales.c.unit_price_at_sale).label("line_total"),
+        )
+        .join(ORMProduct, ORMProduct.product_id == sales.c.product_id)
+        .order_by(sales.c.sale_id)
+    )
+    if start_date is not None:
+        statement = statement.where(sales.c.sale_date >= start_date)
+    if end_date is not None:
+        statement = statement.where(sales.c.sale_date <= end_date)
+    return ReportQuery(
+        name="sales",
+        columns=[
+            ("sale_id", INT), ("sale_date", DATE), ("product_id", INT), ("sku", STR),
+            ("name", STR), ("quantity_sold", INT), ("unit_price_at_sale", FLOAT), ("line_total", FLOAT),
+        ],
+        statement=statement,
+    )
+
+def inventory_status_query(session: Session, start_date: Optional[date] = None,
+                           end_date: Optional[date] = None) -> ReportQuery:
+    stock = (
+        select(ORMBatch.product_id, func.sum(ORMBatch.quantity).label("total_quantity"))
+        .group_by(ORMBatch.product_id)
+        .subquery()
+    )
+    statement = (
+        select(
+            ORMProduct.product_id,
+            ORMProduct.sku,
+            ORMProduct.name,
+            ORMProduct.category,
+            ORMProduct.unit_price,
+            ORMProduct.reorder_level,
+            func.coalesce(stock.c.total_quantity, 0).label("total_quantity"),
+        )
+        .outerjoin(stock, stock.c.product_id == ORMProduct.product_id)
+        .order_by(ORMProduct.product_id)
+    )
+    return ReportQuery(
+        name="inventory_status",
+        columns=[
+            ("product_id", INT), ("sku", STR), ("name", STR), ("category", STR),
+            ("unit_price", FLOAT), ("reorder_level", INT), ("total_quantity", INT),
+        ],
+        statement=statement,
+    )
+
+def expiry_query(session: Session, start_date: Optional[date] = None,
+                 end_date: Optional[date] = None) -> ReportQuery:
+    """Batches still in stock, soonest expiry first, optionally limited to an expiry date range."""
+    statement = (
+        select(
+            ORMBatch.batch_id,
+            ORMBatch.product_id,
+            ORMProduct.sku,
+            ORMProduct.name,
+            ORMBatch.quantity,
+            ORMBatch.manufacture_date,
+            ORMBatch.expiry_date,
+            (ORMBatch.quantity * ORMProduct.unit_price).label("stock_value"),
+        )
+        .join(ORMProduct, ORMProduct.product_id == ORMBatch.product_id)
+        .where(ORMBatch.quantity > 0)
+        .order_by(ORMBatch.expiry_date, ORMBatch.batch_id)
+    )
+    if start_date is not None:
+        statement = statement.where(ORMBatch.expiry_date >= start_date)
+    if end_date is not None:
+        statement = statement.where(ORMBatch.expiry_date <= end_date)
+    return ReportQuery(
+        name="expiry",
+        columns=[
+            ("batch_id", INT), ("product_id", INT), ("sku", STR), ("name", STR), ("quantity", INT),
+            ("manufacture_date", DATE), ("expiry_date", DATE), ("stock_value", FLOAT),
+        ],
+        statement=statement,
+    )
+
+def orders_query(session: Session, start_date: Optional[date] = None,
+                 end_date: Optional[date] = None) -> ReportQuery:
+    """One row per order line, with the order header and supplier repeated on each line."""
+    statement = (
+        select(
+            ORMOrder.order_id,
+            ORMOrder.order_date,
+            ORMOrder.expected_delivery_date,
+            ORMOrder.status,
+            ORMSupplier.name.label("supplier"),
+            ORMOrderItem.order_item_id,
+            ORMOrderItem.product_id,
+            ORMProduct.name.label("product"),
+            ORMOrderItem.quantity,
+            ORMOrderItem.cost_per_unit,
+        )
+        .join(ORMOrderItem, ORMOrderItem.order_id == ORMOrder.order_id)
+        .join(ORMProduct, ORMProduct.product_id == ORMOrderItem.product_id)
+        .outerjoin(ORMSupplier, ORMSupplier.supplier_id == ORMOrder.supplier_id)
+        .order_by(ORMOrder.order_id, ORMOrderItem.order_item_id)
+    )
+    if start_date is not None:
+        statement = statement.where(ORMOrder.order_date >= start_date)
+    if end_date is not None:
+        statement = statement.where(ORMOrder.order_date <= end_date)
+    return ReportQuery(
+        name="orders",
+        columns=[
+            ("order_id", INT), ("order_date", DATE), ("expected_delivery_date", DATE), ("status", STR),
+            ("supplier", STR), ("order_item_id", INT), ("product_id", INT), ("product", STR),
+            ("quantity", INT), ("cost_per_unit", FLOAT),
+        ],
+        statement=statement,
+    )
+
+# Each is called as (session, start_date, end_date): where the sales are
+# read from depends on the database
+REPORT_QUERIES = {
+    "Sales": sales_query,
+    "Inventory Status": inventory_status_query,
+    "Expiry": expiry_query,
+    "Orders": orders_query,
+}
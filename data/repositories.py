@@ -1,9 +1,12 @@
 # data/repositories.py
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from domain.domain_models import Product, Batch, SaleRecord, Supplier, Order
-from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from domain.domain_models import (
+    Product, Batch, SaleRecord, Supplier, Order, OrderStatus, ReceiptLine, GoodsReceipt, DailySales,
+    ProductPrice
+)
+from datetime import date, datetime
 
 class ProductRepository(ABC):
     @abstractmethod
@@ -18,6 +21,14 @@ class ProductRepository(ABC):
     def get_product_by_sku(self, sku: str) -> Optional[Product]:
         pass
 
+    @abstractmethod
+    def get_products_by_names(self, names: Iterable[str]) -> Dict[str, Product]:
+        pass
+
+    @abstractmethod
+    def get_products_by_skus(self, skus: Iterable[str]) -> Dict[str, Product]:
+        pass
+
     @abstractmethod
     def add_product(self, product: Product) -> Product:
         pass
@@ -30,6 +41,31 @@ class ProductRepository(ABC):
     def delete_product(self, product_id: int) -> None:
         pass
 
+    @abstractmethod
+    def update_reorder_levels(self, levels: Dict[int, int]) -> None:
+        pass
+
+    @abstractmethod
+    def update_prices(self, prices: Dict[int, float], costs: Optional[Dict[int, float]] = None,
+                      valid_from: Optional[datetime] = None) -> None:
+        pass
+
+    @abstractmethod
+    def reprice_category(self, category: str, factor: float, valid_from: Optional[datetime] = None) -> int:
+        pass
+
+    @abstractmethod
+    def get_price_as_of(self, product_id: int, as_of: datetime) -> Optional[ProductPrice]:
+        pass
+
+    @abstractmethod
+    def get_prices_as_of(self, as_of: datetime, product_ids: Optional[Iterable[int]] = None) -> Dict[int, ProductPrice]:
+        pass
+
+    @abstractmethod
+    def get_price_history(self, product_id: int) -> List[ProductPrice]:
+        pass
+
 class BatchRepository(ABC):
     @abstractmethod
     def get_all_batches(self) -> List[Batch]:
@@ -51,6 +87,14 @@ class BatchRepository(ABC):
     def delete_batch(self, batch_id: int) -> None:
         pass
 
+    @abstractmethod
+    def get_batches_expiring_between(self, start_date: Optional[date], end_date: date) -> List[Batch]:
+        pass
+
+    @abstractmethod
+    def get_stock_levels(self, product_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        pass
+
 class SaleRecordRepository(ABC):
     @abstractmethod
     def get_all_sales(self) -> List[SaleRecord]:
@@ -67,6 +111,22 @@ class SaleRecordRepository(ABC):
     @abstractmethod
     def get_sales_between_dates(self, start_date: date, end_date: date) -> List[SaleRecord]:
         pass
+
+    @abstractmethod
+    def get_daily_quantities(self, start_date: date, end_date: date) -> List[Tuple[int, date, int]]:
+        pass
+
+    @abstractmethod
+    def get_daily_sales(self, start_date: date, end_date: date) -> List[DailySales]:
+        pass
+
+    @abstractmethod
+    def roll_up_sales(self) -> int:
+        pass
+
+    @abstractmethod
+    def rebuild_daily_sales(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> None:
+        pass
     
 class SupplierRepository(ABC):
     @abstractmethod
@@ -98,6 +158,17 @@ class OrderRepository(ABC):
     def get_all_orders(self) -> List[Order]:
         pass
 
+    @abstractmethod
+    def get_orders(self, status: Optional[OrderStatus] = None, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None, supplier_id: Optional[int] = None,
+                   limit: Optional[int] = None, offset: int = 0) -> List[Order]:
+        pass
+
+    @abstractmethod
+    def count_orders(self, status: Optional[OrderStatus] = None, start_date: Optional[date] = None,
+                     end_date: Optional[date] = None, supplier_id: Optional[int] = None) -> int:
+        pass
+
     @abstractmethod
     def get_order_by_id(self, order_id: int) -> Optional[Order]:
         pass
@@ -113,3 +184,19 @@ class OrderRepository(ABC):
     @abstractmethod
     def delete_order(self, order_id: int) -> None:
         pass
+
+    @abstractmethod
+    def receive_order(self, order_id: int, lines: List[ReceiptLine]) -> GoodsReceipt:
+        pass
+
+    @abstractmethod
+    def add_orders(self, orders: List[Order]) -> List[Order]:
+        pass
+
+    @abstractmethod
+    def get_last_suppliers(self) -> Dict[int, int]:
+        pass
+
+    @abstractmethod
+    def get_open_order_quantities(self) -> Dict[int, int]:
+        pass
@@ -0,0 +1,108 @@
+# data/sale_archive.py
+
+import csv
+import gzip
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from data.models import SalePeriod
+from data.sale_partitions import (
+    SALE_COLUMNS,
+    drop_period_table,
+    maintain_sale_partitions,
+    month_start,
+    period_table,
+)
+from data.sales_rollup import roll_up_new_sales
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = "sale_archives"
+
+# Rows fetched per round trip while writing an archive
+ARCHIVE_BATCH_SIZE = 5000
+
+@dataclass
+class ArchivedPeriod:
+    period_start: date
+    archive_file: str
+    row_count: int
+
+def _write_archive(session: Session, table_name: str, path: str) -> int:
+    """Streams a period's sales into a gzip CSV file; returns the row count."""
+    table = period_table(table_name)
+    rows = session.execute(
+        select(*table.c).order_by(table.c.sale_id),
+        execution_options={"yield_per": ARCHIVE_BATCH_SIZE},
+    )
+    count = 0
+    # Written under a temporary name, so a crash never leaves a partial
+    # file where a complete archive is expected
+    partial = path + ".partial"
+    with gzip.open(partial, "wt", newline="", compresslevel=6) as f:
+        writer = csv.writer(f)
+        writer.writerow(SALE_COLUMNS)
+        for batch in rows.partitions():
+            writer.writerows(batch)
+            count += len(batch)
+    os.replace(partial, path)
+    return count
+
+def archive_sales(session: Session, before: date, directory: str = ARCHIVE_DIR,
+                  today: Optional[date] = None) -> List[ArchivedPeriod]:
+    """
+    Moves every closed month that ended on or before `before` out of the
+    database into a compressed CSV file in directory, one file per month,
+    then drops its partition or period table. The daily_sales rollup of
+    those months is kept, so reports and forecasts read the same numbers
+    as before. Each month is committed on its own.
+    """
+    today = today or date.today()
+    cutoff = min(month_start(before), month_start(today))
+    # Closed months become tables of their own first (SQLite) and every
+    # sale is rolled up before any of them is dropped
+    maintain_sale_partitions(session, today)
+    roll_up_new_sales(session)
+    session.commit()
+
+    os.makedirs(directory, exist_ok=True)
+    periods = session.scalars(
+        select(SalePeriod)
+        .where(SalePeriod.table_name.is_not(None), SalePeriod.period_end <= cutoff)
+        .order_by(SalePeriod.period_start)
+    ).all()
+    archived = []
+    for period in periods:
+        path = os.path.join(directory, f"{period.table_name}.csv.gz")
+        try:
+            count = _write_archive(session, period.table_name, path)
+            drop_period_table(session, period.table_name)
+            period.table_name = None
+            period.archive_file = path
+            period.row_count = count
+            period.archived_at = datetime.now()
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        archived.append(ArchivedPeriod(period.period_start, path, count))
+        logger.info(f"Archived {count} sales of {period.period_start:%Y-%m} to {path}.")
+    return archived
+
+def read_archive(path: str) -> Iterator[Dict[str, object]]:
+    """Yields the sales in an archive file as dicts with the sale_records column names."""
+    with gzip.open(path, "rt", newline="") as f:
+        for row in csv.DictReader(f):
+            yield {
+                "sale_id": int(row["sale_id"]),
+                "product_id": int(row["product_id"]),
+                "quantity_sold": int(row["quantity_sold"]),
+                "sale_date": date.fromisoformat(row["sale_date"]),
+                "unit_price_at_sale": float(row["unit_price_at_sale"]),
+            }
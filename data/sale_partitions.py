@@ -0,0 +1,256 @@
+# data/sale_partitions.py
+
+import logging
+from datetime import date, timedelta
+from typing import Iterator, List, Optional
+
+from sqlalchemy import Column, Index, MetaData, Table, delete, func, insert, select, text, union_all
+from sqlalchemy.orm import Session
+
+from data.models import DailySales, SalePeriod, SaleRecord
+from data.sales_rollup import roll_up_new_sales
+
+logger = logging.getLogger(__name__)
+
+# Months of partitions created ahead of today on PostgreSQL. Sales past the
+# last one land in the default partition until the next maintenance run.
+PARTITION_MONTHS_AHEAD = 3
+
+DEFAULT_PARTITION = "sale_records_default"
+
+SALE_COLUMNS = [column.name for column in SaleRecord.__table__.columns]
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+def next_month(day: date) -> date:
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+def months_between(first: date, last: date) -> Iterator[date]:
+    """First day of every month from first's month through last's month."""
+    month = month_start(first)
+    while month <= last:
+        yield month
+        month = next_month(month)
+
+def period_table_name(period_start: date) -> str:
+    return f"sale_records_{period_start:%Y_%m}"
+
+def period_table(name: str) -> Table:
+    """A table with the columns of sale_records: a partition on PostgreSQL, a period table on SQLite."""
+    columns = [
+        Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+        for column in SaleRecord.__table__.columns
+    ]
+    return Table(name, MetaData(), *columns, Index(f"ix_{name}_sale_date", "sale_date"))
+
+def _register_period(session: Session, period_start: date, table_name: str):
+    period = session.get(SalePeriod, period_start)
+    if period is None:
+        session.add(SalePeriod(period_start=period_start, period_end=next_month(period_start), table_name=table_name))
+    else:
+        period.table_name = table_name
+    session.flush()
+
+def sale_source(session: Session, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    """
+    Everything that holds sales in [start_date, end_date] and is still in
+    the database, with the columns of sale_records. On PostgreSQL that is
+    sale_records itself, since the partitions are read through it; on
+    SQLite it is sale_records plus the period tables of closed months.
+    """
+    table = SaleRecord.__table__
+    if session.get_bind().dialect.name != "sqlite":
+        return table
+    periods = select(SalePeriod.table_name).where(SalePeriod.table_name.is_not(None))
+    if start_date is not None:
+        periods = periods.where(SalePeriod.period_end > start_date)
+    if end_date is not None:
+        periods = periods.where(SalePeriod.period_start <= end_date)
+    names = session.scalars(periods.order_by(SalePeriod.period_start)).all()
+    if not names:
+        return table
+    return union_all(
+        *(select(*period_table(name).c) for name in names), select(*table.c)
+    ).subquery("sale_records")
+
+def clear_period_tables(session: Session):
+    """
+    SQLite: drops the period tables of closed months and their registry
+    rows, for a restore that puts every sale back into sale_records; the
+    next maintenance run splits them out again. Archived periods are kept,
+    since a backup does not include their sales. On PostgreSQL nothing is
+    needed: deleting from sale_records empties the partitions.
+    """
+    if session.get_bind().dialect.name != "sqlite":
+        return
+    for period in session.scalars(select(SalePeriod).where(SalePeriod.table_name.is_not(None))).all():
+        drop_period_table(session, period.table_name)
+        if period.archive_file is None:
+            session.delete(period)
+        else:
+            period.table_name = None
+    session.flush()
+
+def archived_until(session: Session) -> Optional[date]:
+    """End of the newest archived period: raw sales before it are only in archive files."""
+    return session.scalar(select(func.max(SalePeriod.period_end)).where(SalePeriod.archive_file.is_not(None)))
+
+def archived_daily_sales(session: Session) -> List[dict]:
+    """
+    The daily_sales rows of archived months. They cannot be rebuilt from
+    sale_records, so a restore saves them and writes them back.
+    """
+    archive_end = archived_until(session)
+    if archive_end is None:
+        return []
+    rows = session.execute(select(DailySales.__table__).where(DailySales.sale_date < archive_end)).mappings()
+    return [dict(row) for row in rows]
+
+# PostgreSQL: sale_records partitioned by month
+
+def _is_partitioned(session: Session) -> bool:
+    return session.execute(text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.relname = 'sale_records'"
+    )).first() is not None
+
+def _create_partition(session: Session, period_start: date):
+    """
+    Adds the partition for one month. Rows already in the default partition
+    for that month are moved into it first, otherwise the attach fails.
+    """
+    name = period_table_name(period_start)
+    bounds = {"start": period_start, "end": next_month(period_start)}
+    session.execute(text(f"CREATE TABLE {name} (LIKE sale_records INCLUDING DEFAULTS)"))
+    session.execute(text(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+        f"WHERE sale_date >= :start AND sale_date < :end RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    session.execute(text(
+        f"ALTER TABLE sale_records ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    ))
+    _register_period(session, period_start, name)
+
+def _partition_postgres(session: Session, today: date):
+    """
+    Replaces a plain sale_records table with one range partitioned by
+    sale_date, one partition per month from the first sale on, and copies
+    the rows over. The id sequence is kept, so ids continue where they were.
+
+    The primary key of a partitioned table has to include the partition
+    key, so it becomes (sale_id, sale_date); ids still come from the one
+    sequence and stay unique.
+    """
+    first_sale = session.scalar(select(func.min(SaleRecord.sale_date))) or today
+    sequence = session.scalar(text("SELECT pg_get_serial_sequence('sale_records', 'sale_id')"))
+    session.execute(text("ALTER TABLE sale_records RENAME TO sale_records_unpartitioned"))
+    session.execute(text(f"""
+        CREATE TABLE sale_records (
+            sale_id integer NOT NULL DEFAULT nextval('{sequence}'),
+            product_id integer NOT NULL REFERENCES products (product_id) ON DELETE CASCADE,
+            quantity_sold integer NOT NULL,
+            sale_date date NOT NULL,
+            unit_price_at_sale double precision NOT NULL
+        ) PARTITION BY RANGE (sale_date)
+    """))
+    session.execute(text(f"ALTER SEQUENCE {sequence} OWNED BY sale_records.sale_id"))
+    session.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF sale_records DEFAULT"))
+    for period_start in months_between(first_sale, today):
+        _create_partition(session, period_start)
+
+    columns = ", ".join(SALE_COLUMNS)
+    session.execute(text(
+        f"INSERT INTO sale_records ({columns}) SELECT {columns} FROM sale_records_unpartitioned"
+    ))
+    # Dropped before the key and indexes are added, since they take the old names
+    session.execute(text("DROP TABLE sale_records_unpartitioned"))
+    session.execute(text("ALTER TABLE sale_records ADD PRIMARY KEY (sale_id, sale_date)"))
+    for index in SaleRecord.__table__.indexes:
+        index.create(session.connection())
+    logger.info(f"Partitioned sale_records by month from {month_start(first_sale)}.")
+
+def _add_upcoming_partitions(session: Session, today: date, months_ahead: int):
+    registered = set(session.scalars(select(SalePeriod.period_start)))
+    last = month_start(today)
+    for _ in range(months_ahead):
+        last = next_month(last)
+    for period_start in months_between(today, last):
+        if period_start not in registered:
+            _create_partition(session, period_start)
+
+# SQLite: closed months moved into tables of their own
+
+def _ids_never_reused(session: Session) -> bool:
+    definition = session.scalar(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'sale_records'"))
+    return "AUTOINCREMENT" in (definition or "").upper()
+
+def _split_closed_months(session: Session, today: date):
+    """
+    Moves the sales of every month before the current one out of
+    sale_records into a sale_records_YYYY_MM table, so sale_records only
+    ever holds the open month. Sales are rolled up first; period tables
+    hold nothing the rollup has not seen.
+    """
+    if not _ids_never_reused(session):
+        # Emptying the table would let SQLite hand out old sale ids again
+        logger.warning("sale_records was created without AUTOINCREMENT; closed months are left in place.")
+        return
+    roll_up_new_sales(session)
+    current = month_start(today)
+    first_sale = session.scalar(select(func.min(SaleRecord.sale_date)).where(SaleRecord.sale_date < current))
+    if first_sale is None:
+        return
+    # Late sales for archived months stay in sale_records
+    archived = set(session.scalars(select(SalePeriod.period_start).where(SalePeriod.archive_file.is_not(None))))
+    for period_start in months_between(first_sale, current - timedelta(days=1)):
+        if period_start in archived:
+            continue
+        in_month = (SaleRecord.sale_date >= period_start, SaleRecord.sale_date < next_month(period_start))
+        if not session.scalar(select(func.count()).where(*in_month)):
+            continue
+        name = period_table_name(period_start)
+        table = period_table(name)
+        table.create(session.connection(), checkfirst=True)
+        session.execute(insert(table).from_select(SALE_COLUMNS, select(*SaleRecord.__table__.c).where(*in_month)))
+        session.execute(delete(SaleRecord).where(*in_month))
+        _register_period(session, period_start, name)
+        logger.info(f"Moved sales of {period_start:%Y-%m} to {name}.")
+
+def maintain_sale_partitions(session: Session, today: Optional[date] = None,
+                             months_ahead: int = PARTITION_MONTHS_AHEAD):
+    """
+    PostgreSQL: partitions sale_records on first use and creates the
+    partitions of the coming months. SQLite: moves closed months into
+    their own tables. Commits; safe to run repeatedly.
+    """
+    today = today or date.today()
+    dialect = session.get_bind().dialect.name
+    try:
+        if dialect == "postgresql":
+            if not _is_partitioned(session):
+                _partition_postgres(session, today)
+            _add_upcoming_partitions(session, today, months_ahead)
+        elif dialect == "sqlite":
+            _split_closed_months(session, today)
+        else:
+            logger.warning(f"Sale partitioning is not available for {dialect}.")
+            return
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+def drop_period_table(session: Session, name: str):
+    """Removes a partition (PostgreSQL) or period table (SQLite) and its rows."""
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text(f"ALTER TABLE sale_records DETACH PARTITION {name}"))
+    period_table(name).drop(session.connection())
+
+def install_sale_partitions(engine):
+    """Creates the period registry if needed and brings the partitions up to date."""
+    SalePeriod.__table__.create(bind=engine, checkfirst=True)
+    with Session(engine) as session:
+        maintain_sale_partitions(session)
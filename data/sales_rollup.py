@@ -0,0 +1,170 @@
+# data/sales_rollup.py
+
+import logging
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from data.models import DailySales, RollupState, SaleRecord
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_NAME = "daily_sales"
+
+def _dialect_insert(session):
+    """The dialect's INSERT with ON CONFLICT support, or None."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+def _grouped_sales(source, *conditions):
+    """Units and revenue per day and product of the sales in source (sale_records or a union with it)."""
+    return (
+        select(
+            source.c.sale_date,
+            source.c.product_id,
+            func.sum(source.c.quantity_sold),
+            func.sum(source.c.quantity_sold * source.c.unit_price_at_sale),
+        )
+        .where(*conditions)
+        .group_by(source.c.sale_date, source.c.product_id)
+    )
+
+def lock_rollup_state(session: Session) -> int:
+    """
+    Returns the rollup's last_sale_id and, on PostgreSQL, locks its row for
+    the rest of the transaction. Checkouts take this lock before inserting
+    their sale, so sale ids are handed out in commit order and the
+    watermark can never pass a sale that is still uncommitted.
+    """
+    last_sale_id = session.execute(
+        select(RollupState.last_sale_id).where(RollupState.name == ROLLUP_NAME).with_for_update()
+    ).scalar_one_or_none()
+    if last_sale_id is None:
+        session.execute(insert(RollupState).values(name=ROLLUP_NAME, last_sale_id=0))
+        last_sale_id = 0
+    return last_sale_id
+
+def _merge(session: Session, grouped):
+    """Adds grouped (sale_date, product_id, quantity, revenue) rows onto daily_sales."""
+    columns = ["sale_date", "product_id", "quantity", "revenue"]
+    dialect_insert = _dialect_insert(session)
+    if dialect_insert is not None:
+        statement = dialect_insert(DailySales).from_select(columns, grouped)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[DailySales.sale_date, DailySales.product_id],
+            set_={
+                "quantity": DailySales.quantity + statement.excluded.quantity,
+                "revenue": DailySales.revenue + statement.excluded.revenue,
+            },
+        ))
+        return
+
+    # Without ON CONFLICT: update the days that exist, insert the rest
+    rows = [dict(zip(columns, row)) for row in session.execute(grouped)]
+    if not rows:
+        return
+    existing = {
+        (row.sale_date, row.product_id): row
+        for row in session.scalars(select(DailySales).where(
+            DailySales.sale_date.in_({row["sale_date"] for row in rows}),
+            DailySales.product_id.in_({row["product_id"] for row in rows}),
+        ))
+    }
+    for row in rows:
+        stored = existing.get((row["sale_date"], row["product_id"]))
+        if stored is None:
+            session.add(DailySales(**row))
+        else:
+            stored.quantity += row["quantity"]
+            stored.revenue += row["revenue"]
+    session.flush()
+
+def roll_up_new_sales(session: Session) -> int:
+    """
+    Adds every sale with an id above the watermark to daily_sales and moves
+    the watermark, in the caller's transaction (nothing is committed).
+    Each sale is counted exactly once however often this runs. Returns the
+    number of sales rolled up.
+    """
+    last_sale_id = lock_rollup_state(session)
+    newest, count = session.execute(
+        select(func.max(SaleRecord.sale_id), func.count()).where(SaleRecord.sale_id > last_sale_id)
+    ).one()
+    if not count:
+        return 0
+    # New sales are always in sale_records itself, never in a closed period
+    sales = SaleRecord.__table__
+    _merge(session, _grouped_sales(sales, sales.c.sale_id > last_sale_id, sales.c.sale_id <= newest))
+    session.execute(
+        update(RollupState).where(RollupState.name == ROLLUP_NAME).values(last_sale_id=newest)
+    )
+    return count
+
+def rebuild_sales_rollup(session: Session, start_date: Optional[date] = None,
+                         end_date: Optional[date] = None, commit: bool = True) -> None:
+    """
+    Recomputes daily_sales from sale_records, for the whole history or only
+    the given date range, and commits unless commit is False (a restore
+    rebuilds inside its own transaction). Used to backfill after sales were
+    imported or restored with ids below the watermark. Archived months
+    are left as they are: their sales are no longer in the database.
+    """
+    from data.sale_partitions import archived_until, sale_source
+
+    try:
+        last_sale_id = lock_rollup_state(session)
+        if start_date is None and end_date is None:
+            # Everything: take all current sales and put the watermark on
+            # the newest. It can move down, after a restore of fewer sales
+            # resets the id sequence.
+            last_sale_id = session.execute(select(func.coalesce(func.max(SaleRecord.sale_id), 0))).scalar_one()
+            session.execute(
+                update(RollupState).where(RollupState.name == ROLLUP_NAME).values(last_sale_id=last_sale_id)
+            )
+        archive_end = archived_until(session)
+        if archive_end is not None and (start_date is None or start_date < archive_end):
+            start_date = archive_end
+        in_range = []
+        if start_date is not None:
+            in_range.append(DailySales.sale_date >= start_date)
+        if end_date is not None:
+            in_range.append(DailySales.sale_date <= end_date)
+        session.execute(delete(DailySales).where(*in_range))
+
+        # Sales above the watermark are left to the next roll up
+        sales = sale_source(session, start_date, end_date)
+        conditions = [sales.c.sale_id <= last_sale_id]
+        if start_date is not None:
+            conditions.append(sales.c.sale_date >= start_date)
+        if end_date is not None:
+            conditions.append(sales.c.sale_date <= end_date)
+        _merge(session, _grouped_sales(sales, *conditions))
+        if commit:
+            session.commit()
+    except Exception:
+        if commit:
+            session.rollback()
+        raise
+    logger.info(f"Rebuilt daily sales rollup from {start_date or 'the start'} to {end_date or 'today'}.")
+
+def install_sales_rollup(engine):
+    """
+    Creates the rollup tables if needed and fills them from existing sales
+    the first time. Safe to run repeatedly.
+    """
+    DailySales.__table__.create(bind=engine, checkfirst=True)
+    RollupState.__table__.create(bind=engine, checkfirst=True)
+    with Session(engine) as session:
+        started = session.execute(
+            select(RollupState.last_sale_id).where(RollupState.name == ROLLUP_NAME)
+        ).scalar_one_or_none()
+        if started is None:
+            rebuild_sales_rollup(session)
@@ -14,25 +14,63 @@ from data.models import (
     Supplier as ORMSupplier,
     Order as ORMOrder,
     OrderItem as ORMOrderItem,
-    OrderStatus
+    OrderStatus,
+    DailySales as ORMDailySales,
+    ProductPrice as ORMProductPrice
 )
 from data.db_config import SessionLocal
-from sqlalchemy.orm import Session
-from sqlalchemy import func, asc
-from typing import List, Optional
+from data.sales_rollup import lock_rollup_state, roll_up_new_sales, rebuild_sales_rollup
+from data.sale_partitions import sale_source
+from data.price_history import prices_as_of
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, asc, cast, column, literal, select, insert, text, update, delete, Numeric
+from typing import Dict, Iterable, List, Optional, Tuple
 from domain.domain_models import (
     Product as DomainProduct,
     Batch as DomainBatch,
     SaleRecord as DomainSaleRecord,
     Supplier as DomainSupplier,
     Order as DomainOrder,
-    OrderItem as DomainOrderItem
+    OrderItem as DomainOrderItem,
+    OrderStatus as DomainOrderStatus,
+    ReceiptLine,
+    GoodsReceipt,
+    DailySales as DomainDailySales,
+    ProductPrice as DomainProductPrice
 )
-from datetime import date
+from datetime import date, datetime
+
+# Values per IN list in bulk lookups, well under driver parameter limits
+LOOKUP_CHUNK_SIZE = 500
+
+# Rows per UPDATE ... FROM (VALUES ...) statement, two parameters each
+VALUES_CHUNK_SIZE = 1000
+
+def update_from_values(session: Session, key, target, new_values: Dict):
+    """
+    Sets target to new_values[key] on every row whose key is in new_values,
+    with one UPDATE ... FROM (VALUES ...) per VALUES_CHUNK_SIZE rows. An
+    executemany would be a round trip per row on psycopg2. The VALUES list
+    is left unaliased, so its columns are column1 and column2 on both
+    PostgreSQL and SQLite (3.33+).
+    """
+    items = list(new_values.items())
+    for start in range(0, len(items), VALUES_CHUNK_SIZE):
+        chunk = items[start:start + VALUES_CHUNK_SIZE]
+        params = {}
+        for i, (k, value) in enumerate(chunk):
+            params[f"k{i}"], params[f"v{i}"] = k, value
+        rows = text("VALUES " + ", ".join(f"(:k{i}, :v{i})" for i in range(len(chunk))))
+        rows = rows.bindparams(**params).columns(column("column1"), column("column2")).subquery("new_values")
+        session.execute(
+            update(key.class_).where(key == rows.c.column1).values({target.key: rows.c.column2})
+            # The caller commits, which expires whatever the session holds
+            .execution_options(synchronize_session=False)
+        )
 
 class SQLAlchemyProductRepository(ProductRepository):
-    def __init__(self):
-        self.session: Session = SessionLocal()
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session or SessionLocal()
 
     def get_all_products(self) -> List[DomainProduct]:
         orm_products = self.session.query(ORMProduct).all()
@@ -47,6 +85,29 @@ class SQLAlchemyProductRepository(ProductRepository):
         orm_product = self.session.query(ORMProduct).filter(ORMProduct.sku == sku).first()
         return self.to_domain_model(orm_product) if orm_product else None
 
+    def _products_by(self, column, values) -> Dict[str, DomainProduct]:
+        """
+        Products whose column value is in values, keyed by that value, with
+        one indexed IN query per LOOKUP_CHUNK_SIZE values. Where a name is
+        shared the product with the lowest id wins.
+        """
+        values = list(dict.fromkeys(values))
+        found = {}
+        for start in range(0, len(values), LOOKUP_CHUNK_SIZE):
+            chunk = values[start:start + LOOKUP_CHUNK_SIZE]
+            orm_products = self.session.scalars(
+                select(ORMProduct).where(column.in_(chunk)).order_by(ORMProduct.product_id)
+            )
+            for orm_product in orm_products:
+                found.setdefault(getattr(orm_product, column.key), self.to_domain_model(orm_product))
+        return found
+
+    def get_products_by_names(self, names: Iterable[str]) -> Dict[str, DomainProduct]:
+        return self._products_by(ORMProduct.name, names)
+
+    def get_products_by_skus(self, skus: Iterable[str]) -> Dict[str, DomainProduct]:
+        return self._products_by(ORMProduct.sku, skus)
+
     def add_product(self, product: DomainProduct) -> DomainProduct:
         orm_product = ORMProduct(
             sku=product.sku,
@@ -57,6 +118,11 @@ class SQLAlchemyProductRepository(ProductRepository):
             reorder_level=product.reorder_level
         )
         self.session.add(orm_product)
+        self.session.flush()
+        # The first price goes into the history with the product
+        self.session.add(ORMProductPrice(
+            product_id=orm_product.product_id, valid_from=datetime.now(), unit_price=product.unit_price
+        ))
         self.session.commit()
         self.session.refresh(orm_product)
         product.product_id = orm_product.product_id
@@ -65,6 +131,14 @@ class SQLAlchemyProductRepository(ProductRepository):
     def update_product(self, product: DomainProduct) -> None:
         orm_product = self.session.query(ORMProduct).filter(ORMProduct.product_id == product.product_id).first()
         if orm_product:
+            if orm_product.unit_price != product.unit_price:
+                # A new history row in the same commit, keeping the current cost
+                valid_from = datetime.now()
+                current = self.get_price_as_of(product.product_id, valid_from)
+                self.session.add(ORMProductPrice(
+                    product_id=product.product_id, valid_from=valid_from,
+                    unit_price=product.unit_price, cost=current.cost if current else None,
+                ))
             orm_product.sku = product.sku
             orm_product.name = product.name
             orm_product.category = product.category
@@ -79,6 +153,122 @@ class SQLAlchemyProductRepository(ProductRepository):
             self.session.delete(orm_product)
             self.session.commit()
 
+    def update_reorder_levels(self, levels: Dict[int, int]) -> None:
+        """Sets the reorder level of many products with one UPDATE ... FROM (VALUES ...) and one commit."""
+        if not levels:
+            return
+        try:
+            update_from_values(self.session, ORMProduct.product_id, ORMProduct.reorder_level, levels)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def update_prices(self, prices: Dict[int, float], costs: Optional[Dict[int, float]] = None,
+                      valid_from: Optional[datetime] = None) -> None:
+        """
+        Reprices many products at once: one UPDATE ... FROM (VALUES ...) of
+        products per VALUES_CHUNK_SIZE prices, one executemany INSERT into
+        the price history (sent as multi-row VALUES by the driver), one
+        commit. Products without an entry in costs keep their current cost.
+        """
+        if not prices:
+            return
+        costs = costs or {}
+        valid_from = valid_from or datetime.now()
+        try:
+            carried = self.get_prices_as_of(valid_from, [pid for pid in prices if pid not in costs])
+            update_from_values(self.session, ORMProduct.product_id, ORMProduct.unit_price, prices)
+            self.session.execute(insert(ORMProductPrice), [
+                {
+                    "product_id": pid,
+                    "valid_from": valid_from,
+                    "unit_price": price,
+                    "cost": costs[pid] if pid in costs else getattr(carried.get(pid), "cost", None),
+                }
+                for pid, price in prices.items()
+            ])
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def reprice_category(self, category: str, factor: float, valid_from: Optional[datetime] = None) -> int:
+        """
+        Multiplies the unit price of every product in category by factor,
+        rounded to cents, with one set-based UPDATE and one INSERT ... SELECT
+        into the price history that carries each product's cost forward.
+        Returns the number of products repriced.
+        """
+        valid_from = valid_from or datetime.now()
+        in_category = ORMProduct.category == category
+        carried_cost = (
+            select(ORMProductPrice.cost)
+            .where(ORMProductPrice.product_id == ORMProduct.product_id, ORMProductPrice.valid_from <= valid_from)
+            .order_by(ORMProductPrice.valid_from.desc(), ORMProductPrice.price_id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        try:
+            # round() over numeric: PostgreSQL has no two-argument round for double precision
+            result = self.session.execute(
+                update(ORMProduct).where(in_category)
+                .values(unit_price=func.round(cast(ORMProduct.unit_price * factor, Numeric), 2))
+                .execution_options(synchronize_session=False)
+            )
+            self.session.execute(insert(ORMProductPrice).from_select(
+                ["product_id", "valid_from", "unit_price", "cost"],
+                select(ORMProduct.product_id, literal(valid_from), ORMProduct.unit_price, carried_cost).where(in_category),
+            ))
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return result.rowcount
+
+    def get_price_as_of(self, product_id: int, as_of: datetime) -> Optional[DomainProductPrice]:
+        """The price in force at as_of: one backward step on the (product_id, valid_from) index."""
+        orm_price = self.session.scalars(
+            select(ORMProductPrice)
+            .where(ORMProductPrice.product_id == product_id, ORMProductPrice.valid_from <= as_of)
+            .order_by(ORMProductPrice.valid_from.desc(), ORMProductPrice.price_id.desc())
+            .limit(1)
+        ).first()
+        return self.price_to_domain_model(orm_price) if orm_price else None
+
+    def get_prices_as_of(self, as_of: datetime,
+                         product_ids: Optional[Iterable[int]] = None) -> Dict[int, DomainProductPrice]:
+        """
+        Prices in force at as_of by product id, for every product with
+        history or only product_ids, one query per LOOKUP_CHUNK_SIZE ids.
+        """
+        if product_ids is None:
+            chunks = [None]
+        else:
+            ids = list(dict.fromkeys(product_ids))
+            chunks = [ids[start:start + LOOKUP_CHUNK_SIZE] for start in range(0, len(ids), LOOKUP_CHUNK_SIZE)]
+        found = {}
+        for chunk in chunks:
+            for orm_price in self.session.scalars(prices_as_of(as_of, chunk)):
+                found[orm_price.product_id] = self.price_to_domain_model(orm_price)
+        return found
+
+    def get_price_history(self, product_id: int) -> List[DomainProductPrice]:
+        orm_prices = self.session.scalars(
+            select(ORMProductPrice)
+            .where(ORMProductPrice.product_id == product_id)
+            .order_by(ORMProductPrice.valid_from, ORMProductPrice.price_id)
+        )
+        return [self.price_to_domain_model(p) for p in orm_prices]
+
+    def price_to_domain_model(self, orm_price: ORMProductPrice) -> DomainProductPrice:
+        return DomainProductPrice(
+            product_id=orm_price.product_id,
+            valid_from=orm_price.valid_from,
+            unit_price=orm_price.unit_price,
+            cost=orm_price.cost,
+        )
+
     def to_domain_model(self, orm_product: ORMProduct) -> DomainProduct:
         if not orm_product:
             return None
@@ -94,8 +284,8 @@ class SQLAlchemyProductRepository(ProductRepository):
         )
 
 class SQLAlchemyBatchRepository(BatchRepository):
-    def __init__(self):
-        self.session: Session = SessionLocal()
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session or SessionLocal()
 
     def get_all_batches(self) -> List[DomainBatch]:
         orm_batches = self.session.query(ORMBatch).all()
@@ -134,6 +324,38 @@ class SQLAlchemyBatchRepository(BatchRepository):
             self.session.delete(orm_batch)
             self.session.commit()
 
+    def get_batches_expiring_between(self, start_date: Optional[date], end_date: date) -> List[DomainBatch]:
+        """
+        Batches with stock left whose expiry date is in [start_date, end_date],
+        soonest first. Without a start date, everything up to end_date,
+        including batches that have already expired. The quantity > 0
+        predicate lets the database use ix_batches_expiry_in_stock.
+        """
+        statement = (
+            select(ORMBatch)
+            .where(ORMBatch.quantity > 0, ORMBatch.expiry_date <= end_date)
+            .order_by(ORMBatch.expiry_date, ORMBatch.batch_id)
+        )
+        if start_date is not None:
+            statement = statement.where(ORMBatch.expiry_date >= start_date)
+        return [self.to_domain_model(b) for b in self.session.scalars(statement)]
+
+    def get_stock_levels(self, product_ids: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """
+        Units in stock per product, summed over batches in one grouped query
+        (one per LOOKUP_CHUNK_SIZE ids if product_ids is given). Products
+        without batches are missing from the result.
+        """
+        statement = select(ORMBatch.product_id, func.sum(ORMBatch.quantity)).group_by(ORMBatch.product_id)
+        if product_ids is None:
+            return {pid: int(total or 0) for pid, total in self.session.execute(statement)}
+        ids = list(product_ids)
+        levels = {}
+        for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+            chunk = statement.where(ORMBatch.product_id.in_(ids[start:start + LOOKUP_CHUNK_SIZE]))
+            levels.update((pid, int(total or 0)) for pid, total in self.session.execute(chunk))
+        return levels
+
     def get_available_quantity(self, product_id: int) -> int:
         total = self.session.query(func.sum(ORMBatch.quantity)).filter(ORMBatch.product_id == product_id).scalar()
         return total if total else 0
@@ -173,17 +395,28 @@ class SQLAlchemyBatchRepository(BatchRepository):
             raise ValueError("Insufficient stock to complete the sale.")
 
 class SQLAlchemySaleRecordRepository(SaleRecordRepository):
-    def __init__(self):
-        self.session: Session = SessionLocal()
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session or SessionLocal()
+
+    def _select_sales(self, start_date: Optional[date] = None, end_date: Optional[date] = None,
+                      sale_id: Optional[int] = None) -> List[DomainSaleRecord]:
+        """Sales by id order, including those in closed periods that are still in the database."""
+        sales = sale_source(self.session, start_date, end_date)
+        statement = select(*sales.c).order_by(sales.c.sale_id)
+        if start_date is not None:
+            statement = statement.where(sales.c.sale_date >= start_date)
+        if end_date is not None:
+            statement = statement.where(sales.c.sale_date <= end_date)
+        if sale_id is not None:
+            statement = statement.where(sales.c.sale_id == sale_id)
+        return [DomainSaleRecord(*row) for row in self.session.execute(statement)]
 
     def get_all_sales(self) -> List[DomainSaleRecord]:
-        orm_sales = self.session.query(ORMSaleRecord).all()
-        domain_sales = [self.to_domain_model(s) for s in orm_sales]
-        return domain_sales
+        return self._select_sales()
 
     def get_sale_by_id(self, sale_id: int) -> DomainSaleRecord:
-        orm_sale = self.session.query(ORMSaleRecord).filter(ORMSaleRecord.sale_id == sale_id).first()
-        return self.to_domain_model(orm_sale) if orm_sale else None
+        sales = self._select_sales(sale_id=sale_id)
+        return sales[0] if sales else None
 
     def record_sale(self, sale_record: dict) -> DomainSaleRecord:
         """
@@ -199,11 +432,41 @@ class SQLAlchemySaleRecordRepository(SaleRecordRepository):
             sale_date=sale_record["sale_date"],
             unit_price_at_sale=sale_record["unit_price_at_sale"]
         )
-        self.session.add(orm_sale)
-        self.session.commit()
+        # The sale and its daily rollup are committed together
+        try:
+            lock_rollup_state(self.session)
+            self.session.add(orm_sale)
+            self.session.flush()
+            roll_up_new_sales(self.session)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
         self.session.refresh(orm_sale)
         return self.to_domain_model(orm_sale)
 
+    def roll_up_sales(self) -> int:
+        """Rolls up sales written without record_sale (imports, restores). Returns how many."""
+        try:
+            count = roll_up_new_sales(self.session)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return count
+
+    def rebuild_daily_sales(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> None:
+        rebuild_sales_rollup(self.session, start_date, end_date)
+
+    def get_daily_sales(self, start_date: date, end_date: date) -> List[DomainDailySales]:
+        """Rolled up sales per day and product in [start_date, end_date], by date then product."""
+        rows = self.session.execute(
+            select(ORMDailySales.sale_date, ORMDailySales.product_id, ORMDailySales.quantity, ORMDailySales.revenue)
+            .where(ORMDailySales.sale_date >= start_date, ORMDailySales.sale_date <= end_date)
+            .order_by(ORMDailySales.sale_date, ORMDailySales.product_id)
+        )
+        return [DomainDailySales(*row) for row in rows]
+
     def get_sales_between_dates(self, start_date: date, end_date: date) -> List[DomainSaleRecord]:
         """
         Retrieves all sales between the specified start and end dates.
@@ -212,12 +475,19 @@ class SQLAlchemySaleRecordRepository(SaleRecordRepository):
         :param end_date: End date for the sales records.
         :return: List of SaleRecord instances within the date range.
         """
-        orm_sales = self.session.query(ORMSaleRecord).filter(
-            ORMSaleRecord.sale_date >= start_date,
-            ORMSaleRecord.sale_date <= end_date
-        ).all()
-        domain_sales = [self.to_domain_model(s) for s in orm_sales]
-        return domain_sales
+        return self._select_sales(start_date, end_date)
+
+    def get_daily_quantities(self, start_date: date, end_date: date) -> List[Tuple[int, date, int]]:
+        """
+        Units sold per product and day in [start_date, end_date], as
+        (product_id, sale_date, quantity) rows read from the daily rollup.
+        Days without sales of a product have no row.
+        """
+        rows = self.session.execute(
+            select(ORMDailySales.product_id, ORMDailySales.sale_date, ORMDailySales.quantity)
+            .where(ORMDailySales.sale_date >= start_date, ORMDailySales.sale_date <= end_date)
+        )
+        return [(product_id, sale_date, quantity) for product_id, sale_date, quantity in rows]
 
     def to_domain_model(self, orm_sale: ORMSaleRecord) -> DomainSaleRecord:
         if not orm_sale:
@@ -231,8 +501,8 @@ class SQLAlchemySaleRecordRepository(SaleRecordRepository):
         )
 
 class SQLAlchemySupplierRepository(SupplierRepository):
-    def __init__(self):
-        self.session: Session = SessionLocal()
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session or SessionLocal()
 
     def get_all_suppliers(self) -> List[DomainSupplier]:
         orm_suppliers = self.session.query(ORMSupplier).all()
@@ -290,66 +560,247 @@ class SQLAlchemySupplierRepository(SupplierRepository):
         )
 
 
+def diff_order_items(order_id, stored, items):
+    """
+    Compares the stored lines of an order, as (order_item_id, product_id,
+    quantity, cost_per_unit) rows, with the wanted domain items. A wanted
+    item matches a stored line by its order_item_id, or failing that by
+    product. Returns (inserts, updates, deleted_ids), with inserts and
+    updates as parameter dicts for batched INSERT and UPDATE statements.
+    Lines that match and are unchanged are left out.
+    """
+    by_id = {row.order_item_id: row for row in stored}
+    unmatched_by_product = {}
+    for row in stored:
+        unmatched_by_product.setdefault(row.product_id, []).append(row.order_item_id)
+
+    matched = {}
+    pending = []
+    for item in items:
+        if item.order_item_id in by_id and item.order_item_id not in matched:
+            matched[item.order_item_id] = item
+            unmatched_by_product[by_id[item.order_item_id].product_id].remove(item.order_item_id)
+        else:
+            pending.append(item)
+
+    inserts = []
+    for item in pending:
+        candidates = unmatched_by_product.get(item.product_id)
+        if candidates:
+            matched[candidates.pop(0)] = item
+        else:
+            inserts.append({
+                "order_id": order_id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "cost_per_unit": item.cost_per_unit,
+            })
+
+    updates = []
+    for order_item_id, item in matched.items():
+        row = by_id[order_item_id]
+        if (row.product_id, row.quantity, row.cost_per_unit) != (item.product_id, item.quantity, item.cost_per_unit):
+            updates.append({
+                "order_item_id": order_item_id,
+                "product_id": item.product_id,
+                "quantity": item.quantity,
+                "cost_per_unit": item.cost_per_unit,
+            })
+
+    deleted_ids = [order_item_id for order_item_id in by_id if order_item_id not in matched]
+    return inserts, updates, deleted_ids
+
 class SQLAlchemyOrderRepository(OrderRepository):
-    def __init__(self):
-        self.session: Session = SessionLocal()
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session or SessionLocal()
 
     def get_all_orders(self) -> List[DomainOrder]:
-        orm_orders = self.session.query(ORMOrder).all()
-        domain_orders = [self.to_domain_model(o) for o in orm_orders]
-        return domain_orders
+        return self.get_orders()
 
     def get_order_by_id(self, order_id: int) -> Optional[DomainOrder]:
-        orm_order = self.session.query(ORMOrder).filter(ORMOrder.order_id == order_id).first()
+        orm_order = self.session.scalars(
+            self._order_graph().where(ORMOrder.order_id == order_id)
+            .execution_options(populate_existing=True)
+        ).first()
         return self.to_domain_model(orm_order) if orm_order else None
 
+    def _order_graph(self):
+        """
+        Orders with their supplier joined in, and their items plus each
+        item's product fetched by one extra IN query for the whole page, so
+        any number of orders costs two queries.
+        """
+        return select(ORMOrder).options(
+            joinedload(ORMOrder.supplier),
+            selectinload(ORMOrder.items).joinedload(ORMOrderItem.product),
+        )
+
+    def _order_filters(self, statement, status=None, start_date=None, end_date=None, supplier_id=None):
+        if status is not None:
+            statement = statement.where(ORMOrder.status == OrderStatus(status.value))
+        if start_date is not None:
+            statement = statement.where(ORMOrder.order_date >= start_date)
+        if end_date is not None:
+            statement = statement.where(ORMOrder.order_date <= end_date)
+        if supplier_id is not None:
+            statement = statement.where(ORMOrder.supplier_id == supplier_id)
+        return statement
+
+    def get_orders(self, status: Optional[DomainOrderStatus] = None, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None, supplier_id: Optional[int] = None,
+                   limit: Optional[int] = None, offset: int = 0) -> List[DomainOrder]:
+        """
+        One page of orders, newest first, with suppliers, items and item
+        products filled in. Filters are optional and combined with AND.
+        """
+        statement = self._order_filters(self._order_graph(), status, start_date, end_date, supplier_id)
+        statement = statement.order_by(ORMOrder.order_date.desc(), ORMOrder.order_id.desc()).offset(offset)
+        if limit is not None:
+            statement = statement.limit(limit)
+        # populate_existing refreshes orders already in the long-lived session
+        orm_orders = self.session.scalars(statement.execution_options(populate_existing=True)).unique().all()
+        return [self.to_domain_model(o) for o in orm_orders]
+
+    def count_orders(self, status: Optional[DomainOrderStatus] = None, start_date: Optional[date] = None,
+                     end_date: Optional[date] = None, supplier_id: Optional[int] = None) -> int:
+        statement = self._order_filters(select(func.count(ORMOrder.order_id)), status, start_date, end_date, supplier_id)
+        return self.session.scalar(statement)
+
     def add_order(self, order: DomainOrder) -> DomainOrder:
         orm_order = ORMOrder(
             supplier_id=order.supplier_id,
             order_date=order.order_date,
             expected_delivery_date=order.expected_delivery_date,
             total_cost=order.total_cost,
-            status=OrderStatus(order.status.value)
+            status=OrderStatus(order.status.value),
+            items=[
+                ORMOrderItem(
+                    product_id=item.product_id,
+                    quantity=item.quantity,
+                    cost_per_unit=item.cost_per_unit
+                ) for item in order.items
+            ]
         )
+        # Header and items go in with one commit
         self.session.add(orm_order)
-        self.session.commit()
-        self.session.refresh(orm_order)
-        
-        # Add order items
-        for item in order.items:
-            orm_item = ORMOrderItem(
-                order_id=orm_order.order_id,
-                product_id=item.product_id,
-                quantity=item.quantity,
-                cost_per_unit=item.cost_per_unit
-            )
-            self.session.add(orm_item)
-        self.session.commit()
-        
+        self.session.flush()
         order.order_id = orm_order.order_id
+        for item, orm_item in zip(order.items, orm_order.items):
+            item.order_id = orm_order.order_id
+            item.order_item_id = orm_item.order_item_id
+        self.session.commit()
         return order
 
+    def add_orders(self, orders: List[DomainOrder]) -> List[DomainOrder]:
+        """
+        Saves several new orders in one transaction: the headers, then the
+        items of all orders as one executemany insert. Order ids are set on
+        the orders and their items; item ids are not read back.
+        """
+        if not orders:
+            return orders
+        try:
+            order_ids = self.session.scalars(
+                insert(ORMOrder).returning(ORMOrder.order_id, sort_by_parameter_order=True),
+                [
+                    {
+                        "supplier_id": order.supplier_id,
+                        "order_date": order.order_date,
+                        "expected_delivery_date": order.expected_delivery_date,
+                        "total_cost": order.total_cost,
+                        "status": OrderStatus(order.status.value),
+                    } for order in orders
+                ],
+            ).all()
+            rows = []
+            for order, order_id in zip(orders, order_ids):
+                order.order_id = order_id
+                for item in order.items:
+                    item.order_id = order_id
+                    rows.append({
+                        "order_id": order_id,
+                        "product_id": item.product_id,
+                        "quantity": item.quantity,
+                        "cost_per_unit": item.cost_per_unit,
+                    })
+            if rows:
+                self.session.execute(insert(ORMOrderItem), rows)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return orders
+
+    def get_last_suppliers(self) -> Dict[int, int]:
+        """
+        Product id -> supplier id of the newest order that contains the
+        product. Products are not linked to suppliers directly, so this is
+        who they were last bought from.
+        """
+        newest = (
+            select(ORMOrderItem.product_id, func.max(ORMOrderItem.order_id).label("order_id"))
+            .group_by(ORMOrderItem.product_id)
+            .subquery()
+        )
+        rows = self.session.execute(
+            select(newest.c.product_id, ORMOrder.supplier_id)
+            .join(ORMOrder, ORMOrder.order_id == newest.c.order_id)
+        )
+        return {product_id: supplier_id for product_id, supplier_id in rows}
+
+    def get_open_order_quantities(self) -> Dict[int, int]:
+        """Units per product on orders that are not delivered yet."""
+        rows = self.session.execute(
+            select(ORMOrderItem.product_id, func.sum(ORMOrderItem.quantity))
+            .join(ORMOrder, ORMOrder.order_id == ORMOrderItem.order_id)
+            .where(ORMOrder.status != OrderStatus.Delivered)
+            .group_by(ORMOrderItem.product_id)
+        )
+        return {product_id: int(total or 0) for product_id, total in rows}
+
     def update_order(self, order: DomainOrder) -> None:
-        orm_order = self.session.query(ORMOrder).filter(ORMOrder.order_id == order.order_id).first()
-        if orm_order:
-            orm_order.supplier_id = order.supplier_id
-            orm_order.order_date = order.order_date
-            orm_order.expected_delivery_date = order.expected_delivery_date
-            orm_order.total_cost = order.total_cost
-            orm_order.status = OrderStatus(order.status.value)
-            
-            # Handle order items
-            # For simplicity, delete existing items and add new ones
-            orm_order.items = []
-            for item in order.items:
-                orm_item = ORMOrderItem(
-                    order_id=orm_order.order_id,
-                    product_id=item.product_id,
-                    quantity=item.quantity,
-                    cost_per_unit=item.cost_per_unit
+        """
+        Writes the header and only the order lines that changed, in one
+        transaction: changed lines are updated in place, new lines inserted
+        and dropped lines deleted, each as a single batched statement.
+        """
+        stored = self.session.execute(
+            select(ORMOrderItem.order_item_id, ORMOrderItem.product_id,
+                   ORMOrderItem.quantity, ORMOrderItem.cost_per_unit)
+            .where(ORMOrderItem.order_id == order.order_id)
+        ).all()
+        inserts, updates, deleted_ids = diff_order_items(order.order_id, stored, order.items)
+
+        try:
+            result = self.session.execute(
+                update(ORMOrder)
+                .where(ORMOrder.order_id == order.order_id)
+                .values(
+                    supplier_id=order.supplier_id,
+                    order_date=order.order_date,
+                    expected_delivery_date=order.expected_delivery_date,
+                    total_cost=order.total_cost,
+                    status=OrderStatus(order.status.value)
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                self.session.rollback()
+                return
+            if deleted_ids:
+                self.session.execute(
+                    delete(ORMOrderItem)
+                    .where(ORMOrderItem.order_item_id.in_(deleted_ids))
+                    .execution_options(synchronize_session=False)
                 )
-                self.session.add(orm_item)
+            if updates:
+                self.session.execute(update(ORMOrderItem), updates)
+            if inserts:
+                self.session.execute(insert(ORMOrderItem), inserts)
             self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
 
     def delete_order(self, order_id: int) -> None:
         orm_order = self.session.query(ORMOrder).filter(ORMOrder.order_id == order_id).first()
@@ -357,9 +808,65 @@ class SQLAlchemyOrderRepository(OrderRepository):
             self.session.delete(orm_order)
             self.session.commit()
 
+    def receive_order(self, order_id: int, lines: List[ReceiptLine]) -> GoodsReceipt:
+        """
+        Books a delivery: inserts one batch per receipt line with a single
+        batched INSERT and marks the order Delivered, in one transaction.
+        The order row is locked first, so two tills cannot receive the same
+        order twice. Raises ValueError for an unknown or already delivered
+        order, or lines that do not belong to it.
+        """
+        try:
+            status = self.session.execute(
+                select(ORMOrder.status).where(ORMOrder.order_id == order_id).with_for_update()
+            ).scalar_one_or_none()
+            if status is None:
+                raise ValueError(f"Order {order_id} does not exist.")
+            if status == OrderStatus.Delivered:
+                raise ValueError(f"Order {order_id} has already been received.")
+
+            ordered = set(self.session.scalars(
+                select(ORMOrderItem.product_id).where(ORMOrderItem.order_id == order_id)
+            ))
+            for line in lines:
+                if line.product_id not in ordered:
+                    raise ValueError(f"Product {line.product_id} is not on order {order_id}.")
+                if line.quantity <= 0:
+                    raise ValueError(f"Received quantity for product {line.product_id} must be positive.")
+                if line.expiry_date <= line.manufacture_date:
+                    raise ValueError(f"Expiry date for product {line.product_id} must be after its manufacture date.")
+
+            if lines:
+                # One executemany; batch ids are not read back, as ordered
+                # RETURNING would cost a round trip per row on some drivers
+                self.session.execute(insert(ORMBatch), [
+                    {
+                        "product_id": line.product_id,
+                        "quantity": line.quantity,
+                        "manufacture_date": line.manufacture_date,
+                        "expiry_date": line.expiry_date,
+                    } for line in lines
+                ])
+            self.session.execute(
+                update(ORMOrder)
+                .where(ORMOrder.order_id == order_id)
+                .values(status=OrderStatus.Delivered)
+                .execution_options(synchronize_session=False)
+            )
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+        received = {}
+        for line in lines:
+            received[line.product_id] = received.get(line.product_id, 0) + line.quantity
+        return GoodsReceipt(order_id=order_id, batch_count=len(lines), received=received)
+
     def to_domain_model(self, orm_order: ORMOrder) -> DomainOrder:
         if not orm_order:
             return None
+        supplier = orm_order.supplier
         return DomainOrder(
             order_id=orm_order.order_id,
             supplier_id=orm_order.supplier_id,
@@ -371,9 +878,26 @@ class SQLAlchemyOrderRepository(OrderRepository):
                     order_id=item.order_id,
                     product_id=item.product_id,
                     quantity=item.quantity,
-                    cost_per_unit=item.cost_per_unit
+                    cost_per_unit=item.cost_per_unit,
+                    product=DomainProduct(
+                        product_id=item.product.product_id,
+                        sku=item.product.sku,
+                        name=item.product.name,
+                        category=item.product.category,
+                        description=item.product.description,
+                        unit_price=item.product.unit_price,
+                        reorder_level=item.product.reorder_level,
+                    ) if item.product else None
                 ) for item in orm_order.items
             ],
             total_cost=orm_order.total_cost,
-            status=orm_order.status.value  # Assuming OrderStatus is Enum
+            status=DomainOrderStatus(orm_order.status.value),
+            supplier=DomainSupplier(
+                supplier_id=supplier.supplier_id,
+                name=supplier.name,
+                contact_person=supplier.contact_person,
+                phone=supplier.phone,
+                email=supplier.email,
+                address=supplier.address
+            ) if supplier else None
         )
@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 from typing import Optional, List, Dict
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
 
 @dataclass
@@ -74,3 +74,35 @@ class Order:
     total_cost: float
     status: OrderStatus
     supplier: Optional[Supplier] = None
+
+@dataclass
+class ReceiptLine:
+    """One lot of a delivered product, received as one batch."""
+    product_id: int
+    quantity: int
+    manufacture_date: date
+    expiry_date: date
+    order_item_id: Optional[int] = None
+
+@dataclass
+class GoodsReceipt:
+    order_id: int
+    batch_count: int
+    # Units received per product id
+    received: Dict[int, int]
+
+@dataclass
+class DailySales:
+    """Units sold and revenue of one product on one day."""
+    sale_date: date
+    product_id: int
+    quantity: int
+    revenue: float
+
+@dataclass
+class ProductPrice:
+    """A product's unit price and cost from valid_from until its next price."""
+    product_id: int
+    valid_from: datetime
+    unit_price: float
+    cost: Optional[float] = None
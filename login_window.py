@@ -1,8 +1,5 @@
 import sys
 import os
-import json
-import hashlib
-import time
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox,
@@ -11,16 +8,18 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QRect, QObject, QThread, pyqtSignal
 from PyQt6.QtGui import QIcon
 
-# Import your UI classes and setup function
-from UI.main_window import ModernSidebarUI
-from services.inventory_service import InventoryService  # Adjust path as needed
-from run_ui import setup_inventory_service
-
 # Import the LoadingDialog
 from UI.loading_dialog import LoadingDialog  # Adjust the import path as needed
+from app_context import get_app_context
+from utils.passwords import hash_password, verify_password, password_pool
+from utils.user_store import get_user_store, UsernameTaken
 
 
 class Worker(QObject):
+    """
+    Checks a login on the shared password pool. The worker lives in the UI
+    thread, so the signals it emits from the pool are delivered there.
+    """
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
 
@@ -29,11 +28,13 @@ class Worker(QObject):
         self.username = username
         self.password = password
 
+    def start(self):
+        password_pool().submit(self.run)
+
     def run(self):
         try:
-            time.sleep(2)  # Simulate a delay for demonstration purposes
             user = self.get_user(self.username)
-            if user and self.verify_password(self.password, user['password']):
+            if user and self.verify_password(user, self.password):
                 self.finished.emit(user)
             else:
                 self.error.emit("Invalid username or password.")
@@ -41,26 +42,41 @@ class Worker(QObject):
             self.error.emit(str(e))
 
     def get_user(self, username):
-        users = self.load_users()
-        for user in users:
-            if user['username'] == username:
-                return user
-        return None
-
-    def load_users(self):
-        users_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'users.json')
-        if not os.path.exists(users_file):
-            self.error.emit("Users file not found.")
-            return []
-        with open(users_file, 'r') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                self.error.emit("Users file is corrupted.")
-                return []
+        return get_user_store().get_user(username)
+
+    def verify_password(self, user, password):
+        matches, new_hash = verify_password(password, user['password'])
+        if new_hash is not None:
+            # Legacy SHA-256 or outdated cost: store the current kind of hash
+            get_user_store().set_password(user['username'], new_hash)
+        return matches
+
+class AccountWorker(QObject):
+    """
+    Hashes a new account's password and stores the account on the shared
+    password pool, like Worker does for logins.
+    """
+    finished = pyqtSignal()
+    taken = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, username, password, role):
+        super().__init__()
+        self.username = username
+        self.password = password
+        self.role = role
 
-    def verify_password(self, password, hashed_password):
-        return hashlib.sha256(password.encode()).hexdigest() == hashed_password
+    def start(self):
+        password_pool().submit(self.run)
+
+    def run(self):
+        try:
+            get_user_store().add_user(self.username, hash_password(self.password), role=self.role)
+            self.finished.emit()
+        except UsernameTaken:
+            self.taken.emit()
+        except Exception as e:
+            self.error.emit(str(e))
 
 class InventoryServiceWorker(QObject):
     finished = pyqtSignal(object)
@@ -68,6 +84,9 @@ class InventoryServiceWorker(QObject):
 
     def run(self):
         try:
+            # Imported here so SQLAlchemy and the repositories are loaded
+            # after login instead of before the login window is shown.
+            from run_ui import setup_inventory_service
             inventory_service = setup_inventory_service()
             self.finished.emit(inventory_service)
         except Exception as e:
@@ -76,6 +95,10 @@ class InventoryServiceWorker(QObject):
 class LoginWindow(QWidget):
     def __init__(self):
         super().__init__()
+        # The app context shows this window again on logout
+        self.context = get_app_context()
+        if self.context.login_window is None:
+            self.context.login_window = self
         self.setWindowTitle("Login")
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)  # Ensure style is applied immediately
         self.init_ui()
@@ -238,6 +261,15 @@ class LoginWindow(QWidget):
     def hide_loading(self):
         self.loading_dialog.close()
 
+    def reset(self):
+        """Clears the form for the next user after a logout."""
+        self.password_edit.clear()
+        self.username_edit.clear()
+        self.username_edit.setFocus()
+        self.login_button.setEnabled(True)
+        self.username_edit.setEnabled(True)
+        self.password_edit.setEnabled(True)
+
     def authenticate(self):
         username = self.username_edit.text().strip()
         password = self.password_edit.text().strip()
@@ -246,6 +278,8 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Input Error", "Please enter both username and password.")
             return
 
+        self.context.begin_sign_in()
+
         # Show loading and hide login window
         self.show_loading()
         self.hide()
@@ -255,25 +289,14 @@ class LoginWindow(QWidget):
         self.username_edit.setEnabled(False)
         self.password_edit.setEnabled(False)
 
-        # Set up Worker and Thread for authentication
-        self.thread = QThread()
+        # Verify on the password pool; the slots run back on the UI thread
         self.worker = Worker(username, password)
-        self.worker.moveToThread(self.thread)
-
-        # Connect signals and slots
-        self.thread.started.connect(self.worker.run)
         self.worker.finished.connect(self.on_auth_success)
         self.worker.error.connect(self.on_auth_error)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.worker.error.connect(self.thread.quit)
-        self.worker.error.connect(self.worker.deleteLater)
-
-        # Start the thread
-        self.thread.start()
+        self.worker.start()
 
     def on_auth_success(self, user):
+        self.context.sign_in(user)
         self.open_main_window(user['role'])
         # Re-enable login controls
         self.login_button.setEnabled(True)
@@ -290,27 +313,41 @@ class LoginWindow(QWidget):
         self.password_edit.setEnabled(True)
 
     def open_main_window(self, role):
+        """
+        Shows the main window for the role. Windows (and the admin inventory
+        service) from an earlier login in this process are reused, so only
+        the first login of each role pays for building them.
+        """
+        context = self.context
         if role == 'admin':
-            self.show_loading()
-
-            # Set up Worker and Thread for Inventory Service
-            self.inventory_thread = QThread()
-            self.inventory_worker = InventoryServiceWorker()
-            self.inventory_worker.moveToThread(self.inventory_thread)
-
-            # Connect signals and slots
-            self.inventory_thread.started.connect(self.inventory_worker.run)
-            self.inventory_worker.finished.connect(self.on_inventory_success)
-            self.inventory_worker.error.connect(self.on_inventory_error)
-            self.inventory_worker.finished.connect(self.inventory_thread.quit)
-            self.inventory_worker.finished.connect(self.inventory_worker.deleteLater)
-            self.inventory_thread.finished.connect(self.inventory_thread.deleteLater)
-            self.inventory_worker.error.connect(self.inventory_thread.quit)
-            self.inventory_worker.error.connect(self.inventory_worker.deleteLater)
-
-            # Start the thread
-            self.inventory_thread.start()
+            if context.admin_window is not None:
+                self.show_main_window(context.admin_window, warm=True)
+            elif context.inventory_service is not None:
+                self.on_inventory_success(context.inventory_service)
+            else:
+                self.show_loading()
+
+                # Set up Worker and Thread for Inventory Service
+                self.inventory_thread = QThread()
+                self.inventory_worker = InventoryServiceWorker()
+                self.inventory_worker.moveToThread(self.inventory_thread)
+
+                # Connect signals and slots
+                self.inventory_thread.started.connect(self.inventory_worker.run)
+                self.inventory_worker.finished.connect(self.on_inventory_success)
+                self.inventory_worker.error.connect(self.on_inventory_error)
+                self.inventory_worker.finished.connect(self.inventory_thread.quit)
+                self.inventory_worker.finished.connect(self.inventory_worker.deleteLater)
+                self.inventory_thread.finished.connect(self.inventory_thread.deleteLater)
+                self.inventory_worker.error.connect(self.inventory_thread.quit)
+                self.inventory_worker.error.connect(self.inventory_worker.deleteLater)
+
+                # Start the thread
+                self.inventory_thread.start()
         else:
+            if context.user_window is not None:
+                self.show_main_window(context.user_window, warm=True)
+                return
             try:
                 from User.UI.user_window import UserMainWindow
             except ImportError:
@@ -318,17 +355,23 @@ class LoginWindow(QWidget):
                 QMessageBox.critical(self, "Error", "Failed to import UserMainWindow. Please check the module path.")
                 self.show()  # Show the login window again
                 return
-            self.main_window = UserMainWindow()
-            self.main_window.show()
-
-            self.hide_loading()
-            self.hide()  # Hide the login window instead of closing
-
-    def on_inventory_success(self, inventory_service):
-        self.main_window = ModernSidebarUI(inventory_service)
-        self.main_window.show()
+            context.user_window = UserMainWindow()
+            self.show_main_window(context.user_window, warm=False)
+
+    def show_main_window(self, window, warm):
+        self.main_window = window
+        if warm:
+            window.on_sign_in(self.context.user)
+        window.show()
         self.hide_loading()
         self.hide()  # Hide the login window instead of closing
+        self.context.main_window_shown(warm)
+
+    def on_inventory_success(self, inventory_service):
+        from UI.main_window import ModernSidebarUI
+        self.context.inventory_service = inventory_service
+        self.context.admin_window = ModernSidebarUI(inventory_service)
+        self.show_main_window(self.context.admin_window, warm=False)
 
     def on_inventory_error(self, error_message):
         self.hide_loading()
@@ -349,9 +392,6 @@ class SignupWindow(QWidget):
         self.apply_styles()
         self.setFixedSize(400, 600)
 
-        # Initialize Loading Dialog (optional)
-        self.loading_dialog = LoadingDialog()
-
         # Fade-in animation
         self.opacity_effect = QGraphicsOpacityEffect(self)
         self.setGraphicsEffect(self.opacity_effect)
@@ -496,14 +536,9 @@ class SignupWindow(QWidget):
             }
         """)
 
-    def show_loading(self):
-        self.loading_dialog.show()
-        QApplication.processEvents()  # Ensure the dialog is rendered
-
-    def hide_loading(self):
-        self.loading_dialog.close()
-
     def register_user(self):
+        if not self.signup_button.isEnabled():
+            return  # An account is already being created
         username = self.username_edit.text().strip()
         password = self.password_edit.text().strip()
         confirm_password = self.confirm_password_edit.text().strip()
@@ -516,81 +551,39 @@ class SignupWindow(QWidget):
             QMessageBox.warning(self, "Input Error", "Passwords do not match.")
             return
 
-        users = self.load_users()
-        if any(user['username'] == username for user in users):
-            QMessageBox.warning(self, "Error", "Username already exists.")
-            return
-
-        hashed_password = hashlib.sha256(password.encode()).hexdigest()
-        new_user = {'username': username, 'password': hashed_password, 'role': 'user'}
-        users.append(new_user)
-        self.save_users(users)
-
-        QMessageBox.information(self, "Success", "Account created successfully. You can now log in.")
+        # Hashed on the password pool; the slots run back on the UI thread
+        self.signup_button.setEnabled(False)
+        self.worker = AccountWorker(username, password, 'user')
+        self.worker.finished.connect(self.on_register_success)
+        self.worker.taken.connect(self.on_username_taken)
+        self.worker.error.connect(self.on_register_error)
+        self.worker.start()
+
+    def on_register_success(self):
+        self.signup_button.setEnabled(True)
+        QMessageBox.information(self, "Success", "Account created successfully.")
+        self.sign_in(self.worker.username)
+
+    def on_username_taken(self):
+        self.signup_button.setEnabled(True)
+        QMessageBox.warning(self, "Error", "Username already exists.")
+
+    def on_register_error(self, error_message):
+        self.signup_button.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Could not create the account: {error_message}")
+
+    def sign_in(self, username):
+        """
+        Signs the new account in through the app context, as a login does,
+        so its main window is kept for the next login and closed on quit.
+        """
+        context = get_app_context()
+        context.begin_sign_in()
+        context.sign_in(get_user_store().get_user(username))
+        login_window = context.login_window or LoginWindow()
+        login_window.open_main_window('user')
         self.close()
 
-    def load_users(self):
-        users_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'users.json')
-        if not os.path.exists(users_file):
-            return []
-        with open(users_file, 'r') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                QMessageBox.critical(self, "Error", "Users file is corrupted.")
-                return []
-
-    def save_users(self, users):
-        users_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'users.json')
-        with open(users_file, 'w') as f:
-            json.dump(users, f, indent=4)
-
-    def open_main_window(self, role):
-        if role == 'admin':
-            self.show_loading()
-
-            # Set up Worker and Thread for Inventory Service
-            self.inventory_thread = QThread()
-            self.inventory_worker = InventoryServiceWorker()
-            self.inventory_worker.moveToThread(self.inventory_thread)
-
-            # Connect signals and slots
-            self.inventory_thread.started.connect(self.inventory_worker.run)
-            self.inventory_worker.finished.connect(self.on_inventory_success)
-            self.inventory_worker.error.connect(self.on_inventory_error)
-            self.inventory_worker.finished.connect(self.inventory_thread.quit)
-            self.inventory_worker.finished.connect(self.inventory_worker.deleteLater)
-            self.inventory_thread.finished.connect(self.inventory_thread.deleteLater)
-            self.inventory_worker.error.connect(self.inventory_thread.quit)
-            self.inventory_worker.error.connect(self.inventory_worker.deleteLater)
-
-            # Start the thread
-            self.inventory_thread.start()
-        else:
-            try:
-                from User.UI.user_window import UserMainWindow
-            except ImportError:
-                self.hide_loading()
-                QMessageBox.critical(self, "Error", "Failed to import UserMainWindow. Please check the module path.")
-                self.show()  # Show the login window again
-                return
-            self.main_window = UserMainWindow()
-            self.main_window.show()
-
-            self.hide_loading()
-            self.hide()  # Hide the login window instead of closing
-
-    def on_inventory_success(self, inventory_service):
-        self.main_window = ModernSidebarUI(inventory_service)
-        self.main_window.show()
-        self.hide_loading()
-        self.hide()  # Hide the login window instead of closing
-
-    def on_inventory_error(self, error_message):
-        self.hide_loading()
-        QMessageBox.critical(self, "Error", f"Failed to open admin dashboard: {error_message}")
-        self.show()  # Show the login window again
-
 
 # Run the application if needed
 if __name__ == "__main__":
@@ -1,15 +1,87 @@
 import json
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import text
-from data.models import Product, Batch, SaleRecord, Supplier, Order, OrderItem
+from sqlalchemy import insert, text
+from data.models import Product, Batch, SaleRecord, Supplier, Order, OrderItem, DailySales, ProductPrice
 from data.db_config import engine
-import tkinter as tk
-from tkinter import filedialog
+from data.sales_rollup import rebuild_sales_rollup
+from data.sale_partitions import archived_daily_sales, clear_period_tables
+from data.price_history import start_price_history
 
 # Create a new session
 SessionLocal = sessionmaker(bind=engine)
 
+def restore_data(session, data_dict):
+    """
+    Replaces the contents of the database with those of a backup, in one
+    transaction, and rebuilds the daily sales rollup from the restored
+    sales. The rollup of archived months is kept as it was. Products the
+    backup has no price history for (older backups) start one at their
+    restored price.
+    """
+    with session.begin():
+        # Deleting the products would cascade to daily_sales on PostgreSQL,
+        # and archived months cannot be rolled up again: their sales are
+        # only in the archive files
+        archived_rollup = archived_daily_sales(session)
+
+        # Delete records in the correct order to avoid foreign key violations
+        session.query(OrderItem).delete()
+        session.query(Order).delete()
+        session.query(SaleRecord).delete()
+        # Closed months held apart on SQLite; archived months stay archived
+        clear_period_tables(session)
+        session.query(Batch).delete()
+        session.query(Supplier).delete()
+        session.query(DailySales).delete()
+        session.query(ProductPrice).delete()
+        session.query(Product).delete()
+
+        # Insert data in the correct order (parent tables first)
+        for product_data in data_dict.get('products', []):
+            product = Product(**product_data)
+            session.add(product)
+
+        for supplier_data in data_dict.get('suppliers', []):
+            supplier = Supplier(**supplier_data)
+            session.add(supplier)
+
+        for order_data in data_dict.get('orders', []):
+            order = Order(**order_data)
+            session.add(order)
+
+        for batch_data in data_dict.get('batches', []):
+            batch = Batch(**batch_data)
+            session.add(batch)
+
+        for sale_record_data in data_dict.get('sale_records', []):
+            sale_record = SaleRecord(**sale_record_data)
+            session.add(sale_record)
+
+        for order_item_data in data_dict.get('order_items', []):
+            order_item = OrderItem(**order_item_data)
+            session.add(order_item)
+
+        for price_data in data_dict.get('product_prices', []):
+            price = ProductPrice(**price_data)
+            session.add(price)
+        session.flush()
+        start_price_history(session)
+
+        # Archived months of the products that are still there
+        product_ids = {product_data['product_id'] for product_data in data_dict.get('products', [])}
+        kept = [row for row in archived_rollup if row['product_id'] in product_ids]
+        if kept:
+            session.execute(insert(DailySales), kept)
+
+        # The restored sales replace the old ones in the daily rollup too
+        rebuild_sales_rollup(session, commit=False)
+
 def restore_data_from_json(filename='backupbyUser.json'):
+    # tkinter is only needed for the file picker; importing it lazily keeps it
+    # out of the application's startup path.
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()  # Hide the root window
 
@@ -25,44 +97,7 @@ def restore_data_from_json(filename='backupbyUser.json'):
             data_dict = json.load(f)
         
         session = SessionLocal()
-        
-        # Start a transaction
-        with session.begin():
-            # Delete records in the correct order to avoid foreign key violations
-            session.query(OrderItem).delete()
-            session.query(Order).delete()
-            session.query(SaleRecord).delete()
-            session.query(Batch).delete()
-            session.query(Supplier).delete()
-            session.query(Product).delete()
-            
-            # Insert data in the correct order (parent tables first)
-            for product_data in data_dict.get('products', []):
-                product = Product(**product_data)
-                session.add(product)
-            
-            for supplier_data in data_dict.get('suppliers', []):
-                supplier = Supplier(**supplier_data)
-                session.add(supplier)
-            
-            for order_data in data_dict.get('orders', []):
-                order = Order(**order_data)
-                session.add(order)
-            
-            for batch_data in data_dict.get('batches', []):
-                batch = Batch(**batch_data)
-                session.add(batch)
-            
-            for sale_record_data in data_dict.get('sale_records', []):
-                sale_record = SaleRecord(**sale_record_data)
-                session.add(sale_record)
-            
-            for order_item_data in data_dict.get('order_items', []):
-                order_item = OrderItem(**order_item_data)
-                session.add(order_item)
-        
-        # Commit the transaction
-        session.commit()
+        restore_data(session, data_dict)
 
         # Reset sequences for PostgreSQL
         if session.bind.dialect.name == 'postgresql':
@@ -73,6 +108,7 @@ def restore_data_from_json(filename='backupbyUser.json'):
                 {'table': 'suppliers', 'pk': 'supplier_id'},
                 {'table': 'orders', 'pk': 'order_id'},
                 {'table': 'order_items', 'pk': 'order_item_id'},
+                {'table': 'product_prices', 'pk': 'price_id'},
             ]
             for seq in sequences:
                 sql = text(f"""
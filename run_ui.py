@@ -9,7 +9,7 @@ from data.sqlalchemy_repositories import (
     SQLAlchemyOrderRepository
 )
 from services.inventory_service import InventoryService
-from PyQt5.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication
 
 def setup_inventory_service() -> InventoryService:
     product_repo = SQLAlchemyProductRepository()
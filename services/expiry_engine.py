@@ -0,0 +1,141 @@
+# services/expiry_engine.py
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from domain.domain_models import Batch
+
+# Days ahead of today the calendar holds; later expiries go to the database
+EXPIRY_HORIZON_DAYS = 90
+
+# Alert thresholds, in days from today
+CRITICAL_DAYS = 7
+WARNING_DAYS = 30
+
+EXPIRED = "expired"
+CRITICAL = "critical"
+WARNING = "warning"
+
+@dataclass
+class ExpiryAlert:
+    level: str
+    batch_count: int
+    quantity: int
+    # Earliest and latest expiry date among the batches
+    first_expiry: date
+    last_expiry: date
+
+class ExpiryCalendar:
+    """
+    Calendar queue of batches with stock, bucketed by expiry date.
+
+    Holds every in-stock batch expiring on or before `covers_until`,
+    including those already expired. Each day with expiries is one bucket
+    (batch id -> batch), and the days themselves are kept sorted, so a range
+    of days is found with two binary searches and only the batches in it are
+    touched. Adding, changing or removing a batch moves it between buckets
+    without a reload.
+
+    Queries ending after covers_until cannot be answered here; the service
+    goes to the database for those.
+    """
+    def __init__(self, batches: List[Batch], covers_until: date):
+        self.covers_until = covers_until
+        self._lock = threading.Lock()
+        self._buckets: Dict[date, Dict[int, Batch]] = {}
+        self._days: List[date] = []
+        self._day_of: Dict[int, date] = {}
+        for batch in batches:
+            self._add(batch)
+
+    def __len__(self):
+        return len(self._day_of)
+
+    def covers(self, end_date: date) -> bool:
+        return end_date <= self.covers_until
+
+    def _add(self, batch: Batch):
+        if batch.quantity <= 0 or batch.expiry_date > self.covers_until:
+            return
+        day = batch.expiry_date
+        bucket = self._buckets.get(day)
+        if bucket is None:
+            bucket = self._buckets[day] = {}
+            insort(self._days, day)
+        bucket[batch.batch_id] = batch
+        self._day_of[batch.batch_id] = day
+
+    def _discard(self, batch_id: int):
+        day = self._day_of.pop(batch_id, None)
+        if day is None:
+            return
+        bucket = self._buckets[day]
+        del bucket[batch_id]
+        if not bucket:
+            del self._buckets[day]
+            del self._days[bisect_left(self._days, day)]
+
+    def put(self, batch: Batch):
+        """Adds a batch, or moves it after its quantity or expiry changed."""
+        with self._lock:
+            self._discard(batch.batch_id)
+            self._add(batch)
+
+    def discard(self, batch_id: int):
+        with self._lock:
+            self._discard(batch_id)
+
+    def between(self, start_date: Optional[date], end_date: date) -> List[Batch]:
+        """Batches expiring in [start_date, end_date], soonest first."""
+        with self._lock:
+            first = 0 if start_date is None else bisect_left(self._days, start_date)
+            last = bisect_right(self._days, end_date)
+            return [
+                batch
+                for day in self._days[first:last]
+                for _, batch in sorted(self._buckets[day].items())
+            ]
+
+    def expiring_within(self, days: int, today: date) -> List[Batch]:
+        """Batches that are still good today but expire within the next `days` days."""
+        return self.between(today, today + timedelta(days=days))
+
+    def expired(self, today: date) -> List[Batch]:
+        """Batches past their expiry date that still have stock."""
+        return self.between(None, today - timedelta(days=1))
+
+    def alerts(self, today: date) -> List[ExpiryAlert]:
+        """One alert per level that has batches, most urgent first."""
+        levels = [
+            (EXPIRED, None, today - timedelta(days=1)),
+            (CRITICAL, today, today + timedelta(days=CRITICAL_DAYS)),
+            (WARNING, today + timedelta(days=CRITICAL_DAYS + 1), today + timedelta(days=WARNING_DAYS)),
+        ]
+        alerts = []
+        for level, start, end in levels:
+            batches = self.between(start, end)
+            if batches:
+                alerts.append(ExpiryAlert(
+                    level=level,
+                    batch_count=len(batches),
+                    quantity=sum(batch.quantity for batch in batches),
+                    first_expiry=batches[0].expiry_date,
+                    last_expiry=batches[-1].expiry_date,
+                ))
+        return alerts
+
+def summarize_alerts(alerts: List[ExpiryAlert]) -> str:
+    """One line for the status bar, e.g. '3 batches expired with stock, 5 batches expire within 7 days'."""
+    parts = []
+    for alert in alerts:
+        noun, verb = ("batch", "expires") if alert.batch_count == 1 else ("batches", "expire")
+        if alert.level == EXPIRED:
+            parts.append(f"{alert.batch_count} {noun} expired with stock")
+        elif alert.level == CRITICAL:
+            parts.append(f"{alert.batch_count} {noun} {verb} within {CRITICAL_DAYS} days")
+        else:
+            parts.append(f"{alert.batch_count} {noun} {verb} in {CRITICAL_DAYS + 1}-{WARNING_DAYS} days")
+    return ", ".join(parts)
@@ -0,0 +1,227 @@
+# services/export_service.py
+
+import csv
+import enum
+import gzip
+import io
+import json
+import struct
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select, func
+
+from data.report_queries import ReportQuery, INT, FLOAT, STR, DATE
+
+# Rows fetched from the database per round trip and written per row group.
+# Memory use is bounded by this, not by the size of the export.
+EXPORT_BATCH_SIZE = 5000
+
+CSV = "csv"
+COLUMNAR = "columnar"
+
+# Columnar file layout (all integers little-endian):
+#   magic        8 bytes   COLUMNAR_MAGIC
+#   header_len   uint32
+#   header       JSON      {"version": 1, "columns": [[name, type], ...]}
+#   row groups   repeated:
+#       row_count  uint32  (0 marks the end of the file)
+#       per column, in header order:
+#           has_nulls   uint8, 1 if a null mask follows
+#           null mask   row_count bytes, 1 where the value is NULL
+#           int         uint8 width (4 or 8), then row_count int32/int64
+#           float       row_count float64
+#           date        row_count int32, days since 1970-01-01
+#           str         row_count uint32 byte lengths, then the UTF-8 bytes
+COLUMNAR_MAGIC = b"GSTKCOL\x01"
+COLUMNAR_VERSION = 1
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# array typecodes of the file's fixed-width types; C int is 32-bit on every
+# platform we run on, the fallback covers the rest
+_INT32 = "i" if array("i").itemsize == 4 else "l"
+_UINT32 = "I" if array("I").itemsize == 4 else "L"
+_ARRAY_TYPECODES = {INT: "q", FLOAT: "d", DATE: _INT32}
+_INT32_MIN, _INT32_MAX = -2**31, 2**31 - 1
+
+@dataclass
+class ExportResult:
+    path: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+def _pack(typecode: str, values) -> bytes:
+    """values as a little-endian array, whatever the byte order of the host."""
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+def _unpack(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+def _plain(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+class CsvExportWriter:
+    def __init__(self, fileobj, columns: List[Tuple[str, str]]):
+        self.text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="")
+        self.writer = csv.writer(self.text)
+        self.writer.writerow([name for name, _ in columns])
+
+    def write_rows(self, rows):
+        self.writer.writerows([_plain(v) for v in row] for row in rows)
+
+    def close(self):
+        self.text.flush()
+        self.text.detach()
+
+class ColumnarExportWriter:
+    """
+    Writes rows as column-major row groups. Numeric and date columns are
+    stored as packed fixed-width arrays, which is both smaller than CSV and
+    compresses much better.
+    """
+    def __init__(self, fileobj, columns: List[Tuple[str, str]]):
+        self.fileobj = fileobj
+        self.columns = columns
+        header = json.dumps({"version": COLUMNAR_VERSION, "columns": columns}).encode("utf-8")
+        fileobj.write(COLUMNAR_MAGIC)
+        fileobj.write(struct.pack("<I", len(header)))
+        fileobj.write(header)
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        self.fileobj.write(struct.pack("<I", len(rows)))
+        for index, (_, column_type) in enumerate(self.columns):
+            values = [_plain(row[index]) for row in rows]
+            if None in values:
+                self.fileobj.write(b"\x01")
+                self.fileobj.write(bytes(1 if v is None else 0 for v in values))
+            else:
+                self.fileobj.write(b"\x00")
+            if column_type == STR:
+                encoded = [b"" if v is None else str(v).encode("utf-8") for v in values]
+                self.fileobj.write(_pack(_UINT32, [len(e) for e in encoded]))
+                self.fileobj.write(b"".join(encoded))
+            elif column_type == DATE:
+                self.fileobj.write(_pack(_INT32, [0 if v is None else v.toordinal() - _EPOCH_ORDINAL for v in values]))
+            elif column_type == INT:
+                ints = [0 if v is None else v for v in values]
+                narrow = _INT32_MIN <= min(ints) and max(ints) <= _INT32_MAX
+                self.fileobj.write(b"\x04" if narrow else b"\x08")
+                self.fileobj.write(_pack(_INT32 if narrow else "q", ints))
+            else:
+                self.fileobj.write(_pack(_ARRAY_TYPECODES[column_type], [0 if v is None else v for v in values]))
+
+    def close(self):
+        self.fileobj.write(struct.pack("<I", 0))
+
+_WRITERS = {CSV: CsvExportWriter, COLUMNAR: ColumnarExportWriter}
+
+def read_columnar(fileobj) -> Tuple[List[Tuple[str, str]], Iterator[Dict[str, list]]]:
+    """
+    Reads a file written by ColumnarExportWriter. Returns the column list and
+    an iterator over row groups, each a dict of column name -> list of values.
+    Pass a gzip file object for compressed exports.
+    """
+    if fileobj.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+        raise ValueError("Not a columnar export file.")
+    (header_len,) = struct.unpack("<I", fileobj.read(4))
+    header = json.loads(fileobj.read(header_len))
+    if header["version"] != COLUMNAR_VERSION:
+        raise ValueError(f"Unsupported columnar export version {header['version']}.")
+    columns = [tuple(column) for column in header["columns"]]
+
+    def row_groups():
+        while True:
+            (row_count,) = struct.unpack("<I", fileobj.read(4))
+            if row_count == 0:
+                return
+            group = {}
+            for name, column_type in columns:
+                has_nulls = fileobj.read(1) == b"\x01"
+                nulls = fileobj.read(row_count) if has_nulls else bytes(row_count)
+                if column_type == STR:
+                    lengths = _unpack(_UINT32, fileobj.read(4 * row_count))
+                    data = fileobj.read(sum(lengths))
+                    values, offset = [], 0
+                    for length in lengths:
+                        values.append(data[offset:offset + length].decode("utf-8"))
+                        offset += length
+                else:
+                    typecode = _ARRAY_TYPECODES[column_type]
+                    if column_type == INT:
+                        typecode = _INT32 if fileobj.read(1) == b"\x04" else "q"
+                    width = array(typecode).itemsize
+                    values = _unpack(typecode, fileobj.read(width * row_count)).tolist()
+                    if column_type == DATE:
+                        values = [date.fromordinal(v + _EPOCH_ORDINAL) for v in values]
+                group[name] = [None if null else v for null, v in zip(nulls, values)]
+            yield group
+
+    return columns, row_groups()
+
+def count_rows(session, query: ReportQuery) -> int:
+    return session.execute(select(func.count()).select_from(query.statement.order_by(None).subquery())).scalar_one()
+
+def export_report(
+    session,
+    query: ReportQuery,
+    path: str,
+    fmt: str = CSV,
+    compress: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> ExportResult:
+    """
+    Streams the result of a report query into a file.
+
+    Rows are fetched with yield_per (a server-side cursor on PostgreSQL) and
+    written one batch at a time, so memory use does not grow with the size
+    of the export.
+
+    :param session: SQLAlchemy session to run the query on.
+    :param query: Report query, see data.report_queries.
+    :param path: Output file path.
+    :param fmt: CSV or COLUMNAR.
+    :param compress: Gzip the output.
+    :param progress_callback: Called with (rows written, total rows) after each batch.
+    :return: ExportResult with the row count and elapsed time.
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    start = time.perf_counter()
+    total = count_rows(session, query) if progress_callback else 0
+    written = 0
+
+    raw = open(path, "wb")
+    fileobj = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if compress else raw
+    try:
+        writer = _WRITERS[fmt](fileobj, query.columns)
+        result = session.execute(query.statement.execution_options(yield_per=batch_size))
+        for partition in result.partitions(batch_size):
+            writer.write_rows(partition)
+            written += len(partition)
+            if progress_callback:
+                progress_callback(written, total)
+        writer.close()
+    finally:
+        if compress:
+            fileobj.close()
+        raw.close()
+
+    return ExportResult(path=path, rows=written, seconds=time.perf_counter() - start)
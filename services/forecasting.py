@@ -0,0 +1,154 @@
+# services/forecasting.py
+
+import math
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from services.reorder_engine import DEFAULT_LEAD_TIME_DAYS
+
+# Days of sales history a forecast looks at
+DEFAULT_HISTORY_DAYS = 730
+
+# Window of the moving average, in days
+MOVING_AVERAGE_DAYS = 28
+
+# Weight of the newest day in simple exponential smoothing
+SMOOTHING_ALPHA = 0.1
+
+# Standard normal quantile of the target service level (95 %)
+SERVICE_LEVEL_Z = 1.65
+
+@dataclass
+class DemandMatrix:
+    """
+    Units sold per product per day: quantities[i, d] is product_ids[i] on
+    start_date + d days. float32 keeps two years of a large catalogue
+    within a few hundred MB.
+    """
+    product_ids: np.ndarray
+    start_date: date
+    quantities: np.ndarray
+
+    @property
+    def days(self) -> int:
+        return self.quantities.shape[1]
+
+@dataclass
+class DemandForecast:
+    """Per-product results, all arrays indexed like product_ids."""
+    product_ids: np.ndarray
+    moving_average: np.ndarray
+    smoothed: np.ndarray
+    daily_std: np.ndarray
+    safety_stock: np.ndarray
+    reorder_levels: np.ndarray
+    # False for products without a sale in the history; no suggestion for those
+    has_history: np.ndarray
+
+    def suggestions(self, current: Dict[int, int]) -> Dict[int, int]:
+        """Product id -> suggested reorder level, for products whose level would change."""
+        ids = self.product_ids[self.has_history].tolist()
+        levels = self.reorder_levels[self.has_history].tolist()
+        return {pid: level for pid, level in zip(ids, levels) if current.get(pid) != level}
+
+def build_demand_matrix(rows: Iterable[Tuple[int, date, int]], product_ids: Iterable[int],
+                        start_date: date, end_date: date) -> DemandMatrix:
+    """
+    Scatters (product_id, day, quantity) rows, as returned by the grouped
+    daily sales query, into a dense products x days matrix. Rows for
+    products not in product_ids or outside the range are dropped.
+    """
+    ids = np.unique(np.fromiter(product_ids, dtype=np.int64))
+    days = (end_date - start_date).days + 1
+    quantities = np.zeros((len(ids), days), dtype=np.float32)
+
+    rows = list(rows)
+    if rows and len(ids):
+        origin = start_date.toordinal()
+        row_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        offsets = np.fromiter((row[1].toordinal() - origin for row in rows), dtype=np.int64, count=len(rows))
+        amounts = np.fromiter((row[2] for row in rows), dtype=np.float64, count=len(rows))
+
+        positions = np.searchsorted(ids, row_ids)
+        keep = (positions < len(ids)) & (offsets >= 0) & (offsets < days)
+        keep[keep] &= ids[positions[keep]] == row_ids[keep]
+        # Flat index into the matrix; add.at sums repeated cells
+        flat = positions[keep] * days + offsets[keep]
+        np.add.at(quantities.reshape(-1), flat, amounts[keep])
+    return DemandMatrix(product_ids=ids, start_date=start_date, quantities=quantities)
+
+def smoothing_weights(days: int, alpha: float = SMOOTHING_ALPHA) -> np.ndarray:
+    """
+    Weights w with level = quantities @ w equal to the last level of
+    l[0] = x[0], l[t] = alpha * x[t] + (1 - alpha) * l[t - 1]. Turning the
+    recursion into one matrix-vector product smooths every product at once.
+    """
+    exponents = np.arange(days - 1, -1, -1, dtype=np.float64)
+    weights = alpha * (1.0 - alpha) ** exponents
+    if days:
+        weights[0] = (1.0 - alpha) ** (days - 1)
+    return weights
+
+def forecast_demand(matrix: DemandMatrix,
+                    window: int = MOVING_AVERAGE_DAYS,
+                    alpha: float = SMOOTHING_ALPHA,
+                    lead_time_days: int = DEFAULT_LEAD_TIME_DAYS,
+                    z: float = SERVICE_LEVEL_Z) -> DemandForecast:
+    """
+    Forecasts daily demand of every product in the matrix with whole-matrix
+    NumPy operations; there is no loop over products.
+
+    Days before a product's first sale are left out of its average,
+    standard deviation and smoothed level, so a product introduced last
+    month is not diluted by two years of zeros. The reorder level is the expected demand over
+    the lead time (from the smoothed rate) plus a safety stock of
+    z * sigma * sqrt(lead time).
+    """
+    x = matrix.quantities
+    n, days = x.shape
+    sold = x > 0
+    has_history = sold.any(axis=1)
+    first_sale = np.where(has_history, sold.argmax(axis=1), days)
+    active_days = np.maximum(days - first_sale, 1)
+
+    window = max(min(window, days), 1)
+    recent = x[:, days - window:].sum(axis=1, dtype=np.float64)
+    moving_average = recent / np.minimum(active_days, window)
+
+    # Days before the first sale are zero, so plain row sums are sums over
+    # the active days and no mask is needed
+    total = x.sum(axis=1, dtype=np.float64)
+    total_squared = (x * x).sum(axis=1, dtype=np.float64)
+    mean = total / active_days
+    squared_deviations = np.maximum(total_squared - active_days * mean * mean, 0.0)
+    daily_std = np.sqrt(squared_deviations / np.maximum(active_days - 1, 1))
+
+    smoothed = x @ smoothing_weights(days, alpha).astype(np.float32) if days else np.zeros(n)
+    # The recursion starts on the first day of the history, so a product
+    # that started selling later carries a level pulled towards the zeros
+    # before it. Its active days hold 1 - (1 - alpha) ** active_days of the
+    # weight; dividing by that is the level started at the first sale.
+    active_weight = np.where(first_sale > 0, 1.0 - (1.0 - alpha) ** active_days, 1.0)
+    smoothed = smoothed.astype(np.float64) / active_weight
+
+    safety_stock = z * daily_std * math.sqrt(lead_time_days)
+    # Rounded before the ceiling so float32 noise on an exact value does not add a unit
+    reorder_levels = np.ceil(np.round(smoothed * lead_time_days + safety_stock, 3)).astype(np.int64)
+
+    return DemandForecast(
+        product_ids=matrix.product_ids,
+        moving_average=moving_average,
+        smoothed=smoothed,
+        daily_std=daily_std,
+        safety_stock=safety_stock,
+        reorder_levels=reorder_levels,
+        has_history=has_history,
+    )
+
+def history_range(today: date, history_days: int = DEFAULT_HISTORY_DAYS) -> Tuple[date, date]:
+    """The full days of history before today: (first day, yesterday)."""
+    end_date = today - timedelta(days=1)
+    return end_date - timedelta(days=history_days - 1), end_date
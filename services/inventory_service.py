@@ -1,7 +1,7 @@
 # services/inventory_service.py
 
-from typing import List, Optional
-from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional
+from datetime import date, datetime, timedelta
 from domain.domain_models import (
     Product,
     Batch,
@@ -9,7 +9,12 @@ from domain.domain_models import (
     Supplier,
     Order,
     OrderItem,
-    SalesReport
+    OrderStatus,
+    SalesReport,
+    ReceiptLine,
+    GoodsReceipt,
+    DailySales,
+    ProductPrice
 )
 from data.repositories import (
     ProductRepository,
@@ -18,6 +23,16 @@ from data.repositories import (
     SupplierRepository,
     OrderRepository
 )
+from services.product_catalogue import ProductCatalogue
+from services.expiry_engine import EXPIRY_HORIZON_DAYS, ExpiryAlert, ExpiryCalendar
+from services.reorder_engine import ReorderDrafts, ReorderEngine
+from services.forecasting import (
+    DEFAULT_HISTORY_DAYS,
+    DemandForecast,
+    build_demand_matrix,
+    forecast_demand,
+    history_range
+)
 
 class InventoryService:
     def __init__(
@@ -33,6 +48,29 @@ class InventoryService:
         self.sale_repo = sale_repo
         self.supplier_repo = supplier_repo
         self.order_repo = order_repo
+        # Loaded on first use, dropped whenever products or suppliers change
+        self._catalogue: Optional[ProductCatalogue] = None
+        self._suppliers: Optional[List[Supplier]] = None
+        # Loaded on first use, kept current by the batch methods below and
+        # dropped when a sale or receipt changes batches in bulk
+        self._expiry_calendar: Optional[ExpiryCalendar] = None
+        # Loaded on first use, then updated from every stock change made
+        # through this service
+        self._reorder_engine: Optional[ReorderEngine] = None
+        # Called after each of those changes, see add_stock_listener
+        self._stock_listeners: List[Callable[[], None]] = []
+
+    def add_stock_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Calls listener() after every product, stock or reorder level change
+        made through this service, once the reorder engine has taken it in.
+        The admin window reads its low stock count from here.
+        """
+        self._stock_listeners.append(listener)
+
+    def _stock_changed(self) -> None:
+        for listener in self._stock_listeners:
+            listener()
 
     # Product Management
     def get_all_products(self) -> List[Product]:
@@ -42,13 +80,87 @@ class InventoryService:
         return self.product_repo.get_product_by_id(product_id)
 
     def add_product(self, product: Product) -> Product:
-        return self.product_repo.add_product(product)
+        self._catalogue = None
+        product = self.product_repo.add_product(product)
+        if self._reorder_engine is not None:
+            self._reorder_engine.put_product(product)
+        self._stock_changed()
+        return product
 
     def update_product(self, product: Product) -> None:
+        self._catalogue = None
         self.product_repo.update_product(product)
+        if self._reorder_engine is not None:
+            self._reorder_engine.put_product(product)
+        self._stock_changed()
 
     def delete_product(self, product_id: int) -> None:
+        self._catalogue = None
         self.product_repo.delete_product(product_id)
+        if self._reorder_engine is not None:
+            self._reorder_engine.remove_product(product_id)
+        self._stock_changed()
+
+    # Prices
+    def get_price_as_of(self, product_id: int, as_of: datetime) -> Optional[ProductPrice]:
+        return self.product_repo.get_price_as_of(product_id, as_of)
+
+    def get_prices_as_of(self, as_of: datetime, product_ids: Optional[Iterable[int]] = None) -> Dict[int, ProductPrice]:
+        return self.product_repo.get_prices_as_of(as_of, product_ids)
+
+    def get_price_history(self, product_id: int) -> List[ProductPrice]:
+        return self.product_repo.get_price_history(product_id)
+
+    def update_prices(self, prices: Dict[int, float], costs: Optional[Dict[int, float]] = None,
+                      valid_from: Optional[datetime] = None) -> None:
+        """Reprices many products in one statement and records the change in the price history."""
+        self.product_repo.update_prices(prices, costs, valid_from)
+        # Both hold Product objects with the old unit prices
+        self._catalogue = None
+        self._reorder_engine = None
+
+    def reprice_category(self, category: str, percent: float, valid_from: Optional[datetime] = None) -> int:
+        """
+        Raises (or, for a negative percent, lowers) the unit price of every
+        product in category by percent, rounded to cents, in the database
+        without reading the products first. Returns the number of products
+        repriced.
+        """
+        repriced = self.product_repo.reprice_category(category, 1 + percent / 100, valid_from)
+        self._catalogue = None
+        self._reorder_engine = None
+        return repriced
+
+    def get_product_catalogue(self) -> ProductCatalogue:
+        """The cached catalogue of all products, loaded with one query on first use."""
+        if self._catalogue is None:
+            self._catalogue = ProductCatalogue(self.product_repo.get_all_products())
+        return self._catalogue
+
+    def get_products_by_names(self, names: Iterable[str]) -> Dict[str, Product]:
+        """
+        Products for the given names. Names the cached catalogue does not
+        know (e.g. added from another till) are fetched in one query.
+        """
+        catalogue = self.get_product_catalogue()
+        found, missing = catalogue.resolve_names(names)
+        if missing:
+            for name, product in self.product_repo.get_products_by_names(missing).items():
+                catalogue.add(product)
+                found[name] = product
+        return found
+
+    def get_products_by_skus(self, skus: Iterable[str]) -> Dict[str, Product]:
+        catalogue = self.get_product_catalogue()
+        found, missing = catalogue.resolve_skus(skus)
+        if missing:
+            for sku, product in self.product_repo.get_products_by_skus(missing).items():
+                catalogue.add(product)
+                found[sku] = product
+        return found
+
+    def get_product_by_name(self, name: str) -> Optional[Product]:
+        return self.get_products_by_names([name]).get(name)
 
     # Batch Management
     def get_all_batches(self) -> List[Batch]:
@@ -58,34 +170,108 @@ class InventoryService:
         return self.batch_repo.get_batch_by_id(batch_id)
 
     def add_batch(self, batch: Batch) -> Batch:
-        return self.batch_repo.add_batch(batch)
+        batch = self.batch_repo.add_batch(batch)
+        if self._expiry_calendar is not None:
+            self._expiry_calendar.put(batch)
+        if self._reorder_engine is not None:
+            self._reorder_engine.adjust(batch.product_id, batch.quantity)
+        self._stock_changed()
+        return batch
 
     def update_batch(self, batch: Batch) -> None:
+        # The stored quantity is needed to turn the edit into a stock delta
+        old = self.batch_repo.get_batch_by_id(batch.batch_id) if self._reorder_engine is not None else None
         self.batch_repo.update_batch(batch)
+        if self._expiry_calendar is not None:
+            self._expiry_calendar.put(batch)
+        if old is not None and self._reorder_engine is not None:
+            self._reorder_engine.adjust(old.product_id, -old.quantity)
+            self._reorder_engine.adjust(batch.product_id, batch.quantity)
+        self._stock_changed()
 
     def delete_batch(self, batch_id: int) -> None:
+        old = self.batch_repo.get_batch_by_id(batch_id) if self._reorder_engine is not None else None
         self.batch_repo.delete_batch(batch_id)
+        if self._expiry_calendar is not None:
+            self._expiry_calendar.discard(batch_id)
+        if old is not None and self._reorder_engine is not None:
+            self._reorder_engine.adjust(old.product_id, -old.quantity)
+        self._stock_changed()
+
+    # Expiry
+    def get_expiry_calendar(self, today: Optional[date] = None) -> ExpiryCalendar:
+        """
+        The in-stock batches expiring up to EXPIRY_HORIZON_DAYS from today,
+        loaded with one indexed query and then kept in memory. Reloaded once
+        the horizon has shrunk below the alert window, e.g. when the app has
+        been running for weeks.
+        """
+        today = today or date.today()
+        calendar = self._expiry_calendar
+        if calendar is None or calendar.covers_until < today + timedelta(days=EXPIRY_HORIZON_DAYS // 2):
+            covers_until = today + timedelta(days=EXPIRY_HORIZON_DAYS)
+            calendar = ExpiryCalendar(self.batch_repo.get_batches_expiring_between(None, covers_until), covers_until)
+            self._expiry_calendar = calendar
+        return calendar
+
+    def get_batches_expiring_between(self, start_date: Optional[date], end_date: date) -> List[Batch]:
+        """In-stock batches expiring in [start_date, end_date], from the calendar where it reaches."""
+        calendar = self.get_expiry_calendar()
+        if calendar.covers(end_date):
+            return calendar.between(start_date, end_date)
+        return self.batch_repo.get_batches_expiring_between(start_date, end_date)
+
+    def get_batches_expiring_within(self, days: int, today: Optional[date] = None) -> List[Batch]:
+        today = today or date.today()
+        return self.get_batches_expiring_between(today, today + timedelta(days=days))
+
+    def get_expired_batches(self, today: Optional[date] = None) -> List[Batch]:
+        """Batches past their expiry date that still have stock, i.e. to be written off."""
+        today = today or date.today()
+        return self.get_expiry_calendar(today).expired(today)
+
+    def get_expiry_alerts(self, today: Optional[date] = None) -> List[ExpiryAlert]:
+        today = today or date.today()
+        return self.get_expiry_calendar(today).alerts(today)
 
     # Supplier Management
     def get_all_suppliers(self) -> List[Supplier]:
         return self.supplier_repo.get_all_suppliers()
 
+    def get_cached_suppliers(self) -> List[Supplier]:
+        """All suppliers, loaded once and kept until a supplier changes."""
+        if self._suppliers is None:
+            self._suppliers = self.supplier_repo.get_all_suppliers()
+        return self._suppliers
+
     def get_supplier_by_id(self, supplier_id: int) -> Optional[Supplier]:
         return self.supplier_repo.get_supplier_by_id(supplier_id)
 
     def add_supplier(self, supplier: Supplier) -> Supplier:
+        self._suppliers = None
         return self.supplier_repo.add_supplier(supplier)
 
     def update_supplier(self, supplier: Supplier) -> None:
+        self._suppliers = None
         self.supplier_repo.update_supplier(supplier)
 
     def delete_supplier(self, supplier_id: int) -> None:
+        self._suppliers = None
         self.supplier_repo.delete_supplier(supplier_id)
 
     # Order Management
     def get_all_orders(self) -> List[Order]:
         return self.order_repo.get_all_orders()
 
+    def get_orders(self, status: Optional[OrderStatus] = None, start_date: Optional[date] = None,
+                   end_date: Optional[date] = None, supplier_id: Optional[int] = None,
+                   limit: Optional[int] = None, offset: int = 0) -> List[Order]:
+        return self.order_repo.get_orders(status, start_date, end_date, supplier_id, limit, offset)
+
+    def count_orders(self, status: Optional[OrderStatus] = None, start_date: Optional[date] = None,
+                     end_date: Optional[date] = None, supplier_id: Optional[int] = None) -> int:
+        return self.order_repo.count_orders(status, start_date, end_date, supplier_id)
+
     def get_order_by_id(self, order_id: int) -> Optional[Order]:
         return self.order_repo.get_order_by_id(order_id)
 
@@ -98,6 +284,25 @@ class InventoryService:
     def delete_order(self, order_id: int) -> None:
         self.order_repo.delete_order(order_id)
 
+    def receive_order(self, order_id: int, lines: List[ReceiptLine]) -> GoodsReceipt:
+        """
+        Receives a delivered order into stock: one batch per line, inserted
+        together with the status change in one transaction. Stock levels are
+        the sum of batch quantities, so the new batches are the stock update;
+        the returned receipt lists the units added per product.
+        """
+        receipt = self.order_repo.receive_order(order_id, lines)
+        self._expiry_calendar = None
+        if self._reorder_engine is not None:
+            for product_id, quantity in receipt.received.items():
+                self._reorder_engine.adjust(product_id, quantity)
+        self._stock_changed()
+        # The batch repository's session may hold stale batch lists
+        batch_session = getattr(self.batch_repo, "session", None)
+        if batch_session is not None:
+            batch_session.expire_all()
+        return receipt
+
     # Sales Management
     def get_all_sales(self) -> List[SaleRecord]:
         return self.sale_repo.get_all_sales()
@@ -105,9 +310,16 @@ class InventoryService:
     def get_sale_by_id(self, sale_id: int) -> Optional[SaleRecord]:
         return self.sale_repo.get_sale_by_id(sale_id)
 
+    def get_sales_between_dates(self, start_date: date, end_date: date) -> List[SaleRecord]:
+        return self.sale_repo.get_sales_between_dates(start_date, end_date)
+
     def record_sale(self, sale: SaleRecord) -> SaleRecord:
         # Use the batch_repo method to reduce quantity directly:
         self.batch_repo.reduce_quantity(sale.product_id, sale.quantity_sold)
+        # Which batches the sale drew from is decided in the repository
+        self._expiry_calendar = None
+        if self._reorder_engine is not None:
+            self._reorder_engine.adjust(sale.product_id, -sale.quantity_sold)
 
         # Convert SaleRecord to dict for the repository:
         sale_dict = {
@@ -116,20 +328,35 @@ class InventoryService:
             "sale_date": sale.sale_date,
             "unit_price_at_sale": sale.unit_price_at_sale
         }
-        return self.sale_repo.record_sale(sale_dict)
+        recorded = self.sale_repo.record_sale(sale_dict)
+        self._stock_changed()
+        return recorded
 
     
     def get_available_quantity(self, product_id: int) -> int:
         return self.batch_repo.get_available_quantity(product_id)
 
     # Reporting
+    def get_daily_sales(self, start_date: date, end_date: date) -> List[DailySales]:
+        """Sales per day and product from the rollup; the cost depends on days x products, not on sales."""
+        return self.sale_repo.get_daily_sales(start_date, end_date)
+
+    def roll_up_sales(self) -> int:
+        """Adds sales not yet in the daily rollup, e.g. imported ones. Cheap when there are none."""
+        return self.sale_repo.roll_up_sales()
+
+    def rebuild_daily_sales(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> None:
+        self.sale_repo.rebuild_daily_sales(start_date, end_date)
+
     def get_sales_report(self, start_date: date, end_date: date) -> SalesReport:
-        sales = self.sale_repo.get_sales_between_dates(start_date, end_date)
-        total_sales = sum(sale.quantity_sold * sale.unit_price_at_sale for sale in sales)
+        catalogue = self.get_product_catalogue()
+        total_sales = 0.0
         sales_by_product = {}
-        for sale in sales:
-            product_name = sale.product.name if sale.product else "Unknown"
-            sales_by_product[product_name] = sales_by_product.get(product_name, 0) + sale.quantity_sold * sale.unit_price_at_sale
+        for day in self.sale_repo.get_daily_sales(start_date, end_date):
+            product = catalogue.get(day.product_id)
+            product_name = product.name if product else "Unknown"
+            sales_by_product[product_name] = sales_by_product.get(product_name, 0) + day.revenue
+            total_sales += day.revenue
         return SalesReport(
             start_date=start_date,
             end_date=end_date,
@@ -139,11 +366,74 @@ class InventoryService:
 
     def get_inventory_status(self) -> List[Product]:
         products = self.product_repo.get_all_products()
+        # One grouped query for all stock levels instead of one per product
+        stock = self.batch_repo.get_stock_levels()
         for product in products:
-            total_quantity = self.batch_repo.get_available_quantity(product.product_id)
-            product.total_quantity = total_quantity
+            product.total_quantity = stock.get(product.product_id, 0)
         return products
 
+    # Reordering
+    def get_reorder_engine(self) -> ReorderEngine:
+        """
+        The reorder engine, built on first use from the product catalogue
+        and one grouped stock query. Sales, batch edits and goods receipts
+        made through this service keep it current.
+        """
+        if self._reorder_engine is None:
+            self._reorder_engine = ReorderEngine(
+                self.get_product_catalogue().products, self.batch_repo.get_stock_levels()
+            )
+        return self._reorder_engine
+
+    def get_low_stock_products(self) -> List[Product]:
+        """Products at or below their reorder level, with total_quantity set."""
+        return self.get_reorder_engine().low_stock_products()
+
+    def get_low_stock_count(self) -> int:
+        return self.get_reorder_engine().low_stock_count()
+
+    def draft_reorders(self, order_date: Optional[date] = None) -> ReorderDrafts:
+        """
+        Pending orders for all low stock products, one per supplier, each
+        product going to the supplier it was last ordered from. Quantities
+        already on open orders are deducted. Nothing is saved; pass the
+        orders to add_orders once confirmed.
+        """
+        return self.get_reorder_engine().draft_orders(
+            self.order_repo.get_last_suppliers(),
+            self.order_repo.get_open_order_quantities(),
+            order_date,
+        )
+
+    def add_orders(self, orders: List[Order]) -> List[Order]:
+        return self.order_repo.add_orders(orders)
+
+    # Forecasting
+    def forecast_demand(self, history_days: int = DEFAULT_HISTORY_DAYS,
+                        today: Optional[date] = None) -> DemandForecast:
+        """
+        Demand forecast for the whole catalogue from the daily sales of the
+        last history_days days, read with one grouped query.
+        """
+        start_date, end_date = history_range(today or date.today(), history_days)
+        rows = self.sale_repo.get_daily_quantities(start_date, end_date)
+        product_ids = [product.product_id for product in self.get_product_catalogue().products]
+        return forecast_demand(build_demand_matrix(rows, product_ids, start_date, end_date))
+
+    def suggest_reorder_levels(self, history_days: int = DEFAULT_HISTORY_DAYS,
+                               today: Optional[date] = None) -> Dict[int, int]:
+        """Product id -> forecast reorder level, for products whose level would change."""
+        current = {product.product_id: product.reorder_level for product in self.get_product_catalogue().products}
+        return self.forecast_demand(history_days, today).suggestions(current)
+
+    def update_reorder_levels(self, levels: Dict[int, int]) -> None:
+        """Writes many reorder levels in one statement."""
+        self.product_repo.update_reorder_levels(levels)
+        self._catalogue = None
+        if self._reorder_engine is not None:
+            self._reorder_engine.set_reorder_levels(levels)
+        self._stock_changed()
+
     # Database Configuration
     def get_db_url(self) -> str:
         return self.batch_repo.session.bind.url.render_as_string(hide_password=True)
@@ -153,10 +443,29 @@ class InventoryService:
         # This is a placeholder implementation
         raise NotImplementedError("Dynamic DB URL update not supported.")
 
+    def expire_cached_state(self):
+        """
+        Expires the objects held by the repositories' sessions, so the next
+        query reloads them. Used when the service is kept across logins.
+        """
+        self._catalogue = None
+        self._suppliers = None
+        self._expiry_calendar = None
+        self._reorder_engine = None
+        for repo in (self.product_repo, self.batch_repo, self.sale_repo, self.supplier_repo, self.order_repo):
+            session = getattr(repo, "session", None)
+            if session is not None:
+                session.expire_all()
+
     def load_all_data(self):
         # Implement your data loading logic here
         self.product_repo.get_all_products()
         self.batch_repo.get_all_batches()
         self.sale_repo.get_all_sales()
+        # Catch up the daily rollup with sales written while the app was closed
+        self.sale_repo.roll_up_sales()
         self.supplier_repo.get_all_suppliers()
-        self.order_repo.get_all_orders()
\ No newline at end of file
+        self.order_repo.get_all_orders()
+        # Built here, behind the loading dialog, so the low stock count is
+        # a lookup on the UI thread from then on
+        self.get_reorder_engine()
\ No newline at end of file
@@ -0,0 +1,54 @@
+# services/product_catalogue.py
+
+from typing import Dict, Iterable, List, Optional
+
+from domain.domain_models import Product
+
+class ProductCatalogue:
+    """
+    In-memory maps of the product table by id, name and SKU, so dialogs can
+    resolve products without a query per line. Where two products share a
+    name the one with the lowest id is returned, as the repository does.
+    """
+    def __init__(self, products: List[Product]):
+        self.products = sorted(products, key=lambda p: p.product_id)
+        self.by_id: Dict[int, Product] = {}
+        self.by_name: Dict[str, Product] = {}
+        self.by_sku: Dict[str, Product] = {}
+        for product in self.products:
+            self._index(product)
+
+    def _index(self, product: Product):
+        self.by_id[product.product_id] = product
+        self.by_name.setdefault(product.name, product)
+        self.by_sku[product.sku] = product
+
+    def add(self, product: Product):
+        """Adds a product found after the catalogue was loaded."""
+        if product.product_id not in self.by_id:
+            self.products.append(product)
+            self._index(product)
+
+    def get(self, product_id: int) -> Optional[Product]:
+        return self.by_id.get(product_id)
+
+    def names(self) -> List[str]:
+        return [product.name for product in self.products]
+
+    def resolve_names(self, names: Iterable[str]):
+        """Returns (found, missing): products for known names and the names not in the catalogue."""
+        return self._resolve(self.by_name, names)
+
+    def resolve_skus(self, skus: Iterable[str]):
+        return self._resolve(self.by_sku, skus)
+
+    @staticmethod
+    def _resolve(index, keys):
+        found, missing = {}, []
+        for key in keys:
+            product = index.get(key)
+            if product is None:
+                missing.append(key)
+            else:
+                found[key] = product
+        return found, missing
@@ -0,0 +1,143 @@
+# services/reorder_engine.py
+
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from domain.domain_models import Product, Order, OrderItem, OrderStatus
+
+# Drafts order enough to bring stock (plus what is already on order) up to
+# this multiple of the reorder level
+ORDER_UP_TO_FACTOR = 2
+
+# Expected delivery date of a draft, in days after the order date
+DEFAULT_LEAD_TIME_DAYS = 7
+
+@dataclass
+class ReorderDrafts:
+    orders: List[Order] = field(default_factory=list)
+    # Low stock products with no supplier to order from (never ordered before)
+    unassigned: List[Product] = field(default_factory=list)
+
+class ReorderEngine:
+    """
+    Stock level and reorder level per product, with the set of products at
+    or below their reorder level kept current as stock changes.
+
+    Built from one grouped stock query; after that sales, batch edits and
+    goods receipts are applied as quantity deltas, each of which updates the
+    product's membership in the low stock set in O(1). The set is a dict so
+    it keeps insertion order and its size is available without a scan.
+
+    The engine keeps copies of the products it is given and hands out
+    copies, so the catalogue they came from is never changed through it.
+    """
+    def __init__(self, products: Iterable[Product], stock: Dict[int, int]):
+        self._products: Dict[int, Product] = {}
+        self._stock: Dict[int, int] = {}
+        self._low: Dict[int, None] = {}
+        for product in products:
+            self._products[product.product_id] = replace(product)
+            self._stock[product.product_id] = stock.get(product.product_id, 0)
+            self._update(product.product_id)
+
+    def _update(self, product_id: int):
+        product = self._products.get(product_id)
+        if product is not None and self._stock[product_id] <= product.reorder_level:
+            self._low[product_id] = None
+        else:
+            self._low.pop(product_id, None)
+
+    def adjust(self, product_id: int, delta: int):
+        """Applies a stock change, e.g. -3 for a sale of three units."""
+        if product_id not in self._products:
+            return
+        self._stock[product_id] = max(self._stock[product_id] + delta, 0)
+        self._update(product_id)
+
+    def set_stock(self, product_id: int, quantity: int):
+        if product_id in self._products:
+            self._stock[product_id] = quantity
+            self._update(product_id)
+
+    def put_product(self, product: Product):
+        """Adds a product or takes over a changed reorder level."""
+        self._products[product.product_id] = replace(product)
+        self._stock.setdefault(product.product_id, 0)
+        self._update(product.product_id)
+
+    def set_reorder_levels(self, levels: Dict[int, int]):
+        """Takes over new reorder levels, e.g. from a demand forecast."""
+        for product_id, level in levels.items():
+            product = self._products.get(product_id)
+            if product is not None:
+                product.reorder_level = level
+                self._update(product_id)
+
+    def remove_product(self, product_id: int):
+        self._products.pop(product_id, None)
+        self._stock.pop(product_id, None)
+        self._low.pop(product_id, None)
+
+    def stock(self, product_id: int) -> int:
+        return self._stock.get(product_id, 0)
+
+    def is_low(self, product_id: int) -> bool:
+        return product_id in self._low
+
+    def low_stock_count(self) -> int:
+        return len(self._low)
+
+    def low_stock_products(self) -> List[Product]:
+        """Products at or below their reorder level, with total_quantity set."""
+        return [
+            replace(self._products[product_id], total_quantity=self._stock[product_id])
+            for product_id in self._low
+        ]
+
+    def order_quantity(self, product_id: int, on_order: int = 0) -> int:
+        """Units to order so stock plus open orders reaches ORDER_UP_TO_FACTOR x the reorder level."""
+        target = ORDER_UP_TO_FACTOR * max(self._products[product_id].reorder_level, 1)
+        return max(target - self._stock[product_id] - on_order, 0)
+
+    def draft_orders(self, suppliers: Dict[int, int], on_order: Dict[int, int],
+                     order_date: Optional[date] = None,
+                     lead_time_days: int = DEFAULT_LEAD_TIME_DAYS) -> ReorderDrafts:
+        """
+        Pending orders, one per supplier, covering every low stock product
+        that is not already covered by open orders. suppliers maps product id
+        to the supplier to order it from; lines are priced at the current
+        unit price. Nothing is saved.
+        """
+        order_date = order_date or date.today()
+        drafts = ReorderDrafts()
+        items_by_supplier: Dict[int, List[OrderItem]] = {}
+        for product_id in self._low:
+            quantity = self.order_quantity(product_id, on_order.get(product_id, 0))
+            if quantity <= 0:
+                continue
+            product = replace(self._products[product_id], total_quantity=self._stock[product_id])
+            supplier_id = suppliers.get(product_id)
+            if supplier_id is None:
+                drafts.unassigned.append(product)
+                continue
+            items_by_supplier.setdefault(supplier_id, []).append(OrderItem(
+                order_item_id=None,
+                order_id=None,
+                product_id=product_id,
+                quantity=quantity,
+                cost_per_unit=product.unit_price,
+                product=product,
+            ))
+
+        for supplier_id, items in sorted(items_by_supplier.items()):
+            drafts.orders.append(Order(
+                order_id=None,
+                supplier_id=supplier_id,
+                order_date=order_date,
+                expected_delivery_date=order_date + timedelta(days=lead_time_days),
+                items=items,
+                total_cost=sum(item.quantity * item.cost_per_unit for item in items),
+                status=OrderStatus.Pending,
+            ))
+        return drafts
@@ -0,0 +1,144 @@
+# services/reporting.py
+
+import heapq
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Iterator, List, Tuple
+
+# Number of individual entries shown in a report chart. Everything past the
+# top entries is folded into a single "Other" entry, so the number of artists
+# matplotlib draws stays bounded regardless of catalogue size.
+CHART_TOP_N = 15
+OTHER_LABEL = "Other"
+
+SALES_REPORT = "Sales Report"
+INVENTORY_STATUS = "Inventory Status"
+EXPIRY_WRITE_OFF = "Expiry Write-off"
+
+@dataclass
+class ReportData:
+    report_type: str
+    start_date: date
+    end_date: date
+    rows: list = field(default_factory=list)
+    product_names: Dict[int, str] = field(default_factory=dict)
+    total_sales: float = 0.0
+    # Stock value of the batches in an expiry write-off report
+    total_value: float = 0.0
+    unit_prices: Dict[int, float] = field(default_factory=dict)
+    chart_labels: List[str] = field(default_factory=list)
+    chart_values: List[float] = field(default_factory=list)
+
+def top_n_with_other(data: Dict[str, float], n: int = CHART_TOP_N, other_label: str = OTHER_LABEL) -> Tuple[List[str], List[float]]:
+    """
+    Reduces a label -> value mapping to its n largest entries, in descending
+    order, plus one entry holding the sum of the rest.
+
+    :param data: Values to aggregate, keyed by label.
+    :param n: Number of entries to keep individually.
+    :return: Tuple of (labels, values).
+    """
+    if len(data) <= n:
+        top = sorted(data.items(), key=lambda kv: kv[1], reverse=True)
+        return [label for label, _ in top], [value for _, value in top]
+
+    top = heapq.nlargest(n, data.items(), key=lambda kv: kv[1])
+    labels = [label for label, _ in top]
+    values = [value for _, value in top]
+    rest = sum(data.values()) - sum(values)
+    if rest > 0:
+        labels.append(other_label)
+        values.append(rest)
+    return labels, values
+
+def prepare_report(inventory_service, report_type: str, start_date: date, end_date: date) -> ReportData:
+    """
+    Fetches and aggregates everything a report needs. Runs on a worker thread,
+    so it must not touch any widgets.
+    """
+    report = ReportData(report_type=report_type, start_date=start_date, end_date=end_date)
+    products = inventory_service.get_all_products()
+    report.product_names = {product.product_id: product.name for product in products}
+
+    if report_type == SALES_REPORT:
+        # One row per product and day from the rollup, however many sales
+        report.rows = inventory_service.get_daily_sales(start_date, end_date)
+        sales_by_product: Dict[str, float] = {}
+        for day in report.rows:
+            product_name = report.product_names.get(day.product_id) or "Unnamed Product"
+            sales_by_product[product_name] = sales_by_product.get(product_name, 0.0) + day.revenue
+            report.total_sales += day.revenue
+        report.chart_labels, report.chart_values = top_n_with_other(sales_by_product)
+
+    elif report_type == INVENTORY_STATUS:
+        report.rows = inventory_service.get_inventory_status()
+        inventory_distribution: Dict[str, float] = {}
+        for product in report.rows:
+            product_name = product.name if product.name else "Unnamed Product"
+            inventory_distribution[product_name] = inventory_distribution.get(product_name, 0) + product.total_quantity
+        report.chart_labels, report.chart_values = top_n_with_other(inventory_distribution)
+
+    elif report_type == EXPIRY_WRITE_OFF:
+        # Stock on batches expiring in the range, valued at the current price
+        report.rows = inventory_service.get_batches_expiring_between(start_date, end_date)
+        report.unit_prices = {product.product_id: product.unit_price for product in products}
+        value_by_product: Dict[str, float] = {}
+        for batch in report.rows:
+            product_name = report.product_names.get(batch.product_id) or "Unnamed Product"
+            value = batch.quantity * report.unit_prices.get(batch.product_id, 0.0)
+            value_by_product[product_name] = value_by_product.get(product_name, 0.0) + value
+            report.total_value += value
+        report.chart_labels, report.chart_values = top_n_with_other(value_by_product)
+
+    return report
+
+def iter_report_lines(report: ReportData) -> Iterator[str]:
+    """
+    Yields the text of a report one line at a time, so the view can render
+    it incrementally without the whole report ever existing as one string.
+    """
+    if report.report_type == SALES_REPORT:
+        yield f"Sales Report from {report.start_date} to {report.end_date}"
+        yield f"Total Sales: {report.total_sales:.2f}"
+        yield ""
+        yield "Daily Sales:"
+        for day in report.rows:
+            product_name = report.product_names.get(day.product_id) or "Unnamed Product"
+            yield (
+                f"Date: {day.sale_date}, "
+                f"Product: {product_name}, "
+                f"Quantity: {day.quantity}, "
+                f"Revenue: {day.revenue:.2f}"
+            )
+
+    elif report.report_type == INVENTORY_STATUS:
+        yield f"Inventory Status as of {report.end_date}"
+        yield ""
+        yield "Products:"
+        for product in report.rows:
+            product_name = product.name if product.name else "Unnamed Product"
+            yield (
+                f"Product ID: {product.product_id}, "
+                f"SKU: {product.sku}, "
+                f"Name: {product_name}, "
+                f"Quantity: {product.total_quantity}, "
+                f"Reorder Level: {product.reorder_level}"
+            )
+
+    elif report.report_type == EXPIRY_WRITE_OFF:
+        today = date.today()
+        yield f"Expiry Write-off from {report.start_date} to {report.end_date}"
+        yield f"Batches: {len(report.rows)}, Stock Value: {report.total_value:.2f}"
+        yield ""
+        yield "Batches:"
+        for batch in report.rows:
+            product_name = report.product_names.get(batch.product_id) or "Unnamed Product"
+            value = batch.quantity * report.unit_prices.get(batch.product_id, 0.0)
+            status = "Expired" if batch.expiry_date < today else "Expiring"
+            yield (
+                f"Batch ID: {batch.batch_id}, "
+                f"Product: {product_name}, "
+                f"Quantity: {batch.quantity}, "
+                f"Expiry Date: {batch.expiry_date} ({status}), "
+                f"Value: {value:.2f}"
+            )
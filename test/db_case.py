@@ -0,0 +1,40 @@
+# test/db_case.py
+
+import unittest
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from data.models import Base
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    A fresh in-memory SQLite database with the full schema for every test.
+    Repositories are opened on sessions of it, and the SQL sent to it can
+    be recorded to check how many statements an operation takes.
+    """
+    # Extra create_engine arguments, e.g. a StaticPool for threaded tests
+    engine_options = {}
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://", **self.engine_options)
+        Base.metadata.create_all(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.statements = []
+
+    def open_session(self) -> Session:
+        """A session on the test database, closed when the test ends."""
+        session = Session(self.engine)
+        self.addCleanup(session.close)
+        return session
+
+    def open_repo(self, repo_class):
+        return repo_class(self.open_session())
+
+    def record_statements(self):
+        """Starts appending every statement sent to the database to self.statements."""
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        self.addCleanup(event.remove, self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, *args):
+        self.statements.append(statement)
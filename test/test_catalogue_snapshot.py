@@ -0,0 +1,74 @@
+# test/test_catalogue_snapshot.py
+
+import os
+import tempfile
+import unittest
+
+from User.product_store import ProductStore
+from utils.catalogue_snapshot import (
+    CatalogueSnapshot, SnapshotError, SnapshotProducts, catalogue_rows_from_backup, write_snapshot
+)
+
+BACKUP = {
+    "products": [
+        {"product_id": 7, "name": "Crème", "unit_price": 6.0, "category": "Creams"},
+        {"product_id": 3, "name": "Aspirin", "unit_price": None, "category": "Tablets"},
+        {"product_id": 5, "name": "", "unit_price": 1.25, "category": "Tablets"},
+    ],
+    "batches": [
+        {"product_id": 3, "quantity": 10},
+        {"product_id": 3, "quantity": 2},
+        {"product_id": 7, "quantity": 4},
+    ],
+}
+
+class TestCatalogueSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "catalogue.snap")
+        self.rows = catalogue_rows_from_backup(BACKUP)
+        write_snapshot(self.rows, self.path)
+
+    def open(self):
+        snapshot = CatalogueSnapshot(self.path)
+        self.addCleanup(snapshot.close)
+        return snapshot
+
+    def test_round_trip(self):
+        snapshot = self.open()
+        self.assertEqual([snapshot.row(i) for i in range(len(snapshot))], [
+            (7, "Crème", 6.0, 4, "Creams"),
+            (3, "Aspirin", 0.0, 12, "Tablets"),
+            (5, "", 1.25, 0, "Tablets"),
+        ])
+        products = SnapshotProducts(snapshot, lambda *row: row)
+        self.assertEqual(products[-1], (5, "", 1.25, 0, "Tablets"))
+
+        store = ProductStore(products, snapshot=snapshot)
+        self.assertEqual(store.rows_in_id_range(3, 5).tolist(), [1, 2])
+        self.assertEqual(store.filter_rows(category="Tablets", name_substring="SPIR").tolist(), [1])
+
+    def test_corruption_and_version_are_detected(self):
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+        with self.assertRaisesRegex(SnapshotError, "checksum"):
+            CatalogueSnapshot(self.path)
+
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write((99).to_bytes(4, "little"))
+        with self.assertRaisesRegex(SnapshotError, "version"):
+            CatalogueSnapshot(self.path)
+
+    def test_empty_catalogue(self):
+        write_snapshot([], self.path)
+        snapshot = self.open()
+        self.assertEqual(len(snapshot), 0)
+        self.assertEqual(len(ProductStore(SnapshotProducts(snapshot, tuple), snapshot=snapshot).filter_rows(min_price=0)), 0)
+
+if __name__ == "__main__":
+    unittest.main()
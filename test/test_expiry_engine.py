@@ -0,0 +1,93 @@
+# test/test_expiry_engine.py
+
+import unittest
+from datetime import date, timedelta
+
+from data.models import Product, Batch
+from data.sqlalchemy_repositories import SQLAlchemyBatchRepository
+from domain.domain_models import Batch as DomainBatch
+from services.expiry_engine import EXPIRED, CRITICAL, WARNING, ExpiryCalendar
+from services.inventory_service import InventoryService
+from test.db_case import DatabaseTestCase
+
+TODAY = date(2026, 3, 1)
+
+def batch(batch_id, quantity, days):
+    return DomainBatch(batch_id=batch_id, product_id=1, quantity=quantity,
+                       manufacture_date=TODAY - timedelta(days=400), expiry_date=TODAY + timedelta(days=days))
+
+class TestExpiryCalendar(unittest.TestCase):
+    def setUp(self):
+        self.calendar = ExpiryCalendar(
+            [batch(1, 5, -10), batch(2, 3, 0), batch(3, 0, 2), batch(4, 7, 2), batch(5, 1, 20), batch(6, 9, 200)],
+            covers_until=TODAY + timedelta(days=90),
+        )
+
+    def ids(self, batches):
+        return [b.batch_id for b in batches]
+
+    def test_skips_sold_out_and_far_batches(self):
+        self.assertEqual(len(self.calendar), 4)
+        self.assertEqual(self.ids(self.calendar.between(None, TODAY + timedelta(days=90))), [1, 2, 4, 5])
+
+    def test_expired_and_expiring(self):
+        self.assertEqual(self.ids(self.calendar.expired(TODAY)), [1])
+        self.assertEqual(self.ids(self.calendar.expiring_within(7, TODAY)), [2, 4])
+        self.assertEqual(self.ids(self.calendar.expiring_within(30, TODAY)), [2, 4, 5])
+
+    def test_put_moves_and_removes_batches(self):
+        self.calendar.put(batch(4, 7, 40))     # Expiry corrected
+        self.calendar.put(batch(2, 0, 0))      # Sold out
+        self.calendar.put(batch(7, 2, -1))     # New, already expired
+        self.calendar.discard(5)
+        self.assertEqual(self.ids(self.calendar.expired(TODAY)), [1, 7])
+        self.assertEqual(self.ids(self.calendar.expiring_within(30, TODAY)), [])
+        self.assertEqual(self.ids(self.calendar.expiring_within(60, TODAY)), [4])
+
+    def test_alerts(self):
+        alerts = self.calendar.alerts(TODAY)
+        self.assertEqual([(a.level, a.batch_count, a.quantity) for a in alerts],
+                         [(EXPIRED, 1, 5), (CRITICAL, 2, 10), (WARNING, 1, 1)])
+
+class TestExpiryQueries(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo = self.open_repo(SQLAlchemyBatchRepository)
+        self.repo.session.add(Product(product_id=1, sku="P1", name="P1", category="DT", unit_price=2.0, reorder_level=1))
+        self.repo.session.add_all([
+            Batch(batch_id=i, product_id=1, quantity=i % 3, manufacture_date=TODAY - timedelta(days=400),
+                  expiry_date=date.today() + timedelta(days=i - 50))
+            for i in range(1, 301)
+        ])
+        self.repo.session.commit()
+        self.service = InventoryService(None, self.repo, None, None, None)
+        self.record_statements()
+
+    def test_query_uses_the_partial_index(self):
+        with self.engine.connect() as conn:
+            plan = conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT batch_id FROM batches WHERE quantity > 0 AND expiry_date <= '2030-01-01'"
+            ).fetchall()
+        self.assertIn("ix_batches_expiry_in_stock", str(plan))
+
+    def test_service_answers_from_the_calendar(self):
+        expired = self.service.get_expired_batches()
+        self.assertEqual([b.batch_id for b in expired], [i for i in range(1, 50) if i % 3])
+        self.assertEqual(len(self.service.get_batches_expiring_within(30)), 21)
+        self.service.get_expiry_alerts()
+        self.assertEqual(len(self.statements), 1)
+
+        # Batch edits through the service keep the calendar current
+        self.service.update_batch(DomainBatch(batch_id=1, product_id=1, quantity=0,
+                                              manufacture_date=TODAY, expiry_date=date.today()))
+        self.statements.clear()
+        self.assertNotIn(1, [b.batch_id for b in self.service.get_expired_batches()])
+        self.assertEqual(self.statements, [])
+
+        # Beyond the horizon the database answers
+        far = self.service.get_batches_expiring_between(date.today() + timedelta(days=200), date.today() + timedelta(days=300))
+        self.assertEqual(len(far), 34)
+        self.assertEqual(len(self.statements), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+# test/test_export_service.py
+
+import csv
+import gzip
+import os
+import struct
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from datetime import date
+
+from data.models import Product, Batch, SaleRecord
+from data.report_queries import sales_query, inventory_status_query, expiry_query
+from services.export_service import export_report, read_columnar, CSV, COLUMNAR, _INT32, _UINT32, _pack, _unpack
+from test.db_case import DatabaseTestCase
+
+class TestExportService(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.session = self.open_session()
+        self.session.add_all([
+            Product(product_id=1, sku="A1", name="Aspirin", category="DT", unit_price=2.5, reorder_level=10),
+            Product(product_id=2, sku="B2", name="Bandage, large", category="DT", unit_price=1.0, reorder_level=5),
+            Batch(batch_id=1, product_id=1, quantity=30, manufacture_date=date(2024, 1, 1), expiry_date=date(2025, 1, 1)),
+            Batch(batch_id=2, product_id=1, quantity=0, manufacture_date=date(2024, 1, 1), expiry_date=date(2024, 6, 1)),
+        ])
+        self.session.add_all([
+            SaleRecord(sale_id=i, product_id=1 + i % 2, quantity_sold=i, sale_date=date(2024, 3, 1 + i % 28), unit_price_at_sale=2.0)
+            for i in range(1, 101)
+        ])
+        self.session.commit()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_csv_export_streams_in_batches(self):
+        path = os.path.join(self.tmpdir.name, "sales.csv")
+        progress = []
+        result = export_report(
+            self.session, sales_query(self.session), path, fmt=CSV, batch_size=30,
+            progress_callback=lambda written, total: progress.append((written, total))
+        )
+        self.assertEqual(result.rows, 100)
+        self.assertEqual(progress, [(30, 100), (60, 100), (90, 100), (100, 100)])
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][:3], ["sale_id", "sale_date", "product_id"])
+        self.assertEqual(rows[2], ["2", "2024-03-03", "1", "A1", "Aspirin", "2", "2.0", "4.0"])
+
+    def test_columnar_gzip_round_trip(self):
+        path = os.path.join(self.tmpdir.name, "sales.gcol.gz")
+        export_report(self.session, sales_query(self.session, date(2024, 3, 1), date(2024, 3, 10)), path,
+                      fmt=COLUMNAR, compress=True, batch_size=7)
+        with gzip.open(path, "rb") as f:
+            columns, groups = read_columnar(f)
+            rows = {name: [] for name, _ in columns}
+            for group in groups:
+                for name, values in group.items():
+                    rows[name].extend(values)
+        self.assertEqual(len(rows["sale_id"]), 39)
+        self.assertTrue(all(date(2024, 3, 1) <= d <= date(2024, 3, 10) for d in rows["sale_date"]))
+        self.assertEqual(rows["name"][:2], ["Bandage, large", "Aspirin"])
+
+    def test_arrays_are_little_endian_on_any_host(self):
+        self.assertEqual(_pack(_INT32, [1, -2]), struct.pack("<2i", 1, -2))
+        self.assertEqual(_pack(_UINT32, [7]), struct.pack("<I", 7))
+        self.assertEqual(_pack("q", [2**40]), struct.pack("<q", 2**40))
+        # On a big-endian host the values are swapped on the way out and back in
+        other = "little" if sys.byteorder == "big" else "big"
+        with mock.patch.object(sys, "byteorder", other):
+            swapped = _pack(_INT32, [1])
+            self.assertEqual(_unpack(_INT32, swapped).tolist(), [1])
+        self.assertEqual(swapped, struct.pack(">i", 1) if other == "big" else struct.pack("<i", 1))
+
+    def test_inventory_and_expiry_queries(self):
+        inventory = self.session.execute(inventory_status_query(self.session).statement).all()
+        self.assertEqual([(r.product_id, r.total_quantity) for r in inventory], [(1, 30), (2, 0)])
+        expiry = self.session.execute(expiry_query(self.session).statement).all()
+        self.assertEqual([r.batch_id for r in expiry], [1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+# test/test_forecasting.py
+
+import unittest
+from datetime import date, timedelta
+
+import numpy as np
+from data.models import Product, SaleRecord
+from data.sales_rollup import rebuild_sales_rollup
+from data.sqlalchemy_repositories import SQLAlchemyProductRepository, SQLAlchemySaleRecordRepository
+from services.forecasting import build_demand_matrix, forecast_demand, smoothing_weights
+from services.inventory_service import InventoryService
+from test.db_case import DatabaseTestCase
+
+TODAY = date(2026, 3, 1)
+
+class TestForecastMath(unittest.TestCase):
+    def test_matrix_sums_rows_and_drops_unknown(self):
+        start = TODAY - timedelta(days=4)
+        rows = [(2, start, 3), (2, start, 1), (1, TODAY, 5), (9, TODAY, 7), (1, TODAY + timedelta(days=1), 4)]
+        matrix = build_demand_matrix(rows, [2, 1, 3], start, TODAY)
+        self.assertEqual(matrix.product_ids.tolist(), [1, 2, 3])
+        self.assertEqual(matrix.quantities.tolist(), [[0, 0, 0, 0, 5], [4, 0, 0, 0, 0], [0, 0, 0, 0, 0]])
+
+    def test_smoothing_matches_the_recursion(self):
+        rng = np.random.default_rng(1)
+        x = rng.poisson(4, size=(3, 50)).astype(np.float32)
+        level = x[:, 0].astype(np.float64)
+        for t in range(1, 50):
+            level = 0.2 * x[:, t] + 0.8 * level
+        np.testing.assert_allclose(x @ smoothing_weights(50, 0.2), level, rtol=1e-5)
+
+    def test_forecast_ignores_days_before_the_first_sale(self):
+        days = 100
+        quantities = np.zeros((3, days), dtype=np.float32)
+        quantities[0, :] = 4                     # Steady seller
+        quantities[1, 90:] = [2, 6] * 5          # New product, noisy
+        matrix = build_demand_matrix([], [1, 2, 3], TODAY, TODAY + timedelta(days=days - 1))
+        matrix.quantities[:] = quantities
+        forecast = forecast_demand(matrix, window=28, lead_time_days=7, z=1.65)
+
+        np.testing.assert_allclose(forecast.moving_average[:2], [4.0, 4.0])
+        np.testing.assert_allclose(forecast.daily_std[:2], [0.0, np.std([2, 6] * 5, ddof=1)], rtol=1e-6)
+        self.assertEqual(forecast.reorder_levels[0], 28)
+        self.assertEqual(forecast.has_history.tolist(), [True, True, False])
+
+        # Smoothed over its ten days only: the weighted average of those days
+        recent_first = [6, 2] * 5
+        level = sum(0.1 * 0.9 ** k * q for k, q in enumerate(recent_first)) / (1 - 0.9 ** 10)
+        self.assertAlmostEqual(level, 4.1053, places=4)
+        self.assertAlmostEqual(forecast.smoothed[1], level, places=4)
+        # ceil(4.1053 * 7 + 1.65 * 2.1082 * sqrt(7)) = ceil(37.94)
+        self.assertEqual(forecast.reorder_levels[1], 38)
+        self.assertEqual(forecast.suggestions({1: 28, 2: 0, 3: 5}), {2: 38})
+
+class TestForecastService(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product_repo = self.open_repo(SQLAlchemyProductRepository)
+        self.sale_repo = self.open_repo(SQLAlchemySaleRecordRepository)
+        session = self.open_session()
+        session.add_all([
+            Product(product_id=i, sku=f"SKU{i}", name=f"Product {i}", category="DT", unit_price=1.0, reorder_level=1)
+            for i in range(1, 301)
+        ])
+        # Product i sells i units every day, in two sales
+        session.add_all([
+            SaleRecord(product_id=i, quantity_sold=units, sale_date=TODAY - timedelta(days=d), unit_price_at_sale=1.0)
+            for i in range(1, 301, 7) for d in range(1, 61) for units in (i // 2, i - i // 2)
+        ])
+        session.commit()
+        rebuild_sales_rollup(session)
+        session.close()
+        self.service = InventoryService(self.product_repo, None, self.sale_repo, None, None)
+        self.record_statements()
+
+    def test_levels_are_forecast_and_written_in_bulk(self):
+        levels = self.service.suggest_reorder_levels(history_days=60, today=TODAY)
+        self.assertEqual(len(self.statements), 2)  # Catalogue and grouped daily sales
+        # Steady demand: lead time demand, no safety stock
+        self.assertEqual(levels, {i: 7 * i for i in range(1, 301, 7) if 7 * i != 1})
+
+        self.statements.clear()
+        self.service.update_reorder_levels(levels)
+        updates = [s for s in self.statements if s.startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertIn("FROM (VALUES", updates[0])
+        self.assertEqual(self.service.get_product_by_id(8).reorder_level, 56)
+        self.assertEqual(self.service.get_product_by_id(2).reorder_level, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# test/test_import_time.py
+
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must not be loaded just to show the login window.
+DEFERRED_MODULES = [
+    "matplotlib",
+    "tkinter",
+    "win32print",
+    "sqlalchemy",
+    "UI.main_window",
+    "UI.reports",
+]
+
+# Cumulative import budget for login_window in microseconds. It measures
+# around 80 ms on a development machine; the budget leaves room for slower
+# tills but fails if a heavy dependency creeps back into the startup path.
+LOGIN_IMPORT_BUDGET_US = 400_000
+
+
+def import_times(statement):
+    """
+    Runs the statement in a fresh interpreter with -X importtime and returns
+    a dict of module name -> cumulative import time in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+@unittest.skipUnless(importlib.util.find_spec("PyQt6"), "PyQt6 is not installed")
+class TestImportTime(unittest.TestCase):
+    def setUp(self):
+        self.times = import_times("import login_window")
+
+    def test_heavy_modules_are_deferred(self):
+        loaded = [name for name in DEFERRED_MODULES if name in self.times]
+        self.assertEqual(loaded, [], f"Loaded at login: {loaded}")
+
+    def test_login_import_budget(self):
+        self.assertLess(self.times["login_window"], LOGIN_IMPORT_BUDGET_US)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# test/test_live_source.py
+
+import unittest
+from datetime import date, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.pool import StaticPool
+
+from data.change_log import install_change_log, prune_change_log
+from data.models import Product, Batch, CatalogueChange
+from User.live_source import LiveCatalogueSource
+from test.db_case import DatabaseTestCase
+
+class TestLiveCatalogueSource(DatabaseTestCase):
+    engine_options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+
+    def setUp(self):
+        super().setUp()
+        install_change_log(self.engine)
+        self.session = self.open_session()
+        self.session.add_all([
+            Product(product_id=1, sku="A1", name="Aspirin", category="DT", unit_price=2.5, reorder_level=10),
+            Product(product_id=2, sku="B2", name="Bandage", category="DT", unit_price=1.0, reorder_level=5),
+            Batch(batch_id=1, product_id=1, quantity=30, manufacture_date=date(2024, 1, 1), expiry_date=date(2025, 1, 1)),
+            Batch(batch_id=2, product_id=1, quantity=5, manufacture_date=date(2024, 1, 1), expiry_date=date(2025, 6, 1)),
+        ])
+        self.session.commit()
+        self.source = LiveCatalogueSource(self.engine)
+
+    def test_initial_load_aggregates_stock(self):
+        self.assertEqual(self.source.load(), [(1, "Aspirin", 2.5, 35, "DT"), (2, "Bandage", 1.0, 0, "DT")])
+        self.assertIsNone(self.source.poll())
+
+    def test_poll_returns_only_changed_products(self):
+        self.source.load()
+        self.session.execute(update(Batch).where(Batch.batch_id == 1).values(quantity=20))
+        self.session.add(Product(product_id=3, sku="C3", name="Cream", category="CR", unit_price=4.0, reorder_level=1))
+        self.session.commit()
+
+        delta = self.source.poll()
+        self.assertFalse(delta.full)
+        self.assertEqual(sorted(delta.rows), [(1, "Aspirin", 2.5, 25, "DT"), (3, "Cream", 4.0, 0, "CR")])
+        self.assertEqual(delta.deleted_ids, [])
+        self.assertIsNone(self.source.poll())
+
+        self.session.delete(self.session.get(Product, 2))
+        self.session.commit()
+        delta = self.source.poll()
+        self.assertEqual((delta.rows, delta.deleted_ids), ([], [2]))
+
+    def test_late_commit_below_the_newest_id_is_not_missed(self):
+        self.source.load()
+        start = self.source.last_change_id
+        # Id start + 1 taken by a transaction that commits after start + 2
+        self.session.add(CatalogueChange(change_id=start + 2, product_id=1))
+        self.session.commit()
+        delta = self.source.poll()
+        self.assertFalse(delta.full)
+        self.assertEqual([row[0] for row in delta.rows], [1])
+
+        self.session.add(CatalogueChange(change_id=start + 1, product_id=2))
+        self.session.commit()
+        delta = self.source.poll()
+        self.assertFalse(delta.full)
+        self.assertEqual([row[0] for row in delta.rows], [2])
+        self.assertIsNone(self.source.poll())
+
+    def test_gap_in_ids_is_not_taken_for_a_prune(self):
+        self.source.load()
+        self.session.add(CatalogueChange(change_id=self.source.last_change_id + 50, product_id=2))
+        self.session.commit()
+        self.assertFalse(self.source.poll().full)
+        self.assertIsNone(self.source.poll())
+
+    def test_pruned_log_forces_full_reload(self):
+        self.source.load()
+        self.session.execute(update(Product).values(unit_price=3.0))
+        self.session.commit()
+        prune_change_log(self.session, keep=timedelta(days=-1))
+        self.session.execute(update(Product).where(Product.product_id == 2).values(unit_price=9.0))
+        self.session.commit()
+        delta = self.source.poll()
+        self.assertTrue(delta.full)
+        self.assertEqual([row[2] for row in delta.rows], [3.0, 9.0])
+        self.assertIsNone(self.source.poll())
+
+class TestWithoutChangeLog(DatabaseTestCase):
+    engine_options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+
+    def setUp(self):
+        super().setUp()
+        CatalogueChange.__table__.drop(self.engine)
+        self.session = self.open_session()
+        self.session.add_all([
+            Product(product_id=1, sku="A1", name="Aspirin", category="DT", unit_price=2.5, reorder_level=10),
+            Batch(batch_id=1, product_id=1, quantity=30, manufacture_date=date(2024, 1, 1), expiry_date=date(2025, 1, 1)),
+        ])
+        self.session.commit()
+        self.source = LiveCatalogueSource(self.engine)
+
+    def test_poll_reloads_only_when_the_fingerprint_moves(self):
+        self.source.load()
+        self.assertIsNone(self.source.poll())
+
+        self.session.execute(update(Batch).values(quantity=12))
+        self.session.commit()
+        delta = self.source.poll()
+        self.assertTrue(delta.full)
+        self.assertEqual(delta.rows, [(1, "Aspirin", 2.5, 12, "DT")])
+        self.assertIsNone(self.source.poll())
+
+    def test_prune_without_a_change_log(self):
+        self.assertEqual(prune_change_log(self.session), 0)
+
+if __name__ == "__main__":
+    unittest.main()
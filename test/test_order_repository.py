@@ -0,0 +1,146 @@
+# test/test_order_repository.py
+
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+from data.models import Product, Supplier, Order, OrderItem, OrderStatus, Batch
+from data.sqlalchemy_repositories import SQLAlchemyOrderRepository
+from domain.domain_models import (
+    Order as DomainOrder, OrderItem as DomainOrderItem, OrderStatus as DomainOrderStatus, ReceiptLine
+)
+from test.db_case import DatabaseTestCase
+
+class TestOrderRepository(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo = self.open_repo(SQLAlchemyOrderRepository)
+        self.record_statements()
+
+    def seed(self, order_count):
+        session = self.repo.session
+        session.add_all([Supplier(supplier_id=i, name=f"Supplier {i}") for i in range(1, 4)])
+        session.add_all([
+            Product(product_id=i, sku=f"SKU{i}", name=f"Product {i}", category="DT", unit_price=1.0, reorder_level=1)
+            for i in range(1, 6)
+        ])
+        statuses = list(OrderStatus)
+        for i in range(1, order_count + 1):
+            session.add(Order(
+                order_id=i, supplier_id=i % 3 + 1, order_date=date(2024, 1, 1) + timedelta(days=i),
+                expected_delivery_date=date(2024, 3, 1), total_cost=30.0, status=statuses[i % 3],
+                items=[OrderItem(product_id=p, quantity=10, cost_per_unit=1.0) for p in (1, 2, 3)],
+            ))
+        session.commit()
+        session.expunge_all()
+
+    def count_queries(self, func):
+        self.statements.clear()
+        result = func()
+        return result, len(self.statements)
+
+    def test_query_count_does_not_grow_with_orders(self):
+        counts = []
+        for order_count in (5, 60):
+            self.repo.session.execute(OrderItem.__table__.delete())
+            self.repo.session.execute(Order.__table__.delete())
+            self.repo.session.execute(Product.__table__.delete())
+            self.repo.session.execute(Supplier.__table__.delete())
+            self.seed(order_count)
+            orders, queries = self.count_queries(self.repo.get_all_orders)
+            self.assertEqual(len(orders), order_count)
+            counts.append(queries)
+        self.assertEqual(counts, [2, 2])
+
+        order = orders[0]
+        self.assertEqual(order.order_id, 60)  # newest first
+        self.assertEqual(order.supplier.name, "Supplier 1")
+        self.assertEqual([item.product.name for item in order.items], ["Product 1", "Product 2", "Product 3"])
+        self.assertIsInstance(order.status, DomainOrderStatus)
+
+    def test_filters_and_pagination(self):
+        self.seed(30)
+        pending = DomainOrderStatus.Pending
+        self.assertEqual(self.repo.count_orders(status=pending), 10)
+        first = self.repo.get_orders(status=pending, limit=4)
+        second = self.repo.get_orders(status=pending, limit=4, offset=4)
+        self.assertEqual([o.order_id for o in first], [30, 27, 24, 21])
+        self.assertEqual([o.order_id for o in second], [18, 15, 12, 9])
+
+        in_range = self.repo.get_orders(start_date=date(2024, 1, 6), end_date=date(2024, 1, 8))
+        self.assertEqual([o.order_id for o in in_range], [7, 6, 5])
+        self.assertEqual(self.repo.count_orders(supplier_id=2, end_date=date(2024, 1, 8)), 3)
+
+    def test_update_writes_only_changed_lines(self):
+        self.seed(0)
+        order = self.repo.add_order(DomainOrder(
+            order_id=None, supplier_id=1, order_date=date(2024, 2, 1), expected_delivery_date=date(2024, 3, 1),
+            items=[DomainOrderItem(None, None, product_id=i % 5 + 1, quantity=i, cost_per_unit=1.0) for i in range(300)],
+            total_cost=0.0, status=DomainOrderStatus.Pending,
+        ))
+        stored = self.repo.get_order_by_id(order.order_id)
+        original_ids = [item.order_item_id for item in stored.items]
+        self.assertEqual(original_ids, [item.order_item_id for item in order.items])
+
+        # Change every tenth line, drop the last 50 and add two new ones;
+        # new lines and re-added ones come without ids, as from the dialog
+        items = stored.items[:250]
+        for item in items[::10]:
+            item.quantity += 1000
+        items.append(DomainOrderItem(None, order.order_id, product_id=5, quantity=7, cost_per_unit=2.0))
+        items.append(DomainOrderItem(None, order.order_id, product_id=1, quantity=8, cost_per_unit=2.0))
+        stored.items = items
+        stored.status = DomainOrderStatus.Shipped
+
+        _, queries = self.count_queries(lambda: self.repo.update_order(stored))
+        # read lines, header, delete, batched update, batched insert
+        self.assertLessEqual(queries, 5)
+
+        updated = self.repo.get_order_by_id(order.order_id)
+        self.assertEqual(updated.status, DomainOrderStatus.Shipped)
+        self.assertEqual(len(updated.items), 252)
+        self.assertEqual([item.order_item_id for item in updated.items[:250]], original_ids[:250])
+        self.assertEqual(updated.items[10].quantity, 1010)
+        self.assertEqual(updated.items[11].quantity, 11)
+        # The new lines reuse two of the dropped rows of the same products
+        self.assertEqual(sorted((i.product_id, i.quantity) for i in updated.items[250:]), [(1, 8), (5, 7)])
+        self.assertTrue(set(i.order_item_id for i in updated.items[250:]) <= set(original_ids[250:]))
+
+    def test_receive_order_inserts_batches_in_one_transaction(self):
+        self.seed(0)
+        order = self.repo.add_order(DomainOrder(
+            order_id=None, supplier_id=1, order_date=date(2024, 2, 1), expected_delivery_date=date(2024, 3, 1),
+            items=[DomainOrderItem(None, None, product_id=p, quantity=100, cost_per_unit=1.0) for p in range(1, 6)],
+            total_cost=500.0, status=DomainOrderStatus.Shipped,
+        ))
+        lines = [
+            ReceiptLine(product_id=i % 5 + 1, quantity=10, manufacture_date=date(2024, 1, 1),
+                        expiry_date=date(2025, 1, 1) + timedelta(days=i))
+            for i in range(500)
+        ]
+        with mock.patch.object(self.repo.session, "commit", wraps=self.repo.session.commit) as commit:
+            receipt, queries = self.count_queries(lambda: self.repo.receive_order(order.order_id, lines))
+
+        self.assertEqual(commit.call_count, 1)
+        self.assertLessEqual(queries, 4)
+        self.assertEqual(receipt.batch_count, 500)
+        self.assertEqual(receipt.received, {p: 1000 for p in range(1, 6)})
+        self.assertEqual(self.repo.session.query(Batch).count(), 500)
+        self.assertEqual(self.repo.session.query(Batch).filter(Batch.product_id == 4).order_by(Batch.expiry_date)
+                         .first().expiry_date, date(2025, 1, 4))
+        self.assertEqual(self.repo.get_order_by_id(order.order_id).status, DomainOrderStatus.Delivered)
+
+        with self.assertRaises(ValueError):
+            self.repo.receive_order(order.order_id, lines[:1])
+
+    def test_receive_order_rejects_foreign_lines(self):
+        self.seed(2)
+        bad = ReceiptLine(product_id=4, quantity=1, manufacture_date=date(2024, 1, 1), expiry_date=date(2025, 1, 1))
+        good = ReceiptLine(product_id=1, quantity=1, manufacture_date=date(2024, 1, 1), expiry_date=date(2025, 1, 1))
+        with self.assertRaises(ValueError):
+            self.repo.receive_order(1, [good, bad])
+        self.assertEqual(self.repo.session.query(Batch).count(), 0)
+        self.assertNotEqual(self.repo.get_order_by_id(1).status, DomainOrderStatus.Delivered)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+# test/test_passwords.py
+
+import hashlib
+import unittest
+
+from utils import passwords
+from utils.passwords import (
+    ScryptHasher, Pbkdf2Hasher, hash_password, verify_password, password_pool, is_legacy_hash
+)
+
+
+class TestPasswords(unittest.TestCase):
+    def setUp(self):
+        # Cheap costs keep the tests fast; the format is the same
+        self.previous = passwords.get_hasher()
+        passwords.set_hasher(ScryptHasher(n=2 ** 10, r=8, p=1))
+        self.addCleanup(passwords.set_hasher, self.previous)
+
+    def test_hash_is_salted_and_verifies(self):
+        first, second = hash_password("s3cret"), hash_password("s3cret")
+        self.assertNotEqual(first, second)
+        self.assertTrue(first.startswith("scrypt$n=1024,r=8,p=1$"))
+        self.assertEqual(verify_password("s3cret", first), (True, None))
+        self.assertEqual(verify_password("wrong", first), (False, None))
+
+    def test_legacy_sha256_is_rehashed(self):
+        legacy = hashlib.sha256(b"s3cret").hexdigest()
+        self.assertTrue(is_legacy_hash(legacy))
+        self.assertEqual(verify_password("wrong", legacy), (False, None))
+        matches, new_hash = verify_password("s3cret", legacy)
+        self.assertTrue(matches)
+        self.assertEqual(verify_password("s3cret", new_hash), (True, None))
+
+    def test_changed_cost_or_algorithm_is_rehashed(self):
+        old = ScryptHasher(n=2 ** 11, r=8, p=1).hash("s3cret")
+        matches, new_hash = verify_password("s3cret", old)
+        self.assertTrue(matches)
+        self.assertTrue(new_hash.startswith("scrypt$n=1024,"))
+
+        other = Pbkdf2Hasher(iterations=1000).hash("s3cret")
+        matches, new_hash = verify_password("s3cret", other)
+        self.assertTrue(matches)
+        self.assertTrue(new_hash.startswith("scrypt$"))
+
+    def test_verification_runs_on_the_pool(self):
+        encoded = hash_password("s3cret")
+        futures = [password_pool().submit(verify_password, guess, encoded) for guess in ("s3cret", "nope")]
+        self.assertEqual([future.result(timeout=10)[0] for future in futures], [True, False])
+
+if __name__ == "__main__":
+    unittest.main()
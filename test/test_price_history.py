@@ -0,0 +1,124 @@
+# test/test_price_history.py
+
+import unittest
+from datetime import datetime, timedelta
+
+from backup import convert_data_to_dict
+from data.models import Product, ProductPrice as ORMProductPrice
+from data.price_history import install_price_history
+from data.sqlalchemy_repositories import SQLAlchemyProductRepository, VALUES_CHUNK_SIZE
+from domain.domain_models import Product as DomainProduct, ProductPrice
+from restore import restore_data
+from services.inventory_service import InventoryService
+from test.db_case import DatabaseTestCase
+
+STARTED = datetime(2026, 1, 1, 9, 0)
+
+class TestPriceHistory(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product_repo = self.open_repo(SQLAlchemyProductRepository)
+
+        session = self.open_session()
+        session.add_all([
+            Product(product_id=i, sku=f"SKU{i}", name=f"Product {i}", category="DT" if i % 2 else "AB",
+                    unit_price=10.0, reorder_level=1)
+            for i in range(1, 2001)
+        ])
+        session.commit()
+        session.close()
+        install_price_history(self.engine, STARTED)
+        self.service = InventoryService(self.product_repo, None, None, None, None)
+        self.record_statements()
+
+    def test_install_starts_history_once(self):
+        self.assertEqual(self.service.get_price_history(5), [ProductPrice(5, STARTED, 10.0, None)])
+        install_price_history(self.engine, STARTED + timedelta(days=1))
+        self.assertEqual(len(self.service.get_price_history(5)), 1)
+        self.assertIsNone(self.service.get_price_as_of(5, STARTED - timedelta(seconds=1)))
+
+    def test_bulk_update_is_set_based(self):
+        changed = STARTED + timedelta(days=10)
+        prices = {i: 12.0 for i in range(1, 2001)}
+        costs = {i: 7.5 for i in range(1, 2001)}
+        self.service.update_prices(prices, costs, changed)
+        updates = [s for s in self.statements if s.startswith("UPDATE")]
+        inserts = [s for s in self.statements if s.startswith("INSERT")]
+        self.assertEqual(len(updates), -(-2000 // VALUES_CHUNK_SIZE))  # One UPDATE ... FROM (VALUES ...) per chunk
+        self.assertTrue(all("FROM (VALUES" in s for s in updates))
+        self.assertEqual(len(inserts), 1)  # Price history
+        self.assertEqual(len(self.statements), len(updates) + len(inserts))
+
+        # Costs not given are carried forward
+        later = changed + timedelta(days=10)
+        self.service.update_prices({7: 13.0}, valid_from=later)
+        self.assertEqual(self.service.get_price_history(7), [
+            ProductPrice(7, STARTED, 10.0, None), ProductPrice(7, changed, 12.0, 7.5), ProductPrice(7, later, 13.0, 7.5),
+        ])
+        self.assertEqual(self.service.get_product_by_id(7).unit_price, 13.0)
+
+    def test_as_of_lookups(self):
+        changed = STARTED + timedelta(days=10)
+        self.service.update_prices({1: 11.0, 2: 20.0}, {1: 5.0}, changed)
+
+        self.assertEqual(self.service.get_price_as_of(1, changed - timedelta(seconds=1)).unit_price, 10.0)
+        self.assertEqual(self.service.get_price_as_of(1, changed), ProductPrice(1, changed, 11.0, 5.0))
+
+        before = self.service.get_prices_as_of(changed - timedelta(days=1), [1, 2, 3])
+        after = self.service.get_prices_as_of(changed, [1, 2, 3])
+        self.assertEqual({pid: p.unit_price for pid, p in before.items()}, {1: 10.0, 2: 10.0, 3: 10.0})
+        self.assertEqual({pid: p.unit_price for pid, p in after.items()}, {1: 11.0, 2: 20.0, 3: 10.0})
+        self.assertEqual(len(self.service.get_prices_as_of(changed)), 2000)
+
+    def test_single_updates_append_only_on_price_changes(self):
+        product = self.service.add_product(DomainProduct(None, "NEW", "New", "DT", None, 4.0, 1))
+        self.assertEqual([p.unit_price for p in self.service.get_price_history(product.product_id)], [4.0])
+
+        product.name = "Renamed"
+        self.service.update_product(product)
+        product.unit_price = 4.5
+        self.service.update_product(product)
+        self.assertEqual([p.unit_price for p in self.service.get_price_history(product.product_id)], [4.0, 4.5])
+
+    def test_reprice_category(self):
+        changed = STARTED + timedelta(days=3)
+        self.assertEqual(self.service.reprice_category("DT", 12.5, changed), 1000)
+        # One UPDATE of the category, one INSERT ... SELECT of its history, no reads
+        self.assertEqual([s.split()[0] for s in self.statements], ["UPDATE", "INSERT"])
+        self.assertEqual(self.service.get_product_by_id(1).unit_price, 11.25)
+        self.assertEqual(self.service.get_product_by_id(2).unit_price, 10.0)
+        self.assertEqual(self.service.get_price_as_of(3, changed).unit_price, 11.25)
+        self.assertEqual(self.service.get_price_as_of(3, changed - timedelta(seconds=1)).unit_price, 10.0)
+        self.assertEqual(len(self.service.get_price_history(2)), 1)
+
+        # Costs are carried into the new history rows
+        self.service.update_prices({5: 11.25}, {5: 6.0}, changed + timedelta(days=1))
+        self.service.reprice_category("DT", -20, changed + timedelta(days=2))
+        self.assertEqual(self.service.get_price_history(5)[-1], ProductPrice(5, changed + timedelta(days=2), 9.0, 6.0))
+
+    def test_backup_and_restore_keep_the_history(self):
+        # As on PostgreSQL, deleting a product cascades to its history
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+        changed = STARTED + timedelta(days=10)
+        self.service.update_prices({1: 12.0, 2: 9.0}, {1: 7.5}, changed)
+        session = self.open_session()
+        data = convert_data_to_dict({
+            "products": session.query(Product).filter(Product.product_id <= 3).all(),
+            "product_prices": session.query(ORMProductPrice).filter(ORMProductPrice.product_id <= 2)
+                                     .order_by(ORMProductPrice.price_id).all(),
+        })
+        session.close()
+
+        restore_data(self.open_session(), data)
+        self.service.expire_cached_state()
+        self.assertEqual(self.service.get_price_history(1), [
+            ProductPrice(1, STARTED, 10.0, None), ProductPrice(1, changed, 12.0, 7.5),
+        ])
+        self.assertEqual(self.service.get_price_as_of(2, changed).unit_price, 9.0)
+        # Backed up without history (an older backup): starts again at its price
+        self.assertEqual([p.unit_price for p in self.service.get_price_history(3)], [10.0])
+        self.assertEqual(len(self.service.get_prices_as_of(datetime.now())), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+# test/test_product_catalogue.py
+
+import unittest
+
+from data.models import Product
+from data.sqlalchemy_repositories import SQLAlchemyProductRepository
+from services.inventory_service import InventoryService
+from test.db_case import DatabaseTestCase
+
+class TestProductCatalogue(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repo = self.open_repo(SQLAlchemyProductRepository)
+        self.repo.session.add_all([
+            Product(product_id=i, sku=f"SKU{i}", name=f"Product {i}", category="DT", unit_price=1.0, reorder_level=1)
+            for i in range(1, 1201)
+        ])
+        # A second product with an existing name
+        self.repo.session.add(Product(product_id=1201, sku="DUP", name="Product 7", category="DT",
+                                      unit_price=1.0, reorder_level=1))
+        self.repo.session.commit()
+        self.service = InventoryService(self.repo, None, None, None, None)
+        self.record_statements()
+
+    def test_repository_resolves_names_in_chunked_queries(self):
+        names = [f"Product {i}" for i in range(1, 1201)] + ["Missing"]
+        found = self.repo.get_products_by_names(names)
+        self.assertEqual(len(found), 1200)
+        self.assertEqual(found["Product 7"].product_id, 7)
+        self.assertEqual(len(self.statements), 3)  # 1201 names in chunks of 500
+
+        skus = self.repo.get_products_by_skus(["SKU3", "DUP", "nope"])
+        self.assertEqual({sku: p.product_id for sku, p in skus.items()}, {"SKU3": 3, "DUP": 1201})
+
+    def test_service_serves_lookups_from_the_catalogue(self):
+        found = self.service.get_products_by_names(["Product 1", "Product 900"])
+        self.assertEqual([p.product_id for p in found.values()], [1, 900])
+        self.assertEqual(len(self.statements), 1)
+
+        self.service.get_products_by_names([f"Product {i}" for i in range(1, 500)])
+        self.assertEqual(self.service.get_products_by_skus(["SKU42"])["SKU42"].name, "Product 42")
+        self.assertEqual(len(self.statements), 1)
+
+        # A product added elsewhere is fetched once, then cached
+        self.repo.session.add(Product(product_id=2000, sku="NEW", name="New", category="DT",
+                                      unit_price=1.0, reorder_level=1))
+        self.repo.session.commit()
+        self.statements.clear()
+        self.assertEqual(self.service.get_product_by_name("New").product_id, 2000)
+        self.assertEqual(self.service.get_product_by_name("New").product_id, 2000)
+        self.assertEqual(len(self.statements), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+# test/test_product_store.py
+
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from User.product_store import ProductStore
+
+def product(product_id, name, price, category):
+    return SimpleNamespace(product_id=product_id, name=name, price=price, quantity=product_id, category=category)
+
+class TestProductStore(unittest.TestCase):
+    def setUp(self):
+        self.products = [
+            product(1, "Aspirin 100mg", 2.5, "Tablets"),
+            product(2, "Cough Syrup", 8.0, "Syrups"),
+            product(3, "ASPIRIN 300mg", 4.0, "Tablets"),
+            product(4, "Eye Drops", 12.0, "Drops"),
+            product(5, "Crème", 6.0, "Creams"),
+            product(6, "Zn", 1.0, "Tablets"),
+        ]
+        self.store = ProductStore(self.products)
+
+    def names(self, rows):
+        return [p.name for p in self.store.products_at(rows)]
+
+    def test_name_matching_is_case_insensitive_substring(self):
+        self.assertEqual(self.names(self.store.filter_rows(name_substring="aspirin")), ["Aspirin 100mg", "ASPIRIN 300mg"])
+        self.assertEqual(self.names(self.store.filter_rows(name_substring="00mg")), ["Aspirin 100mg", "ASPIRIN 300mg"])
+        self.assertEqual(self.names(self.store.filter_rows(name_substring="rin 3")), ["ASPIRIN 300mg"])
+        self.assertEqual(self.names(self.store.filter_rows(name_substring="èm")), ["Crème"])
+        self.assertEqual(self.names(self.store.filter_rows(name_substring="z")), ["Zn"])
+        self.assertEqual(self.names(self.store.filter_rows(name_substring="spirin 1x")), [])
+
+    def test_combined_predicates_keep_row_order(self):
+        order = np.array([5, 4, 3, 2, 1, 0])
+        rows = self.store.filter_rows(order, category="Tablets", min_price=2.0, max_price=5.0)
+        self.assertEqual(self.names(rows), ["ASPIRIN 300mg", "Aspirin 100mg"])
+        self.assertEqual(len(self.store.filter_rows(category="Unknown")), 0)
+
+    def test_id_lookups(self):
+        store = ProductStore([self.products[i] for i in (3, 0, 5, 1, 4, 2)])
+        self.assertEqual(store.row_for_id(6), 2)
+        self.assertIsNone(store.row_for_id(42))
+        self.assertEqual(store.rows_for_ids([5, 42, 4]).tolist(), [4, 0])
+        self.assertEqual(store.search_sorted_ids([5, 42, 4, 0]).tolist(), [4, 0])
+        self.assertEqual([p.product_id for p in store.products_at(store.rows_in_id_range(2, 4))], [2, 3, 4])
+        self.assertEqual(len(store.rows_in_id_range(7, 9)), 0)
+
+    def test_category_aggregates(self):
+        aggregates = self.store.category_aggregates()
+        self.assertIs(self.store.category_aggregates(), aggregates)
+        self.assertEqual(aggregates.count_map(), {"Creams": 1, "Drops": 1, "Syrups": 1, "Tablets": 3})
+        self.assertEqual(aggregates.quantity_map(), {"Creams": 5, "Drops": 4, "Syrups": 2, "Tablets": 10})
+        self.assertEqual(aggregates.count("Unknown"), 0)
+        self.assertEqual(aggregates.count("Tablets"), 3)
+        self.assertAlmostEqual(aggregates.total_value, sum(p.price * p.quantity for p in self.products))
+
+if __name__ == "__main__":
+    unittest.main()
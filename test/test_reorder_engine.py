@@ -0,0 +1,126 @@
+# test/test_reorder_engine.py
+
+import unittest
+from datetime import date, timedelta
+
+from data.models import Product, Batch, Supplier, Order, OrderItem, OrderStatus
+from data.sqlalchemy_repositories import (
+    SQLAlchemyProductRepository,
+    SQLAlchemyBatchRepository,
+    SQLAlchemySaleRecordRepository,
+    SQLAlchemyOrderRepository,
+)
+from domain.domain_models import Batch as DomainBatch, SaleRecord, ReceiptLine
+from services.inventory_service import InventoryService
+from test.db_case import DatabaseTestCase
+
+TODAY = date(2026, 3, 1)
+
+class TestReorderEngine(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product_repo, self.batch_repo, self.sale_repo, self.order_repo = (
+            self.open_repo(repo_class) for repo_class in (
+                SQLAlchemyProductRepository, SQLAlchemyBatchRepository,
+                SQLAlchemySaleRecordRepository, SQLAlchemyOrderRepository,
+            )
+        )
+
+        session = self.open_session()
+        session.add_all([Supplier(supplier_id=1, name="A"), Supplier(supplier_id=2, name="B")])
+        # Product i has reorder level 10 and i units in one batch
+        session.add_all([
+            Product(product_id=i, sku=f"SKU{i}", name=f"Product {i}", category="DT",
+                    unit_price=float(i), reorder_level=10)
+            for i in range(1, 21)
+        ])
+        session.add_all([
+            Batch(batch_id=i, product_id=i, quantity=i, manufacture_date=TODAY,
+                  expiry_date=TODAY + timedelta(days=365))
+            for i in range(1, 21)
+        ])
+        # Products 1-5 were last bought from supplier 1, 6-8 from supplier 2;
+        # product 3 is still on an open order
+        session.add_all([
+            Order(order_id=1, supplier_id=2, order_date=TODAY, expected_delivery_date=TODAY,
+                  total_cost=0, status=OrderStatus.Delivered,
+                  items=[OrderItem(product_id=i, quantity=1, cost_per_unit=1.0) for i in range(1, 9)]),
+            Order(order_id=2, supplier_id=1, order_date=TODAY, expected_delivery_date=TODAY,
+                  total_cost=0, status=OrderStatus.Pending,
+                  items=[OrderItem(product_id=i, quantity=17 if i == 3 else 1, cost_per_unit=1.0)
+                         for i in range(1, 6)]),
+        ])
+        session.commit()
+        session.close()
+        self.service = InventoryService(self.product_repo, self.batch_repo, self.sale_repo, None, self.order_repo)
+        self.record_statements()
+
+    def low_ids(self):
+        return sorted(p.product_id for p in self.service.get_low_stock_products())
+
+    def test_inventory_status_in_two_queries(self):
+        products = self.service.get_inventory_status()
+        self.assertEqual({p.product_id: p.total_quantity for p in products}, {i: i for i in range(1, 21)})
+        self.assertEqual(len(self.statements), 2)
+
+    def test_stock_changes_update_the_low_stock_set(self):
+        self.assertEqual(self.low_ids(), list(range(1, 11)))
+        self.assertEqual(len(self.statements), 2)  # Catalogue and grouped stock levels
+        counts = []
+        self.service.add_stock_listener(lambda: counts.append(self.service.get_low_stock_count()))
+
+        self.service.record_sale(SaleRecord(sale_id=None, product_id=12, quantity_sold=3,
+                                            sale_date=TODAY, unit_price_at_sale=12.0))
+        self.service.add_batch(DomainBatch(batch_id=None, product_id=1, quantity=50,
+                                           manufacture_date=TODAY, expiry_date=TODAY + timedelta(days=365)))
+        self.service.update_batch(DomainBatch(batch_id=20, product_id=20, quantity=2,
+                                              manufacture_date=TODAY, expiry_date=TODAY + timedelta(days=365)))
+        self.service.delete_batch(11)
+        self.service.receive_order(2, [ReceiptLine(product_id=2, quantity=30, manufacture_date=TODAY,
+                                                   expiry_date=TODAY + timedelta(days=365))])
+
+        # Listeners see each change as soon as it is made
+        self.assertEqual(counts, [11, 10, 11, 12, 11])
+        self.statements.clear()
+        self.assertEqual(self.low_ids(), [3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 20])
+        self.assertEqual(self.service.get_low_stock_count(), 11)
+        self.assertEqual(self.statements, [])
+        # The engine agrees with the database
+        self.assertEqual(
+            {p.product_id: p.total_quantity for p in self.service.get_low_stock_products()},
+            {pid: qty for pid, qty in self.batch_repo.get_stock_levels().items() if qty <= 10}
+            | {11: 0},
+        )
+
+    def test_engine_does_not_change_the_catalogue(self):
+        catalogue = self.service.get_product_catalogue()
+        low = self.service.get_low_stock_products()
+        low[0].reorder_level = 99
+        self.service.update_reorder_levels({2: 1})
+
+        self.assertTrue(all(p.total_quantity == 0 for p in catalogue.products))
+        self.assertEqual({p.product_id: p.reorder_level for p in catalogue.products if p.product_id <= 2},
+                         {1: 10, 2: 10})
+        self.assertEqual(self.low_ids(), [1] + list(range(3, 11)))
+
+    def test_drafts_are_grouped_by_last_supplier_and_saved_together(self):
+        drafts = self.service.draft_reorders(order_date=TODAY)
+        by_supplier = {order.supplier_id: order for order in drafts.orders}
+        # Product 3 is covered by its open order (3 + 17 >= 20)
+        self.assertEqual([item.product_id for item in by_supplier[1].items], [1, 2, 4, 5])
+        self.assertEqual([item.product_id for item in by_supplier[2].items], [6, 7, 8])
+        self.assertEqual([item.quantity for item in by_supplier[2].items], [14, 13, 12])
+        self.assertEqual(by_supplier[2].total_cost, 14 * 6.0 + 13 * 7.0 + 12 * 8.0)
+        self.assertEqual(sorted(p.product_id for p in drafts.unassigned), [9, 10])
+
+        self.statements.clear()
+        self.service.add_orders(drafts.orders)
+        self.assertTrue(all(order.order_id for order in drafts.orders))
+        self.assertEqual(self.order_repo.count_orders(status=None), 4)
+        # Items go in as one batch, not one round trip per line
+        inserts = [s for s in self.statements if s.startswith("INSERT")]
+        self.assertLessEqual(len(inserts), len(drafts.orders) + 1)
+        self.assertEqual(len(self.order_repo.get_order_by_id(drafts.orders[0].order_id).items), 4)
+
+if __name__ == '__main__':
+    unittest.main()
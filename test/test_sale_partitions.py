@@ -0,0 +1,135 @@
+# test/test_sale_partitions.py
+
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from sqlalchemy import func, inspect, select
+
+from archive_sales import archive_cutoff
+from backup import fetch_sales
+from restore import restore_data
+from data.models import Product, SaleRecord, SalePeriod, DailySales
+from data.sale_archive import archive_sales, read_archive
+from data.report_queries import sales_query
+from data.sale_partitions import clear_period_tables, maintain_sale_partitions, months_between, next_month
+from data.sales_rollup import install_sales_rollup
+from data.sqlalchemy_repositories import SQLAlchemySaleRecordRepository
+from test.db_case import DatabaseTestCase
+
+TODAY = date(2026, 3, 15)
+
+class TestSalePartitions(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.sale_repo = self.open_repo(SQLAlchemySaleRecordRepository)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+        self.session = self.open_session()
+        self.session.add(Product(product_id=1, sku="SKU1", name="Product 1", category="DT",
+                                 unit_price=1.0, reorder_level=1))
+        # Two sales on the 10th of every month from December to March
+        self.session.add_all([
+            SaleRecord(product_id=1, quantity_sold=month.month, sale_date=month.replace(day=10), unit_price_at_sale=2.0)
+            for month in months_between(date(2025, 12, 1), TODAY) for _ in range(2)
+        ])
+        self.session.commit()
+        install_sales_rollup(self.engine)
+
+    def daily_sales(self):
+        return [(d.sale_date, d.quantity, d.revenue)
+                for d in self.sale_repo.get_daily_sales(date(2025, 1, 1), TODAY)]
+
+    def test_closed_months_move_to_period_tables(self):
+        # Not rolled up yet; moved all the same, after the rollup has it
+        self.session.add(SaleRecord(product_id=1, quantity_sold=5, sale_date=date(2026, 1, 20), unit_price_at_sale=1.0))
+        self.session.commit()
+        maintain_sale_partitions(self.session, TODAY)
+
+        tables = set(inspect(self.engine).get_table_names())
+        self.assertTrue({"sale_records_2025_12", "sale_records_2026_01", "sale_records_2026_02"} <= tables)
+        self.assertEqual(self.session.scalar(select(func.count()).select_from(SaleRecord)), 2)
+        self.assertIn((date(2026, 1, 20), 5, 5.0), self.daily_sales())
+
+        # Readers still see every sale, and ids keep counting up
+        self.assertEqual(len(self.sale_repo.get_all_sales()), 9)
+        january = self.sale_repo.get_sales_between_dates(date(2026, 1, 1), date(2026, 1, 31))
+        self.assertEqual([s.quantity_sold for s in january], [1, 1, 5])
+        self.assertEqual(self.sale_repo.get_sale_by_id(1).sale_date, date(2025, 12, 10))
+        sale = self.sale_repo.record_sale({"product_id": 1, "quantity_sold": 1, "sale_date": TODAY,
+                                           "unit_price_at_sale": 1.0})
+        self.assertEqual(sale.sale_id, 10)
+
+        # A range rebuild reads the period tables too
+        self.sale_repo.rebuild_daily_sales(date(2026, 1, 1), date(2026, 1, 31))
+        self.assertIn((date(2026, 1, 10), 2, 4.0), self.daily_sales())
+
+    def test_backup_export_and_restore_see_the_period_tables(self):
+        maintain_sale_partitions(self.session, TODAY)
+        self.assertEqual([s.sale_id for s in fetch_sales(self.session)], list(range(1, 9)))
+        january = self.session.execute(sales_query(self.session, date(2026, 1, 1), date(2026, 1, 31)).statement).all()
+        self.assertEqual([row.sale_id for row in january], [3, 4])
+
+        # A restore starts from an empty sale_records and no period tables
+        archive_sales(self.session, date(2026, 1, 1), self.tmpdir.name, today=TODAY)
+        clear_period_tables(self.session)
+        self.session.commit()
+        self.assertEqual([t for t in inspect(self.engine).get_table_names() if t.startswith("sale_records_")], [])
+        self.assertEqual([p.period_start for p in self.session.scalars(select(SalePeriod))], [date(2025, 12, 1)])
+        self.assertEqual([s.sale_id for s in fetch_sales(self.session)], [7, 8])
+
+    def test_archive_keeps_the_rollup(self):
+        before = self.daily_sales()
+        archived = archive_sales(self.session, date(2026, 2, 1), self.tmpdir.name, today=TODAY)
+
+        self.assertEqual([(p.period_start, p.row_count) for p in archived],
+                         [(date(2025, 12, 1), 2), (date(2026, 1, 1), 2)])
+        self.assertNotIn("sale_records_2025_12", inspect(self.engine).get_table_names())
+        rows = list(read_archive(archived[0].archive_file))
+        self.assertEqual([(r["sale_id"], r["sale_date"], r["quantity_sold"]) for r in rows],
+                         [(1, date(2025, 12, 10), 12), (2, date(2025, 12, 10), 12)])
+        self.assertEqual(os.path.basename(archived[1].archive_file), "sale_records_2026_01.csv.gz")
+        period = self.session.get(SalePeriod, date(2026, 1, 1))
+        self.assertIsNone(period.table_name)
+
+        # Reports and full rebuilds keep the archived months
+        self.assertEqual(self.daily_sales(), before)
+        self.sale_repo.rebuild_daily_sales()
+        self.assertEqual(self.daily_sales(), before)
+        self.assertEqual(len(self.sale_repo.get_all_sales()), 4)
+
+        # Nothing left to archive up to the same cutoff
+        self.assertEqual(archive_sales(self.session, date(2026, 2, 1), self.tmpdir.name, today=TODAY), [])
+
+    def test_restore_keeps_the_rollup_of_archived_months(self):
+        # As on PostgreSQL, deleting a product cascades to its daily_sales
+        with self.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+        archive_sales(self.session, date(2026, 2, 1), self.tmpdir.name, today=TODAY)
+        before = self.daily_sales()
+        product = {"product_id": 1, "sku": "SKU1", "name": "Product 1", "category": "DT",
+                   "unit_price": 1.0, "reorder_level": 1}
+        sales = [{column: getattr(sale, column) for column in ("sale_id", "product_id", "quantity_sold",
+                                                               "sale_date", "unit_price_at_sale")}
+                 for sale in fetch_sales(self.session)]
+        self.session.close()
+
+        restore_data(self.open_session(), {"products": [product], "sale_records": sales})
+        self.assertEqual(self.daily_sales(), before)
+        self.assertEqual([p.period_start for p in self.session.scalars(select(SalePeriod))],
+                         [date(2025, 12, 1), date(2026, 1, 1)])
+
+        # Products missing from the backup lose their archived history
+        restore_data(self.open_session(), {"products": [dict(product, product_id=2, sku="SKU2")]})
+        self.assertEqual(self.session.scalar(select(func.count()).select_from(DailySales)), 0)
+
+    def test_month_arithmetic(self):
+        self.assertEqual(next_month(date(2025, 12, 1)), date(2026, 1, 1))
+        self.assertEqual(list(months_between(date(2025, 11, 30), date(2026, 1, 1))),
+                         [date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1)])
+        self.assertEqual(archive_cutoff(TODAY, 3), date(2026, 1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+# test/test_sales_rollup.py
+
+import unittest
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from data.models import Product, SaleRecord, RollupState
+from data.sales_rollup import ROLLUP_NAME, install_sales_rollup, rebuild_sales_rollup, roll_up_new_sales
+from data.sqlalchemy_repositories import SQLAlchemyProductRepository, SQLAlchemySaleRecordRepository
+from services.inventory_service import InventoryService
+from services.reporting import SALES_REPORT, iter_report_lines, prepare_report
+from test.db_case import DatabaseTestCase
+
+TODAY = date(2026, 3, 1)
+YESTERDAY = TODAY - timedelta(days=1)
+
+class TestSalesRollup(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.product_repo = self.open_repo(SQLAlchemyProductRepository)
+        self.sale_repo = self.open_repo(SQLAlchemySaleRecordRepository)
+
+        session = self.open_session()
+        session.add_all([
+            Product(product_id=i, sku=f"SKU{i}", name=f"Product {i}", category="DT", unit_price=2.0, reorder_level=1)
+            for i in (1, 2)
+        ])
+        # Sales from before the rollup existed
+        session.add_all([
+            SaleRecord(product_id=1, quantity_sold=3, sale_date=YESTERDAY, unit_price_at_sale=2.0),
+            SaleRecord(product_id=1, quantity_sold=1, sale_date=YESTERDAY, unit_price_at_sale=2.5),
+            SaleRecord(product_id=2, quantity_sold=4, sale_date=TODAY, unit_price_at_sale=1.0),
+        ])
+        session.commit()
+        session.close()
+        install_sales_rollup(self.engine)
+        self.service = InventoryService(self.product_repo, None, self.sale_repo, None, None)
+
+    def daily(self, start_date=YESTERDAY, end_date=TODAY):
+        return [(d.sale_date, d.product_id, d.quantity, d.revenue)
+                for d in self.service.get_daily_sales(start_date, end_date)]
+
+    def add_raw_sale(self, product_id, quantity, sale_date, price=1.0):
+        with Session(self.engine) as session:
+            session.add(SaleRecord(product_id=product_id, quantity_sold=quantity,
+                                   sale_date=sale_date, unit_price_at_sale=price))
+            session.commit()
+
+    def test_install_backfills_existing_sales(self):
+        self.assertEqual(self.daily(), [(YESTERDAY, 1, 4, 8.5), (TODAY, 2, 4, 4.0)])
+        with Session(self.engine) as session:
+            self.assertEqual(session.scalar(select(RollupState.last_sale_id)
+                                            .where(RollupState.name == ROLLUP_NAME)), 3)
+
+    def test_record_sale_updates_the_rollup(self):
+        self.sale_repo.record_sale({"product_id": 2, "quantity_sold": 2, "sale_date": TODAY,
+                                    "unit_price_at_sale": 1.5})
+        self.sale_repo.record_sale({"product_id": 1, "quantity_sold": 1, "sale_date": TODAY,
+                                    "unit_price_at_sale": 2.0})
+        self.assertEqual(self.daily(), [(YESTERDAY, 1, 4, 8.5), (TODAY, 1, 1, 2.0), (TODAY, 2, 6, 7.0)])
+
+    def test_roll_up_counts_each_sale_once(self):
+        self.add_raw_sale(2, 5, TODAY)
+        self.add_raw_sale(1, 2, TODAY)
+        self.assertEqual(self.service.roll_up_sales(), 2)
+        self.assertEqual(self.service.roll_up_sales(), 0)
+        with Session(self.engine) as session:
+            self.assertEqual(roll_up_new_sales(session), 0)
+        self.assertEqual(self.daily(TODAY, TODAY), [(TODAY, 1, 2, 2.0), (TODAY, 2, 9, 9.0)])
+
+    def test_rebuild_range(self):
+        # Corrected in place, so the watermark does not see the change
+        with Session(self.engine) as session:
+            sale = session.scalars(select(SaleRecord).where(SaleRecord.product_id == 2)).one()
+            sale.quantity_sold = 10
+            session.commit()
+        self.assertEqual(self.daily(TODAY, TODAY), [(TODAY, 2, 4, 4.0)])
+
+        self.service.rebuild_daily_sales(TODAY, TODAY)
+        self.assertEqual(self.daily(), [(YESTERDAY, 1, 4, 8.5), (TODAY, 2, 10, 10.0)])
+
+    def test_full_rebuild_in_a_restore_transaction(self):
+        # A restore replaces the sales with fewer, and the ids start over
+        with Session(self.engine) as session:
+            with session.begin():
+                session.query(SaleRecord).delete()
+                session.add(SaleRecord(sale_id=1, product_id=2, quantity_sold=7, sale_date=TODAY, unit_price_at_sale=1.0))
+                session.flush()
+                rebuild_sales_rollup(session, commit=False)
+            self.assertEqual(session.scalar(select(RollupState.last_sale_id)), 1)
+        self.assertEqual(self.daily(), [(TODAY, 2, 7, 7.0)])
+
+        # The next sale gets id 2 and is still rolled up
+        self.add_raw_sale(1, 1, TODAY)
+        self.assertEqual(self.service.roll_up_sales(), 1)
+
+    def test_sales_report_reads_the_rollup(self):
+        report = prepare_report(self.service, SALES_REPORT, YESTERDAY, TODAY)
+        self.assertAlmostEqual(report.total_sales, 12.5)
+        self.assertEqual(dict(zip(report.chart_labels, report.chart_values)), {"Product 1": 8.5, "Product 2": 4.0})
+        lines = list(iter_report_lines(report))
+        self.assertIn(f"Date: {YESTERDAY}, Product: Product 1, Quantity: 4, Revenue: 8.50", lines)
+
+        summary = self.service.get_sales_report(YESTERDAY, TODAY)
+        self.assertAlmostEqual(summary.total_sales, 12.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# test/test_snapshot_loader.py
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from User.snapshot_loader import iter_sections, load_snapshot_rows
+
+SNAPSHOT = {
+    "products": [
+        {"product_id": 1, "category": "DT", "unit_price": 2.5, "sku": "A1", "name": "Aspirin", "description": None, "reorder_level": 0},
+        {"product_id": 2, "category": "DT", "unit_price": None, "sku": "B2", "name": 'Bandage, "large"', "description": None, "reorder_level": 5},
+        {"product_id": "x", "category": "DT", "unit_price": 1, "sku": "C3", "name": "Broken", "description": None, "reorder_level": 0},
+    ],
+    "batches": [
+        {"batch_id": 1, "product_id": 1, "quantity": 12345},
+        {"batch_id": 2, "product_id": 1, "quantity": 5},
+        {"batch_id": 3, "product_id": 2, "quantity": 7},
+    ],
+}
+
+class TestSnapshotLoader(unittest.TestCase):
+    def write_snapshot(self, text):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_small_chunks_match_json_load(self):
+        text = json.dumps(SNAPSHOT, indent=4)
+        for chunk_size in (1, 3, 7, 64):
+            items = list(iter_sections(io.StringIO(text), ("products", "batches"), chunk_size=chunk_size))
+            expected = [("products", p) for p in SNAPSHOT["products"]] + [("batches", b) for b in SNAPSHOT["batches"]]
+            self.assertEqual(items, expected, chunk_size)
+
+    def test_rows_aggregate_batches_and_stop_after_needed_sections(self):
+        # Anything after batches must never be parsed
+        text = json.dumps(SNAPSHOT)[:-1] + ', "sale_records": [not json at all'
+        rows = load_snapshot_rows(self.write_snapshot(text), chunk_size=16)
+        self.assertEqual(rows.products, [(1, "Aspirin", 2.5, 12350, "DT"), (2, 'Bandage, "large"', 0.0, 7, "DT")])
+        self.assertEqual(rows.batch_count, 3)
+        self.assertEqual(rows.skipped, 1)
+
+if __name__ == "__main__":
+    unittest.main()
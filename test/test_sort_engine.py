@@ -0,0 +1,54 @@
+# test/test_sort_engine.py
+
+import random
+import unittest
+from types import SimpleNamespace
+
+from User.sort_engine import SortEngine, ALGORITHMS, sort_with
+
+def make_products(n, seed=0):
+    rng = random.Random(seed)
+    categories = ["Tablets", "syrups", "Drops", "creams"]
+    return [
+        SimpleNamespace(
+            product_id=i,
+            name=rng.choice(["Aspirin", "aspirin", "Bandage", "Cough Syrup", "Zinc"]) + f" {i % 7}",
+            price=round(rng.uniform(1, 50), 2),
+            quantity=rng.randint(0, 20),
+            category=rng.choice(categories),
+        )
+        for i in range(1, n + 1)
+    ]
+
+def expected(products, keys):
+    def key(p):
+        return tuple(getattr(p, k).lower() if k in ("name", "category") else getattr(p, k) for k in keys)
+    return sorted(products, key=key)
+
+class TestSortEngine(unittest.TestCase):
+    def setUp(self):
+        self.products = make_products(500)
+
+    def test_all_algorithms_match_stable_sort(self):
+        engine = SortEngine(self.products)
+        for keys in (["category", "price"], ["name"], ["quantity", "name"], ["product_id"]):
+            want = [p.product_id for p in expected(self.products, keys)]
+            self.assertEqual([p.product_id for p in engine.sort(keys)], want, keys)
+            for algorithm in ALGORITHMS:
+                got = sort_with(algorithm, self.products, keys)
+                self.assertEqual([p.product_id for p in got], want, (algorithm, keys))
+
+    def test_quick_sort_handles_presorted_input(self):
+        products = make_products(20000)
+        got = sort_with("Quick Sort", products, ["product_id"])
+        self.assertEqual([p.product_id for p in got], list(range(1, 20001)))
+
+    def test_permutation_is_cached_until_invalidated(self):
+        engine = SortEngine(self.products)
+        first = engine.permutation(["price", "name"])
+        self.assertIs(engine.permutation(("price", "name")), first)
+        engine.invalidate(self.products[:10])
+        self.assertEqual(len(engine.sort(["price", "name"])), 10)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# test/test_user_store.py
+
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from utils.user_store import UserStore, UsernameTaken
+
+
+class TestUserStore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'users.db')
+        self.json_path = os.path.join(self.tmpdir.name, 'users.json')
+        with open(self.json_path, 'w') as f:
+            json.dump([
+                {'username': 'admin', 'password': 'a' * 64, 'role': 'admin'},
+                {'username': 'till1', 'password': 'b' * 64, 'role': 'user'},
+            ], f)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def open_store(self):
+        store = UserStore(self.db_path, legacy_path=self.json_path)
+        self.addCleanup(store.close)
+        return store
+
+    def test_migrates_users_json_once(self):
+        store = self.open_store()
+        self.assertEqual(store.get_user('admin'), {'username': 'admin', 'password': 'a' * 64, 'role': 'admin'})
+        self.assertEqual(store.get_user('till1')['role'], 'user')
+        self.assertIsNone(store.get_user('nobody'))
+
+        # Accounts added to the JSON later are not imported again
+        with open(self.json_path, 'w') as f:
+            json.dump([{'username': 'late', 'password': 'c' * 64, 'role': 'user'}], f)
+        store.close()
+        self.assertIsNone(self.open_store().get_user('late'))
+
+    def test_duplicate_username_is_rejected(self):
+        store = self.open_store()
+        store.add_user('till2', 'd' * 64)
+        with self.assertRaises(UsernameTaken):
+            store.add_user('till2', 'e' * 64, role='admin')
+        self.assertEqual(store.get_user('till2')['password'], 'd' * 64)
+
+    def test_concurrent_signups_create_one_account(self):
+        # Two stores stand in for two processes sharing the database file
+        stores = [self.open_store(), self.open_store()]
+        results = []
+
+        def signup(store):
+            try:
+                store.add_user('race', 'f' * 64)
+                results.append('created')
+            except UsernameTaken:
+                results.append('taken')
+
+        threads = [threading.Thread(target=signup, args=(store,)) for store in stores]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(results), ['created', 'taken'])
+        self.assertEqual([user['username'] for user in stores[0].all_users()].count('race'), 1)
+
+if __name__ == "__main__":
+    unittest.main()
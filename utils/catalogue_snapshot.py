@@ -0,0 +1,221 @@
+# utils/catalogue_snapshot.py
+
+import logging
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = 'catalogue.snap'
+SNAPSHOT_MAGIC = b"GSTKCAT\x00"
+SNAPSHOT_VERSION = 1
+
+# File layout (little-endian, every section starts on an 8 byte boundary):
+#   header             magic, version, crc32 of everything after the header,
+#                      row count, category count, heap size
+#   ids                int64[rows]
+#   id_order           int64[rows]    rows sorted by product id
+#   prices             float64[rows]
+#   quantities         int64[rows]
+#   name_offsets       int64[rows + 1]       into the heap
+#   category_offsets   int64[categories + 1] into the heap
+#   category_codes     int32[rows], padded to 8 bytes
+#   heap               UTF-8 names, then UTF-8 category names
+_HEADER = struct.Struct("<8sIIQQQ")
+
+class SnapshotError(ValueError):
+    pass
+
+def _padded(nbytes):
+    return (nbytes + 7) & ~7
+
+def catalogue_rows_from_backup(data):
+    """
+    Joins the products and batches of a backup dict (see backup.convert_data_to_dict)
+    into (product_id, name, price, quantity, category) rows, with the quantity
+    summed over the product's batches.
+    """
+    quantity_map = {}
+    for batch in data.get('batches', []):
+        pid = batch.get('product_id')
+        quantity_map[pid] = quantity_map.get(pid, 0) + (batch.get('quantity') or 0)
+    return [
+        (
+            int(item.get('product_id') or 0),
+            item.get('name') or '',
+            float(item.get('unit_price') or 0.0),
+            int(quantity_map.get(item.get('product_id'), 0)),
+            item.get('category') or '',
+        )
+        for item in data.get('products', [])
+    ]
+
+def write_snapshot(rows, path=SNAPSHOT_FILE):
+    """
+    Writes catalogue rows of (product_id, name, price, quantity, category) to
+    a snapshot file. The file is written next to the target and moved into
+    place, so a reader never sees a half written snapshot.
+    """
+    rows = list(rows)
+    n = len(rows)
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    prices = np.array([row[2] for row in rows], dtype=np.float64)
+    quantities = np.array([row[3] for row in rows], dtype=np.int64)
+    categories, codes = np.unique(np.array([row[4] for row in rows], dtype=str), return_inverse=True)
+    categories = categories.tolist()
+
+    names = [row[1].encode('utf-8') for row in rows]
+    category_bytes = [category.encode('utf-8') for category in categories]
+    name_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in names], out=name_offsets[1:])
+    category_offsets = np.zeros(len(categories) + 1, dtype=np.int64)
+    np.cumsum([len(category) for category in category_bytes], out=category_offsets[1:])
+    category_offsets += name_offsets[-1]
+    heap = b"".join(names) + b"".join(category_bytes)
+
+    code_bytes = codes.astype(np.int32).tobytes()
+    payload = b"".join([
+        ids.tobytes(),
+        np.argsort(ids, kind="stable").astype(np.int64).tobytes(),
+        prices.tobytes(),
+        quantities.tobytes(),
+        name_offsets.tobytes(),
+        category_offsets.tobytes(),
+        code_bytes + b"\x00" * (_padded(len(code_bytes)) - len(code_bytes)),
+        heap,
+    ])
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(payload), n, len(categories), len(heap))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+    logger.info(f"Wrote catalogue snapshot with {n} products to {path}")
+
+class CatalogueSnapshot:
+    """
+    Read-only view of a snapshot file. The file is memory mapped and the
+    columns are NumPy arrays over the mapping, so opening costs the same
+    regardless of catalogue size (apart from the checksum pass) and nothing
+    is copied until it is used.
+    """
+    def __init__(self, path=SNAPSHOT_FILE, verify=True):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # An empty file cannot be mapped
+            self._file.close()
+            raise SnapshotError(f"{path} is empty")
+        try:
+            self._open(verify)
+        except Exception:
+            self.close()
+            raise
+
+    def _open(self, verify):
+        buf = self._mmap
+        if len(buf) < _HEADER.size:
+            raise SnapshotError(f"{self.path} is truncated")
+        magic, version, crc, n, category_count, heap_size = _HEADER.unpack_from(buf, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{self.path} is not a catalogue snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(f"Unsupported catalogue snapshot version {version}")
+
+        offset = _HEADER.size
+
+        def column(dtype, count):
+            nonlocal offset
+            array = np.frombuffer(buf, dtype=dtype, count=count, offset=offset)
+            offset += _padded(array.nbytes)
+            return array
+
+        try:
+            self.ids = column(np.int64, n)
+            self.id_order = column(np.int64, n)
+            self.prices = column(np.float64, n)
+            self.quantities = column(np.int64, n)
+            self.name_offsets = column(np.int64, n + 1)
+            category_offsets = column(np.int64, category_count + 1)
+            self.category_codes = column(np.int32, n)
+            self._heap = memoryview(buf)[offset:offset + heap_size]
+        except ValueError:
+            raise SnapshotError(f"{self.path} is truncated")
+        if len(self._heap) != heap_size:
+            raise SnapshotError(f"{self.path} is truncated")
+        if verify and zlib.crc32(memoryview(buf)[_HEADER.size:]) != crc:
+            raise SnapshotError(f"{self.path} failed its checksum")
+
+        offsets = category_offsets.tolist()
+        self.categories = [bytes(self._heap[start:end]).decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def name(self, row):
+        start, end = self.name_offsets[row], self.name_offsets[row + 1]
+        return bytes(self._heap[start:end]).decode('utf-8')
+
+    def names(self):
+        """All names, decoded in one pass over the heap."""
+        heap = bytes(self._heap[:self.name_offsets[-1]])
+        offsets = self.name_offsets.tolist()
+        return [heap[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+    def row(self, row):
+        return (
+            int(self.ids[row]),
+            self.name(row),
+            float(self.prices[row]),
+            int(self.quantities[row]),
+            self.categories[self.category_codes[row]],
+        )
+
+    def close(self):
+        for attr in ('ids', 'id_order', 'prices', 'quantities', 'name_offsets', 'category_codes', '_heap'):
+            self.__dict__.pop(attr, None)
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Arrays handed out are still alive; the mapping closes with them
+            pass
+        self._file.close()
+
+class SnapshotProducts(Sequence):
+    """
+    Sequence of products backed by a snapshot. Products are built by
+    factory(product_id, name, price, quantity, category) the first time they
+    are accessed.
+    """
+    def __init__(self, snapshot, factory):
+        self.snapshot = snapshot
+        self.factory = factory
+        self._cache = [None] * len(snapshot)
+
+    def __len__(self):
+        return len(self._cache)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._cache)
+        product = self._cache[index]
+        if product is None:
+            product = self._cache[index] = self.factory(*self.snapshot.row(index))
+        return product
+
+    def __iter__(self):
+        for index in range(len(self._cache)):
+            yield self[index]
+
+    def copy(self):
+        return list(self)
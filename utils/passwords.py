@@ -0,0 +1,141 @@
+# utils/passwords.py
+
+import base64
+import hashlib
+import hmac
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Default scrypt cost. N=2**14, r=8 takes 16 MB and roughly 40-60 ms per hash
+# on a till class CPU; run benchmarks/bench_password_hash.py to pick others.
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+PBKDF2_ITERATIONS = 600_000
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+# Threads that hash and verify passwords off the UI thread
+PASSWORD_WORKERS = 2
+
+_LEGACY_SHA256 = re.compile(r"[0-9a-f]{64}")
+
+def _b64encode(data):
+    return base64.b64encode(data).decode('ascii').rstrip('=')
+
+def _b64decode(text):
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+def _parse_params(text):
+    return {key: int(value) for key, value in (item.split('=') for item in text.split(','))}
+
+class ScryptHasher:
+    """
+    scrypt with a random per-user salt. Hashes are stored as
+    scrypt$n=<N>,r=<r>,p=<p>$<salt>$<key>, so each hash carries the cost it
+    was made with and can be verified after the defaults change.
+    """
+    algorithm = 'scrypt'
+
+    def __init__(self, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+        self.params = {'n': n, 'r': r, 'p': p}
+
+    @staticmethod
+    def _derive(password, salt, n, r, p):
+        # OpenSSL refuses more than 32 MB unless maxmem is raised
+        maxmem = 128 * n * r * p + (1 << 20)
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=maxmem, dklen=KEY_BYTES)
+
+    def hash(self, password):
+        salt = os.urandom(SALT_BYTES)
+        key = self._derive(password, salt, **self.params)
+        params = ','.join(f"{name}={value}" for name, value in self.params.items())
+        return f"{self.algorithm}${params}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, password, encoded):
+        _, params, salt, key = encoded.split('$')
+        params = _parse_params(params)
+        derived = self._derive(password, _b64decode(salt), params['n'], params['r'], params['p'])
+        return hmac.compare_digest(derived, _b64decode(key))
+
+    def needs_update(self, encoded):
+        return _parse_params(encoded.split('$')[1]) != self.params
+
+class Pbkdf2Hasher:
+    """PBKDF2-HMAC-SHA256, for Python builds whose OpenSSL lacks scrypt."""
+    algorithm = 'pbkdf2_sha256'
+
+    def __init__(self, iterations=PBKDF2_ITERATIONS):
+        self.params = {'i': iterations}
+
+    def hash(self, password):
+        salt = os.urandom(SALT_BYTES)
+        key = hashlib.pbkdf2_hmac('sha256', password.encode(), salt, self.params['i'], KEY_BYTES)
+        return f"{self.algorithm}$i={self.params['i']}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, password, encoded):
+        _, params, salt, key = encoded.split('$')
+        iterations = _parse_params(params)['i']
+        derived = hashlib.pbkdf2_hmac('sha256', password.encode(), _b64decode(salt), iterations, KEY_BYTES)
+        return hmac.compare_digest(derived, _b64decode(key))
+
+    def needs_update(self, encoded):
+        return _parse_params(encoded.split('$')[1]) != self.params
+
+HASHERS = {hasher.algorithm: hasher for hasher in (ScryptHasher, Pbkdf2Hasher)}
+
+_default_hasher = ScryptHasher() if hasattr(hashlib, 'scrypt') else Pbkdf2Hasher()
+
+def get_hasher():
+    return _default_hasher
+
+def set_hasher(hasher):
+    """Changes the hasher (and cost) used for new hashes and rehashing."""
+    global _default_hasher
+    _default_hasher = hasher
+
+def hash_password(password):
+    return _default_hasher.hash(password)
+
+def is_legacy_hash(encoded):
+    """True for the unsalted SHA-256 hex digests of older releases."""
+    return bool(_LEGACY_SHA256.fullmatch(encoded))
+
+def verify_password(password, encoded):
+    """
+    Checks password against a stored hash of any supported format. Returns
+    (matches, new_hash): new_hash is set when the password matched but the
+    stored hash is a legacy SHA-256 digest or uses another algorithm or cost
+    than the current hasher, and should replace the stored one.
+    """
+    if is_legacy_hash(encoded):
+        matches = hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), encoded)
+        return matches, (hash_password(password) if matches else None)
+
+    algorithm = encoded.split('$', 1)[0]
+    if algorithm not in HASHERS:
+        raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+    hasher = _default_hasher if _default_hasher.algorithm == algorithm else HASHERS[algorithm]()
+    if not hasher.verify(password, encoded):
+        return False, None
+    if hasher is not _default_hasher or _default_hasher.needs_update(encoded):
+        return True, hash_password(password)
+    return True, None
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def password_pool():
+    """
+    Shared executor for password hashing. hashlib releases the GIL while
+    scrypt runs, so the UI thread keeps painting during a login.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix='password')
+        return _pool
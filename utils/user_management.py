@@ -1,28 +1,11 @@
 # utils/user_management.py
 
-import json
-import hashlib
-import os
-
-def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+from utils.passwords import hash_password
+from utils.user_store import get_user_store
 
 def add_user(username, password, role='user'):
-    user = {
-        "username": username,
-        "password": hash_password(password),
-        "role": role
-    }
-    users = load_users()
-    users.append(user)
-    save_users(users)
+    """Creates a user. Raises UsernameTaken if the name is in use."""
+    get_user_store().add_user(username, hash_password(password), role)
 
 def load_users():
-    if not os.path.exists('users.json'):
-        return []
-    with open('users.json', 'r') as f:
-        return json.load(f)
-
-def save_users(users):
-    with open('users.json', 'w') as f:
-        json.dump(users, f, indent=4)
\ No newline at end of file
+    return get_user_store().all_users()
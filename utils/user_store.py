@@ -0,0 +1,138 @@
+# utils/user_store.py
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERS_DB = os.path.join(BASE_DIR, 'users.db')
+USERS_JSON = os.path.join(BASE_DIR, 'users.json')
+
+# Bumped with PRAGMA user_version once users.json has been imported
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username   TEXT PRIMARY KEY,
+    password   TEXT NOT NULL,
+    role       TEXT NOT NULL DEFAULT 'user',
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+class UsernameTaken(ValueError):
+    pass
+
+class UserStore:
+    """
+    User accounts in a small SQLite database.
+
+    Usernames are the primary key, so a lookup is one index probe and two
+    processes creating the same account cannot both succeed: the second
+    insert fails with UsernameTaken. Users that have been looked up are kept
+    in memory, so repeated logins on the same till skip the database.
+
+    On first open the accounts of the old users.json (if any) are imported.
+    The JSON file is left in place but no longer read or written.
+    """
+    def __init__(self, path=USERS_DB, legacy_path=USERS_JSON):
+        self.path = path
+        self._lock = threading.Lock()
+        self._cache = {}
+        # One connection shared by the login and signup threads, guarded by
+        # the lock; the timeout covers another process holding the write lock
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        if legacy_path is not None:
+            self._migrate(legacy_path)
+
+    def _migrate(self, legacy_path):
+        with self._lock:
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                return
+            users = []
+            if os.path.exists(legacy_path):
+                try:
+                    with open(legacy_path, 'r') as f:
+                        users = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.error(f"Could not import {legacy_path}: {e}")
+                    return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-checked under the write lock in case another process migrated first
+                if self._conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, ?)",
+                        [(user['username'], user['password'], user.get('role', 'user')) for user in users],
+                    )
+                    self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            if users:
+                logger.info(f"Imported {len(users)} users from {legacy_path}")
+
+    def get_user(self, username):
+        """The user as a dict with username, password and role, or None."""
+        with self._lock:
+            user = self._cache.get(username)
+            if user is None:
+                row = self._conn.execute(
+                    "SELECT username, password, role FROM users WHERE username = ?", (username,)
+                ).fetchone()
+                if row is None:
+                    return None
+                user = self._cache[username] = dict(row)
+            return dict(user)
+
+    def exists(self, username):
+        return self.get_user(username) is not None
+
+    def add_user(self, username, hashed_password, role='user'):
+        """Creates a user. Raises UsernameTaken if the name is in use."""
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
+                    (username, hashed_password, role),
+                )
+            except sqlite3.IntegrityError:
+                raise UsernameTaken(f"Username {username} already exists.")
+            self._cache[username] = {'username': username, 'password': hashed_password, 'role': role}
+
+    def set_password(self, username, hashed_password):
+        """Replaces a user's stored hash, e.g. after rehashing on login."""
+        with self._lock:
+            self._conn.execute("UPDATE users SET password = ? WHERE username = ?", (hashed_password, username))
+            if username in self._cache:
+                self._cache[username]['password'] = hashed_password
+
+    def all_users(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT username, password, role FROM users ORDER BY username").fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._cache.clear()
+            self._conn.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_user_store():
+    """The process wide store for users.db, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = UserStore()
+        return _store
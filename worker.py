@@ -1,5 +1,32 @@
 from PyQt6.QtCore import QThread, pyqtSignal
 
+def open_inventory_service():
+    """
+    An InventoryService whose repositories share one new session, for use
+    on a single worker thread. Sessions are not thread-safe, so workers
+    never touch the UI thread's service. Returns (service, session); the
+    caller closes the session.
+    """
+    from data.db_config import SessionLocal
+    from data.sqlalchemy_repositories import (
+        SQLAlchemyProductRepository,
+        SQLAlchemyBatchRepository,
+        SQLAlchemySaleRecordRepository,
+        SQLAlchemySupplierRepository,
+        SQLAlchemyOrderRepository,
+    )
+    from services.inventory_service import InventoryService
+
+    session = SessionLocal()
+    service = InventoryService(
+        SQLAlchemyProductRepository(session),
+        SQLAlchemyBatchRepository(session),
+        SQLAlchemySaleRecordRepository(session),
+        SQLAlchemySupplierRepository(session),
+        SQLAlchemyOrderRepository(session),
+    )
+    return service, session
+
 class DataLoader(QThread):
     finished = pyqtSignal()
 
@@ -10,4 +37,148 @@ class DataLoader(QThread):
     def run(self):
         # Place your data loading logic here
         self.inventory_service.load_all_data()  # Example method
-        self.finished.emit()
\ No newline at end of file
+        self.finished.emit()
+
+class ReportLoader(QThread):
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, report_type, start_date, end_date):
+        super().__init__()
+        self.report_type = report_type
+        self.start_date = start_date
+        self.end_date = end_date
+
+    def run(self):
+        # Imported here to keep the reporting code off the startup path
+        from services.reporting import prepare_report
+
+        # The page stays usable meanwhile, so the report reads on its own session
+        service, session = open_inventory_service()
+        try:
+            report = prepare_report(service, self.report_type, self.start_date, self.end_date)
+            self.finished.emit(report)
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            session.close()
+
+
+class ExportWorker(QThread):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, export_type, start_date, end_date, path, fmt, compress):
+        super().__init__()
+        self.export_type = export_type
+        self.start_date = start_date
+        self.end_date = end_date
+        self.path = path
+        self.fmt = fmt
+        self.compress = compress
+
+    def run(self):
+        from data.db_config import SessionLocal
+        from data.report_queries import REPORT_QUERIES
+        from services.export_service import export_report
+
+        # The export gets its own session so it never shares one with the UI thread
+        session = SessionLocal()
+        try:
+            query = REPORT_QUERIES[self.export_type](session, self.start_date, self.end_date)
+            result = export_report(
+                session, query, self.path, fmt=self.fmt, compress=self.compress,
+                progress_callback=self.progress.emit
+            )
+            self.finished.emit(result)
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            session.close()
+
+class CatalogueChangePoller(QThread):
+    """
+    Opens the live catalogue source and keeps the terminal up to date from
+    it. Connecting can take up to the database connect timeout, so it
+    happens here rather than on the UI thread, which shows the backup
+    files until the first, full delta arrives. Without a reachable
+    database the thread ends and the terminal stays on the backup files.
+    """
+    changes = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def __init__(self, interval_seconds):
+        super().__init__()
+        self.interval_ms = int(interval_seconds * 1000)
+
+    def run(self):
+        from User.live_source import CatalogueDelta, open_live_source
+
+        live_source = open_live_source()
+        if live_source is None:
+            return
+        try:
+            try:
+                self.changes.emit(CatalogueDelta(rows=live_source.load(), full=True))
+            except Exception as e:
+                self.error.emit(f"Could not load the catalogue from the database, using the backup files: {e}")
+                return
+            # Polls until requestInterruption(); the wait is sliced so stopping is prompt
+            while not self.isInterruptionRequested():
+                waited = 0
+                while waited < self.interval_ms and not self.isInterruptionRequested():
+                    self.msleep(100)
+                    waited += 100
+                if self.isInterruptionRequested():
+                    break
+                try:
+                    delta = live_source.poll()
+                    if delta is not None:
+                        self.changes.emit(delta)
+                except Exception as e:
+                    self.error.emit(str(e))
+        finally:
+            live_source.close()
+
+class StockAlertWorker(QThread):
+    # Expiry alerts; the low stock count comes from the UI thread's reorder engine
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def run(self):
+        from data.change_log import prune_change_log
+        from data.sale_partitions import maintain_sale_partitions
+
+        # Built on the worker's own session every run, so the UI thread's
+        # calendar is never touched from here
+        service, session = open_inventory_service()
+        try:
+            # Periodic compactor of the daily sales rollup, for sales that
+            # did not go through a checkout
+            service.roll_up_sales()
+            # The change log grows with every product or batch write
+            prune_change_log(session)
+            # Partitions of the coming months (PostgreSQL), closed months
+            # moved out of sale_records (SQLite)
+            maintain_sale_partitions(session)
+            self.finished.emit(service.get_expiry_alerts())
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            session.close()
+
+class ForecastWorker(QThread):
+    # Product id -> suggested reorder level, for levels that would change
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+    def run(self):
+        # Reads on its own session; the levels are applied on the UI thread
+        service, session = open_inventory_service()
+        try:
+            self.finished.emit(service.suggest_reorder_levels())
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            session.close()